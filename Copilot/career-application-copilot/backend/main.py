@@ -5,7 +5,7 @@ Handles resume upload, parsing, and auto-fill suggestions using AI models
 from fastapi import FastAPI, File, UploadFile, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse, HTMLResponse
+from fastapi.responses import JSONResponse, HTMLResponse, StreamingResponse
 from pydantic import BaseModel
 import os
 import json
@@ -26,6 +26,7 @@ try:
     from executor import ApplicationExecutor  
     from tracker import ApplicationTracker
     from evaluation import ApplicationEvaluator
+    from interaction_logger import get_interaction_logger
     AI_AGENTS_AVAILABLE = True
     print("✅ AI Agents loaded successfully")
 except ImportError as e:
@@ -74,6 +75,14 @@ async def startup_event():
     else:
         print("⚠️ AI Agents not available - using fallback parsing")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush buffered interaction logs before the worker exits"""
+    if AI_AGENTS_AVAILABLE:
+        if ai_planner and ai_planner.job_index is not None:
+            ai_planner.job_index.save()
+        get_interaction_logger().close()
+
 # CORS middleware for React frontend and Browser Extension
 app.add_middleware(
     CORSMiddleware,
@@ -137,6 +146,26 @@ class ApplicationPackageRequest(BaseModel):
     company_name: str
     role_title: str
     session_id: str
+    bypass_cache: bool = False
+
+class SimilarJobsRequest(BaseModel):
+    job_description: str
+    k: int = 5
+
+class JobOutcomeRequest(BaseModel):
+    outcome: str
+
+class BatchAnalysisRequest(BaseModel):
+    job_descriptions: List[str]
+    max_workers: Optional[int] = None
+    timeout: Optional[float] = None
+
+class CoverLetterStreamRequest(BaseModel):
+    job_description: str
+    company_name: Optional[str] = None
+    role_title: Optional[str] = None
+
+MAX_BATCH_JOB_DESCRIPTIONS = 200
 
 # AI-Powered Endpoints
 @app.post("/ai/analyze-job", response_model=AIAnalysisResponse)
@@ -165,6 +194,37 @@ async def analyze_job_description(request: JobDescriptionRequest):
         print(f"❌ AI analysis failed: {e}")
         raise HTTPException(status_code=500, detail=f"AI analysis failed: {str(e)}")
 
+@app.post("/ai/analyze-jobs")
+async def analyze_job_descriptions(request: BatchAnalysisRequest):
+    """
+    Analyze many job descriptions in one request. Results stream back as
+    newline-delimited JSON in completion order, one line per JD (with its index).
+    """
+    
+    if not AI_AGENTS_AVAILABLE or not ai_planner:
+        raise HTTPException(status_code=503, detail="AI agents not available")
+    
+    if not request.job_descriptions:
+        raise HTTPException(status_code=400, detail="No job descriptions provided")
+    
+    if len(request.job_descriptions) > MAX_BATCH_JOB_DESCRIPTIONS:
+        raise HTTPException(status_code=400,
+                            detail=f"At most {MAX_BATCH_JOB_DESCRIPTIONS} job descriptions per request")
+    
+    print(f"🤖 Analyzing {len(request.job_descriptions)} job descriptions")
+    
+    def stream_results():
+        results = ai_planner.plan_applications(
+            request.job_descriptions,
+            max_workers=request.max_workers,
+            timeout=request.timeout
+        )
+        for result in results:
+            yield json.dumps(result, default=str) + "\n"
+    
+    # Sync generators are iterated in Starlette's threadpool, so the event loop stays free
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
 @app.post("/ai/generate-application")
 async def generate_application_package(request: ApplicationPackageRequest):
     """Generate AI-powered application materials"""
@@ -182,7 +242,8 @@ async def generate_application_package(request: ApplicationPackageRequest):
         strategy = ai_planner.plan_application(request.job_description)
         
         # Generate application materials
-        application_package = ai_executor.generate_application_package(strategy)
+        application_package = ai_executor.generate_application_package(
+            strategy, use_cache=not request.bypass_cache)
         
         # Track the application
         tracking_result = ai_tracker.track_application({
@@ -206,6 +267,96 @@ async def generate_application_package(request: ApplicationPackageRequest):
         print(f"❌ Application generation failed: {e}")
         raise HTTPException(status_code=500, detail=f"Application generation failed: {str(e)}")
 
+@app.post("/ai/generate-cover-letter/stream")
+async def stream_cover_letter(request: CoverLetterStreamRequest):
+    """
+    Generate a cover letter and stream it back as newline-delimited JSON:
+    a "strategy" summary, then "token" events as text is decoded, then "done"
+    with the final letter and its time-to-first-token / total latency.
+    """
+    
+    if not AI_AGENTS_AVAILABLE or not ai_planner or not ai_executor:
+        raise HTTPException(status_code=503, detail="AI agents not available")
+    
+    print(f"✍️ Streaming cover letter for {request.role_title or 'role'} at {request.company_name or 'company'}")
+    
+    def stream_events():
+        try:
+            strategy = ai_planner.plan_application(request.job_description)
+            yield json.dumps({
+                "type": "strategy",
+                "match_score": strategy.get("match_score", 0.0),
+                "matching_skills": strategy.get("matching_skills", []),
+                "missing_skills": strategy.get("missing_skills", [])
+            }, default=str) + "\n"
+            for event in ai_executor.stream_cover_letter(strategy):
+                yield json.dumps(event, default=str) + "\n"
+        except Exception as e:
+            # Headers are already sent, so errors travel in-band
+            print(f"❌ Cover letter streaming failed: {e}")
+            yield json.dumps({"type": "error", "error": str(e)}) + "\n"
+    
+    return StreamingResponse(stream_events(), media_type="application/x-ndjson")
+
+@app.post("/ai/similar-jobs")
+async def find_similar_jobs(request: SimilarJobsRequest):
+    """Return the k most similar previously analyzed job postings"""
+    
+    if not AI_AGENTS_AVAILABLE or not ai_planner:
+        raise HTTPException(status_code=503, detail="AI agents not available")
+    
+    if ai_planner.job_index is None:
+        raise HTTPException(status_code=503, detail="Job index not available (install faiss-cpu)")
+    
+    try:
+        results = ai_planner.find_similar_jobs(request.job_description, k=request.k)
+        return {
+            "success": True,
+            "results": results,
+            "total_indexed": len(ai_planner.job_index)
+        }
+    except Exception as e:
+        print(f"❌ Similar job search failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Similar job search failed: {str(e)}")
+
+@app.post("/ai/similar-jobs/{job_id}/outcome")
+async def record_job_outcome(job_id: int, request: JobOutcomeRequest):
+    """Attach an application outcome to an indexed job posting"""
+    
+    if not AI_AGENTS_AVAILABLE or not ai_planner or ai_planner.job_index is None:
+        raise HTTPException(status_code=503, detail="Job index not available")
+    
+    if not ai_planner.job_index.record_outcome(job_id, request.outcome):
+        raise HTTPException(status_code=404, detail="Job not found in index")
+    
+    return {"success": True, "job_id": job_id, "outcome": request.outcome}
+
+@app.get("/ai/packages")
+async def list_application_packages(company: Optional[str] = None, role: Optional[str] = None,
+                                    since: Optional[str] = None, until: Optional[str] = None,
+                                    limit: int = 50):
+    """Stored application packages matching the filters (index entries, newest first)"""
+    
+    store = getattr(ai_executor, "package_store", None)
+    if store is None:
+        raise HTTPException(status_code=503, detail="Package store not available")
+    
+    entries = store.query(company=company, role=role, since=since, until=until, limit=min(max(limit, 1), 500))
+    return {"success": True, "packages": entries, "count": len(entries)}
+
+@app.get("/ai/packages/{package_id}")
+async def get_application_package(package_id: str):
+    """One stored application package by ID"""
+    
+    store = getattr(ai_executor, "package_store", None)
+    if store is None:
+        raise HTTPException(status_code=503, detail="Package store not available")
+    
+    package = store.get(package_id)
+    if package is None:
+        raise HTTPException(status_code=404, detail="Package not found")
+    return {"success": True, "package": package}
+
 @app.get("/ai/profile/{session_id}")
 async def get_ai_enhanced_profile(session_id: str):
     """Get AI-enhanced user profile"""
@@ -841,6 +992,38 @@ async def health_check_simple():
 async def health_check():
     return {"status": "ok", "service": "career-autofill-backend", "timestamp": datetime.now().isoformat()}
 
+@app.get("/api/metrics")
+async def get_metrics():
+    """Runtime metrics for monitoring background components"""
+    metrics = {"timestamp": datetime.now().isoformat()}
+    
+    if AI_AGENTS_AVAILABLE:
+        metrics["interaction_logger"] = get_interaction_logger().stats()
+        if ai_planner:
+            metrics["jd_dedup"] = ai_planner.dedup_cache.stats()
+        metrics["prompt_builder"] = {
+            name: agent.prompt_builder.stats()
+            for name, agent in (("planner", ai_planner), ("executor", ai_executor)) if agent
+        }
+        if ai_executor:
+            metrics["cover_letter_streaming"] = ai_executor.streaming_stats()
+            metrics["generation_cache"] = ai_executor.generation_cache.stats()
+            metrics["bullet_generation"] = ai_executor.bullet_generation_stats()
+            if ai_executor.package_store is not None:
+                metrics["package_store"] = ai_executor.package_store.stats()
+        generator = getattr(ai_executor, "generator", None)
+        if getattr(generator, "prefix_cache", None) is not None:
+            metrics["prefix_cache"] = generator.prefix_cache.stats()
+        if getattr(generator, "draft_model", None) is not None:
+            metrics["speculative_decoding"] = generator.speculative_stats()
+        if generator is not None and hasattr(generator, "stats"):
+            try:
+                metrics["model_server"] = generator.stats()
+            except Exception as e:
+                metrics["model_server"] = {"error": str(e)}
+    
+    return metrics
+
 # Frontend-specific endpoints
 @app.post("/analyze-job")
 async def analyze_job_for_frontend(request: dict):
@@ -919,7 +1102,8 @@ async def generate_application_for_frontend(request: dict):
         strategy = analysis.get('strategy', analysis)
         
         # Generate application materials
-        application_package = ai_executor.generate_application_package(strategy)
+        application_package = ai_executor.generate_application_package(
+            strategy, use_cache=not request.get('bypass_cache', False))
         
         # Evaluate the generated package
         if ai_evaluator:
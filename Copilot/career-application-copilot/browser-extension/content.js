@@ -12,6 +12,7 @@ const CONFIG = {
         ANALYZE_JOB: '/ai/analyze-job',
         GENERATE_APP: '/ai/generate-application', 
         GET_PROFILE: '/ai/profile',
+        STREAM_COVER_LETTER: '/ai/generate-cover-letter/stream',
         EXTENSION_PROFILE: '/api/extension/profile'
     },
     SUPPORTED_SITES: {
@@ -372,6 +373,9 @@ class SmartAutofillEngine {
     }
 
     async fillField(field) {
+        // Cover letters are written into the field as the model generates them
+        if (field.purpose === 'cover_letter' && await this.streamCoverLetterIntoField(field)) return;
+
         const value = this.getValueForField(field);
         if (!value) return;
 
@@ -401,6 +405,43 @@ class SmartAutofillEngine {
         }, 2000);
     }
 
+    async streamCoverLetterIntoField(field) {
+        if (!extractJobDescription()) return false;
+
+        const element = field.element;
+        element.classList.add('career-autofill-highlight');
+        this.addFieldLabel(element, field.purpose);
+        element.focus();
+        element.value = '';
+
+        const result = await streamAICoverLetter((text) => {
+            element.value += text;
+            element.dispatchEvent(new Event('input', { bubbles: true }));
+        });
+
+        if (result) {
+            // The final letter may differ from the streamed text (e.g. replaced by the fallback)
+            element.value = result.cover_letter;
+            element.dispatchEvent(new Event('input', { bubbles: true }));
+            element.dispatchEvent(new Event('change', { bubbles: true }));
+            element.classList.add('career-autofill-filled');
+        } else {
+            // fillField falls back to the template letter
+            element.value = '';
+            element.classList.remove('career-autofill-highlight');
+            this.removeFieldLabel(element);
+            return false;
+        }
+
+        element.classList.remove('career-autofill-highlight');
+        element.blur();
+        setTimeout(() => {
+            element.classList.remove('career-autofill-filled');
+            this.removeFieldLabel(element);
+        }, 2000);
+        return true;
+    }
+
     getValueForField(field) {
         if (!userProfile) return '';
 
@@ -609,6 +650,64 @@ async function analyzeJobDescription() {
     }
 }
 
+// AI Cover Letter, streamed token by token into onToken; resolves with the final "done" event
+async function streamAICoverLetter(onToken) {
+    const jobDescription = extractJobDescription();
+    if (!jobDescription) return null;
+
+    try {
+        console.log('✍️ Streaming cover letter from AI...');
+
+        const response = await fetch(`${CONFIG.API_BASE}${CONFIG.AI_ENDPOINTS.STREAM_COVER_LETTER}`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                job_description: jobDescription,
+                company_name: extractCompanyName(),
+                role_title: extractRoleTitle()
+            })
+        });
+
+        if (!response.ok) {
+            console.error('❌ Cover letter streaming failed:', response.status);
+            return null;
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let result = null;
+
+        const handleLine = (line) => {
+            if (!line.trim()) return;
+            const event = JSON.parse(line);
+            if (event.type === 'token') onToken(event.text);
+            else if (event.type === 'done') result = event;
+            else if (event.type === 'error') console.error('❌ Cover letter streaming error:', event.error);
+        };
+
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            const lines = buffer.split('\n');
+            buffer = lines.pop();
+            lines.forEach(handleLine);
+        }
+        handleLine(buffer);
+
+        if (result) {
+            console.log(`✅ Cover letter streamed (first token ${result.ttft_ms}ms, total ${result.total_ms}ms)`);
+        }
+        return result;
+    } catch (error) {
+        console.error('❌ Cover letter streaming error:', error);
+        return null;
+    }
+}
+
 // Extract job description from page
 function extractJobDescription() {
     const site = CONFIG.SUPPORTED_SITES[window.location.hostname];
@@ -25,6 +25,27 @@ apiClient.interceptors.request.use(
   }
 );
 
+// Read a newline-delimited JSON response, calling onLine with each parsed line as it arrives
+const readNdjson = async (response, onLine) => {
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  const handleLine = (line) => {
+    if (line.trim()) onLine(JSON.parse(line));
+  };
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    const lines = buffer.split('\n');
+    buffer = lines.pop();
+    lines.forEach(handleLine);
+  }
+  handleLine(buffer);
+};
+
 // Response interceptor for error handling
 apiClient.interceptors.response.use(
   (response) => {
@@ -111,14 +132,95 @@ class ApiService {
     }
   }
 
-  // Generate application package
-  async generateApplicationPackage(jobDescription, companyName, roleTitle, sessionId) {
+  // Analyze many job descriptions in one request; onResult receives each
+  // NDJSON line ({ index, status, strategy | error, timing }) as it completes
+  async analyzeJobs(jobDescriptions, onResult = null, { maxWorkers = null, timeout = null } = {}) {
+    try {
+      const response = await fetch(`${API_BASE_URL}/ai/analyze-jobs`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+          job_descriptions: jobDescriptions,
+          max_workers: maxWorkers,
+          timeout: timeout,
+        }),
+      });
+
+      if (!response.ok) {
+        const body = await response.json().catch(() => ({}));
+        return { success: false, error: body.detail || `HTTP ${response.status}` };
+      }
+
+      const results = [];
+      await readNdjson(response, (result) => {
+        results.push(result);
+        if (onResult) onResult(result);
+      });
+
+      return { success: true, data: results.sort((a, b) => a.index - b.index) };
+    } catch (error) {
+      return { success: false, error: error.message };
+    }
+  }
+
+  // Stream a cover letter as it is generated; onToken receives each text chunk.
+  // Resolves with the final letter plus its timing ({ ttftMs, totalMs }).
+  async streamCoverLetter(jobDescription, companyName = null, roleTitle = null, onToken = null) {
+    try {
+      const response = await fetch(`${API_BASE_URL}/ai/generate-cover-letter/stream`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+          job_description: jobDescription,
+          company_name: companyName,
+          role_title: roleTitle,
+        }),
+      });
+
+      if (!response.ok) {
+        const body = await response.json().catch(() => ({}));
+        return { success: false, error: body.detail || `HTTP ${response.status}` };
+      }
+
+      let strategy = null;
+      let done = null;
+      let streamError = null;
+      await readNdjson(response, (event) => {
+        if (event.type === 'token' && onToken) onToken(event.text);
+        else if (event.type === 'strategy') strategy = event;
+        else if (event.type === 'done') done = event;
+        else if (event.type === 'error') streamError = event.error;
+      });
+
+      if (!done) {
+        return { success: false, error: streamError || 'Stream ended before the cover letter was complete' };
+      }
+      return {
+        success: true,
+        data: {
+          coverLetter: done.cover_letter,
+          source: done.source,
+          replaced: done.replaced,
+          strategy,
+          ttftMs: done.ttft_ms,
+          totalMs: done.total_ms,
+        },
+      };
+    } catch (error) {
+      return { success: false, error: error.message };
+    }
+  }
+
+  // Generate application package; identical requests are served from the
+  // backend's generation cache unless bypassCache is set (e.g. "Regenerate")
+  async generateApplicationPackage(jobDescription, companyName, roleTitle, sessionId, { bypassCache = false } = {}) {
     try {
       const response = await apiClient.post('/ai/generate-application', {
         job_description: jobDescription,
         company_name: companyName,
         role_title: roleTitle,
         session_id: sessionId,
+        bypass_cache: bypassCache,
       });
 
       return { success: true, data: response.data };
@@ -239,6 +341,8 @@ export const {
   uploadResume,
   getProfile,
   analyzeJob,
+  analyzeJobs,
+  streamCoverLetter,
   generateApplicationPackage,
   getAIProfile,
   getAutoFillSuggestions,
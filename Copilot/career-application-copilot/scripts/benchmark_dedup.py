@@ -0,0 +1,114 @@
+"""
+Benchmark: MinHash/LSH near-duplicate JD detection on a synthetic repost corpus
+Each base posting is reposted several times with trivial edits (reworded lines,
+dropped words, board boilerplate). Reports the dedup rate, precision/recall
+against the known ground truth, and the analysis time saved.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from jd_dedup import DedupAnalysisCache, JDDeduplicator
+from jd_parser import parse_job_description
+from job_feed import iter_job_descriptions
+
+BOARD_FOOTERS = [
+    "Posted via CampusHire. Click apply to submit your profile.",
+    "Found on InternBoard - share this job with your friends!",
+    "Apply now through JobsDaily for a faster response.",
+    ""
+]
+
+
+def make_base_postings(template_dir: str, count: int, rng: random.Random):
+    """Distinct postings: shuffle and resample lines from the sample JDs"""
+    lines = []
+    for record in iter_job_descriptions(template_dir):
+        lines.extend(line for line in record["text"].splitlines() if line.strip())
+    companies = [f"Company{i}" for i in range(count)]
+    for i in range(count):
+        body = rng.sample(lines, min(len(lines), 25))
+        yield f"{rng.choice(['ML', 'Data', 'Backend', 'Frontend'])} Intern at {companies[i]}\n" + "\n".join(body)
+
+
+def mutate(text: str, rng: random.Random) -> str:
+    words = text.split(" ")
+    for _ in range(max(1, len(words) // 50)):
+        position = rng.randrange(len(words))
+        if rng.random() < 0.5:
+            words.pop(position)
+        else:
+            words[position] = words[position].upper()
+    return " ".join(words) + "\n" + rng.choice(BOARD_FOOTERS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark near-duplicate JD detection")
+    parser.add_argument("--templates", default="data/sample_jds")
+    parser.add_argument("--base-postings", type=int, default=500)
+    parser.add_argument("--reposts", type=int, default=4, help="Mutated copies per base posting")
+    parser.add_argument("--threshold", type=float, default=0.8)
+    parser.add_argument("--num-perm", type=int, default=128)
+    parser.add_argument("--llm-latency", type=float, default=2.0,
+                        help="Simulated seconds per full (LLM) analysis for the time-saved estimate")
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = []
+    for base_id, text in enumerate(make_base_postings(args.templates, args.base_postings, rng)):
+        corpus.append((base_id, text))
+        corpus.extend((base_id, mutate(text, rng)) for _ in range(args.reposts))
+    rng.shuffle(corpus)
+
+    cache = DedupAnalysisCache(JDDeduplicator(threshold=args.threshold, num_perm=args.num_perm))
+    canonical_base = {}
+    true_pos = false_pos = false_neg = 0
+    seen_bases = set()
+    dedup_seconds = 0.0
+
+    for base_id, text in corpus:
+        start = time.perf_counter()
+        analysis, info = cache.lookup(text)
+        dedup_seconds += time.perf_counter() - start
+
+        is_repeat = base_id in seen_bases
+        seen_bases.add(base_id)
+
+        if analysis is not None:
+            if canonical_base.get(info["duplicate_of"]) == base_id:
+                true_pos += 1
+            else:
+                false_pos += 1
+        else:
+            if is_repeat:
+                false_neg += 1
+            parse_job_description(text)
+            cache.store(info, {"base_id": base_id}, args.llm_latency)
+            canonical_base[info["key"]] = base_id
+
+    stats = cache.stats()
+    duplicates = stats["duplicates"]
+    results = {
+        "postings": len(corpus),
+        "true_duplicates": len(corpus) - args.base_postings,
+        "dedup_rate": stats["dedup_rate"],
+        "precision": round(true_pos / duplicates, 4) if duplicates else None,
+        "recall": round(true_pos / (true_pos + false_neg), 4) if (true_pos + false_neg) else None,
+        "bands": stats["bands"],
+        "rows": stats["rows"],
+        "dedup_overhead_ms_per_jd": round(dedup_seconds / len(corpus) * 1000, 3),
+        "analysis_seconds_saved": round(stats["seconds_saved"], 1),
+        "analysis_seconds_without_dedup": round(len(corpus) * args.llm_latency, 1)
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""
+Benchmark: executor latency, throughput and memory with a tiny offline model
+Builds a randomly initialised GPT-2 style causal LM (the DialoGPT family) with a
+byte-level BPE tokenizer trained on the sample JDs, plus a LoRA adapter on the
+same modules train_lora.py targets, so no download is needed. The executor then
+loads it through its normal adapter path, and generate_resume_bullets,
+generate_cover_letter and generate_application_package are driven at the given
+concurrency. Reports p50/p95 latency, tokens/sec and peak RSS as JSON, for
+tracking regressions rather than absolute numbers.
+
+Example:
+  python scripts/benchmark_executor.py --concurrency 4 --requests 16 --new-tokens 64 --output executor_bench.json
+"""
+import argparse
+import glob
+import json
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+STRATEGIES = [
+    {"jd_analysis": {"title": "Machine Learning Intern", "company": "TechCorp",
+                     "skills": ["Python", "TensorFlow", "PyTorch", "Computer Vision"]},
+     "matching_skills": ["Python", "TensorFlow"], "suggested_projects": [],
+     "recommended_focus": ["Highlight machine learning projects"], "match_score": 0.6},
+    {"jd_analysis": {"title": "Data Science Intern", "company": "DataFlow",
+                     "skills": ["SQL", "Pandas", "Statistics", "Tableau"]},
+     "matching_skills": ["SQL", "Pandas"], "suggested_projects": [],
+     "recommended_focus": ["Highlight data analysis work"], "match_score": 0.5},
+    {"jd_analysis": {"title": "Full Stack Intern", "company": "StartupX",
+                     "skills": ["React", "Node.js", "MongoDB", "Docker"]},
+     "matching_skills": ["React"], "suggested_projects": [],
+     "recommended_focus": ["Highlight web projects"], "match_score": 0.4},
+]
+
+OPERATIONS = ("generate_resume_bullets", "generate_cover_letter", "generate_application_package")
+
+
+def build_tiny_model(output_dir, n_layer=2, n_embd=64, n_head=2, vocab_size=1000, seed=0):
+    """Random-weight GPT-2 base model and LoRA adapter under output_dir/base and output_dir/lora"""
+    import torch
+    from peft import LoraConfig, get_peft_model
+    from tokenizers import ByteLevelBPETokenizer
+    from transformers import GPT2Config, GPT2LMHeadModel, PreTrainedTokenizerFast
+
+    torch.manual_seed(seed)
+    data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
+    texts = []
+    for path in sorted(glob.glob(os.path.join(data_dir, 'sample_jds', '*'))) + [os.path.join(data_dir, 'profile.json')]:
+        with open(path, 'r', encoding='utf-8') as f:
+            texts.append(f.read())
+
+    bpe = ByteLevelBPETokenizer()
+    bpe.train_from_iterator(texts, vocab_size=vocab_size, special_tokens=["<|endoftext|>"])
+    tokenizer = PreTrainedTokenizerFast(tokenizer_object=bpe, eos_token="<|endoftext|>", bos_token="<|endoftext|>",
+                                        unk_token="<|endoftext|>", model_max_length=1024)
+
+    config = GPT2Config(vocab_size=len(tokenizer), n_positions=1024, n_embd=n_embd, n_layer=n_layer, n_head=n_head,
+                        bos_token_id=tokenizer.eos_token_id, eos_token_id=tokenizer.eos_token_id)
+    model = GPT2LMHeadModel(config)
+    base_path, adapter_path = os.path.join(output_dir, "base"), os.path.join(output_dir, "lora")
+    model.save_pretrained(base_path)
+    tokenizer.save_pretrained(base_path)
+
+    # Non-zero adapter weights, so the adapter actually changes the forward pass
+    lora_config = LoraConfig(r=8, lora_alpha=16, target_modules=["c_attn", "c_proj"], lora_dropout=0.0,
+                             bias="none", task_type="CAUSAL_LM", init_lora_weights=False)
+    get_peft_model(model, lora_config).save_pretrained(adapter_path)
+    return base_path, adapter_path, sum(p.numel() for p in model.parameters())
+
+
+def current_rss_mb():
+    # /proc gives the current RSS on Linux; elsewhere fall back to the peak so far
+    try:
+        with open("/proc/self/statm", 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, IndexError):
+        return peak_rss_mb()
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 1024
+
+
+class RssSampler:
+    """Highest RSS seen while the block runs, sampled from a background thread"""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.peak = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, current_rss_mb())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss_mb())
+
+
+class CountingGenerator:
+    """Passes calls through to the generator and totals the new tokens it returns"""
+
+    def __init__(self, generator):
+        self._generator = generator
+        self._lock = threading.Lock()
+        self.tokens = 0
+
+    def __getattr__(self, name):
+        return getattr(self._generator, name)
+
+    def generate(self, prompt, **params):
+        return self.generate_batch([prompt], **params)[0]["text"]
+
+    def generate_batch(self, prompts, **params):
+        results = self._generator.generate_batch(prompts, **params)
+        with self._lock:
+            self.tokens += sum(result["tokens"] for result in results)
+        return results
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return round(ordered[min(int(q * len(ordered)), len(ordered) - 1)] * 1000, 1)
+
+
+def run_operation(executor, generator, operation, requests, concurrency):
+    call = getattr(executor, operation)
+    kwargs = {"use_cache": False} if operation == "generate_application_package" else {}
+    latencies, errors = [], []
+
+    def one(index):
+        start = time.perf_counter()
+        try:
+            call(STRATEGIES[index % len(STRATEGIES)], **kwargs)
+        except Exception as e:
+            errors.append(str(e))
+        latencies.append(time.perf_counter() - start)
+
+    generator.tokens = 0
+    with RssSampler() as rss:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(one, range(requests)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "requests": requests,
+        "errors": len(errors),
+        "latency_ms_p50": percentile(latencies, 0.5),
+        "latency_ms_p95": percentile(latencies, 0.95),
+        "latency_ms_mean": round(statistics.mean(latencies) * 1000, 1),
+        "requests_per_sec": round(requests / elapsed, 2),
+        "tokens_generated": generator.tokens,
+        "tokens_per_sec": round(generator.tokens / elapsed, 1),
+        "peak_rss_mb": round(rss.peak, 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the executor with a tiny randomly initialised model")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=12, help="Requests per operation")
+    parser.add_argument("--new-tokens", type=int, default=64)
+    parser.add_argument("--operations", default=",".join(OPERATIONS))
+    parser.add_argument("--n-layer", type=int, default=2)
+    parser.add_argument("--n-embd", type=int, default=64)
+    parser.add_argument("--n-head", type=int, default=2)
+    parser.add_argument("--vocab-size", type=int, default=1000)
+    parser.add_argument("--model-dir", default=None, help="Keep the tiny model here (default: a temporary directory)")
+    parser.add_argument("--output", default=None, help="Also write the JSON results to this file")
+    args = parser.parse_args()
+
+    operations = [name.strip() for name in args.operations.split(",") if name.strip()]
+    unknown = set(operations) - set(OPERATIONS)
+    if unknown:
+        parser.error(f"unknown operations: {', '.join(sorted(unknown))}")
+
+    baseline_rss = current_rss_mb()
+    with tempfile.TemporaryDirectory() as tmp:
+        model_dir = args.model_dir or tmp
+        start = time.perf_counter()
+        base_path, adapter_path, parameters = build_tiny_model(model_dir, args.n_layer, args.n_embd,
+                                                               args.n_head, args.vocab_size)
+        build_seconds = time.perf_counter() - start
+
+        # Point the executor's normal loading path at the tiny model; nothing else is loaded or logged
+        os.environ.update({
+            "BASE_MODEL": base_path,
+            "FINE_TUNED_MODEL_PATH": adapter_path,
+            "MERGED_MODEL_PATH": os.path.join(model_dir, "merged-absent"),
+            "GENERATOR_BACKEND": "torch",
+            "MODEL_SERVER_ADDRESS": "",
+            "DRAFT_MODEL": "",
+            "GENERATION_CACHE_DIR": "",
+            "PACKAGE_STORE_DIR": "",
+            "SAVE_INTERACTION_LOGS": "false"
+        })
+        import executor as executor_module
+        executor_module.MAX_NEW_TOKENS = args.new_tokens
+
+        start = time.perf_counter()
+        executor = executor_module.ApplicationExecutor()
+        load_seconds = time.perf_counter() - start
+        if not executor.use_fine_tuned:
+            print("❌ The executor did not load the tiny model")
+            sys.exit(1)
+        generator = CountingGenerator(executor.generator)
+        executor.generator = generator
+        loaded_rss = current_rss_mb()
+
+        # Warm up once per operation so lazy initialisation isn't timed
+        for operation in operations:
+            run_operation(executor, generator, operation, 1, 1)
+
+        results = {
+            "model": {"family": "gpt2", "n_layer": args.n_layer, "n_embd": args.n_embd, "n_head": args.n_head,
+                      "vocab_size": args.vocab_size, "parameters": parameters,
+                      "build_seconds": round(build_seconds, 2), "load_seconds": round(load_seconds, 2)},
+            "concurrency": args.concurrency,
+            "new_tokens": args.new_tokens,
+            "baseline_rss_mb": round(baseline_rss, 1),
+            "loaded_rss_mb": round(loaded_rss, 1),
+            "operations": {operation: run_operation(executor, generator, operation, args.requests, args.concurrency)
+                           for operation in operations},
+            "peak_rss_mb": round(peak_rss_mb(), 1)
+        }
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: JobIndex add/search latency, save/load and memory-mapped loading
+Uses random unit vectors with MiniLM's dimensionality so no model download is needed
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from job_index import JobIndex
+
+
+def percentile_ms(samples, pct):
+    return round(float(np.percentile(samples, pct)) * 1000, 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the FAISS similar-job index")
+    parser.add_argument("--postings", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    parser.add_argument("--queries", type=int, default=1_000)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    index_dir = tempfile.mkdtemp(prefix="job_index_bench_")
+    analysis = {"title": "Synthetic Posting", "skills": ["Python"], "seniority": "intern", "job_type": "internship"}
+
+    try:
+        job_index = JobIndex(index_dir, dim=args.dim, autosave_every=0)
+
+        start = time.perf_counter()
+        for offset in range(0, args.postings, args.batch_size):
+            count = min(args.batch_size, args.postings - offset)
+            vectors = rng.standard_normal((count, args.dim), dtype=np.float32)
+            job_index.add_batch([f"posting {offset + i}" for i in range(count)], [analysis] * count, vectors=vectors)
+        add_seconds = time.perf_counter() - start
+
+        queries = rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+        latencies = []
+        for query in queries:
+            t0 = time.perf_counter()
+            job_index.search(vector=query, k=args.k)
+            latencies.append(time.perf_counter() - t0)
+
+        start = time.perf_counter()
+        job_index.save()
+        save_seconds = time.perf_counter() - start
+
+        results = {
+            "postings": len(job_index),
+            "dim": args.dim,
+            "add_postings_per_sec": round(args.postings / add_seconds, 1),
+            "search_p50_ms": percentile_ms(latencies, 50),
+            "search_p99_ms": percentile_ms(latencies, 99),
+            "save_seconds": round(save_seconds, 3),
+            "index_file_mb": round(os.path.getsize(os.path.join(index_dir, JobIndex.INDEX_FILE)) / 1e6, 1)
+        }
+
+        for mmap in (False, True):
+            start = time.perf_counter()
+            loaded = JobIndex.load(index_dir, dim=args.dim, mmap=mmap)
+            load_seconds = time.perf_counter() - start
+
+            latencies = []
+            for query in queries[:200]:
+                t0 = time.perf_counter()
+                loaded.search(vector=query, k=args.k)
+                latencies.append(time.perf_counter() - t0)
+
+            label = "mmap" if mmap else "in_memory"
+            results[f"load_{label}_seconds"] = round(load_seconds, 3)
+            results[f"search_{label}_p50_ms"] = percentile_ms(latencies, 50)
+
+        print(json.dumps(results, indent=2))
+    finally:
+        shutil.rmtree(index_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
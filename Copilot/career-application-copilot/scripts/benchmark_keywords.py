@@ -0,0 +1,66 @@
+"""
+Benchmark: per-JD keyword extraction latency with the precomputed IDF table
+Compares single-JD and batched sparse transforms against the old regex keywords.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from jd_parser import parse_job_description
+from job_feed import iter_job_descriptions
+from keyword_extractor import KeywordExtractor
+
+
+def per_call_us(fn, items):
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    return (time.perf_counter() - start) / len(items) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TF-IDF keyword extraction")
+    parser.add_argument("--source", default="data/sample_jds")
+    parser.add_argument("--idf", help="Existing IDF table (default: fit on --source)")
+    parser.add_argument("--repeats", type=int, default=300)
+    args = parser.parse_args()
+
+    texts = [record["text"] for record in iter_job_descriptions(args.source)]
+    if args.idf:
+        extractor = KeywordExtractor.load(args.idf)
+    else:
+        extractor = KeywordExtractor.fit(texts)
+
+    # Round-trip through the persisted format so the timing reflects production loading
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "idf.npz")
+        start = time.perf_counter()
+        extractor.save(path)
+        extractor = KeywordExtractor.load(path)
+        load_ms = (time.perf_counter() - start) * 1000
+
+    workload = (texts * (args.repeats // max(len(texts), 1) + 1))[:args.repeats]
+
+    start = time.perf_counter()
+    extractor.extract_batch(workload)
+    batch_us = (time.perf_counter() - start) / len(workload) * 1e6
+
+    results = {
+        "vocabulary_size": extractor.vocabulary_size,
+        "save_and_load_ms": round(load_ms, 2),
+        "tfidf_single_us_per_jd": round(per_call_us(extractor.extract, workload), 1),
+        "tfidf_batch_us_per_jd": round(batch_us, 1),
+        "regex_keywords_us_per_jd": round(per_call_us(parse_job_description, workload), 1),
+        "sample_keywords": {text.splitlines()[0][:60]: extractor.extract(text) for text in texts[:3]}
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: startup time and per-token latency of the generator loading modes
+  adapter       base model + PeftModel wrapper (the original path)
+  merged        merged safetensors checkpoint
+  merged_int8   merged checkpoint with dynamic int8 quantization (CPU)
+
+Example:
+  python scripts/benchmark_model_loading.py --base-model microsoft/DialoGPT-medium --model-path models/career-copilot-lora
+"""
+import argparse
+import gc
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import torch
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.dirname(__file__))
+
+from generation import DEFAULT_BASE_MODEL, DEFAULT_MODEL_PATH, LocalGenerator
+from merge_lora import merge_lora
+
+PROMPT = "Input: Write a resume bullet about building a Flask API for a machine learning model.\n\nOutput:"
+
+
+def per_token_ms(generator, new_tokens, repeats):
+    inputs = generator.tokenizer(PROMPT, return_tensors="pt")
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        with torch.no_grad():
+            generator.model.generate(**inputs, max_new_tokens=new_tokens, min_new_tokens=new_tokens,
+                                     do_sample=False, pad_token_id=generator.tokenizer.pad_token_id)
+        samples.append((time.perf_counter() - start) / new_tokens * 1000)
+    return round(sorted(samples)[len(samples) // 2], 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare generator loading modes")
+    parser.add_argument("--base-model", default=os.getenv("BASE_MODEL", DEFAULT_BASE_MODEL))
+    parser.add_argument("--model-path", default=os.getenv("FINE_TUNED_MODEL_PATH", DEFAULT_MODEL_PATH))
+    parser.add_argument("--merged-path", help="Existing merged checkpoint (default: merge into a temp dir)")
+    parser.add_argument("--new-tokens", type=int, default=32)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        merged_path = args.merged_path
+        results = {"base_model": args.base_model, "threads": torch.get_num_threads(), "modes": {}}
+        if merged_path is None:
+            merged_path = os.path.join(tmp, "merged")
+            results["merge_seconds"] = merge_lora(args.base_model, args.model_path, merged_path)["merge_seconds"]
+
+        loaders = {
+            "adapter": lambda: LocalGenerator.load_adapter(args.model_path, args.base_model),
+            "merged": lambda: LocalGenerator.load_merged(merged_path),
+            "merged_int8": lambda: LocalGenerator.load_merged(merged_path, quantize=True),
+        }
+        for mode, loader in loaders.items():
+            gc.collect()
+            start = time.perf_counter()
+            generator = loader()
+            load_seconds = time.perf_counter() - start
+            results["modes"][mode] = {
+                "load_seconds": round(load_seconds, 3),
+                "per_token_ms": per_token_ms(generator, args.new_tokens, args.repeats),
+            }
+            del generator
+
+        # ru_maxrss is in KB on Linux
+        results["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
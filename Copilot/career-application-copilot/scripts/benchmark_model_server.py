@@ -0,0 +1,107 @@
+"""
+Benchmark: model server throughput vs. client concurrency
+Starts a ModelServer in-process and drives it with N concurrent ModelClient
+threads, once with batching disabled (max batch 1, the old serial behaviour)
+and once with dynamic batching.
+
+Example:
+  python scripts/benchmark_model_server.py --base-model microsoft/DialoGPT-medium --model-path models/career-copilot-lora
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from generation import LocalGenerator
+from model_server import ModelClient, ModelServer
+
+PROMPTS = [
+    "Input: Write a resume bullet about building a Flask API for a machine learning model.\n\nOutput:",
+    "Input: Write a resume bullet about a React dashboard for tracking job applications.\n\nOutput:",
+    "Input: Write a resume bullet about training a computer vision model with PyTorch.\n\nOutput:",
+    "Input: Write a resume bullet about leading a university coding club.\n\nOutput:",
+]
+
+
+def load_generator(base_model, model_path):
+    # Plain CPU load; the benchmark measures serving, not quantization
+    from transformers import AutoModelForCausalLM, AutoTokenizer
+    tokenizer = AutoTokenizer.from_pretrained(base_model)
+    model = AutoModelForCausalLM.from_pretrained(base_model)
+    if model_path:
+        from peft import PeftModel
+        model = PeftModel.from_pretrained(model, model_path)
+    return LocalGenerator(model, tokenizer, base_model=base_model, model_path=model_path)
+
+
+def drive(address, concurrency, requests_per_client, new_tokens):
+    tokens = [0] * concurrency
+    errors = []
+
+    def client_loop(slot):
+        client = ModelClient(address)
+        try:
+            for i in range(requests_per_client):
+                result = client.generate_batch([PROMPTS[(slot + i) % len(PROMPTS)]],
+                                               max_new_tokens=new_tokens, temperature=0.0, top_p=1.0)
+                tokens[slot] += result[0]["tokens"]
+        except Exception as e:
+            errors.append(str(e))
+        finally:
+            client.close()
+
+    threads = [threading.Thread(target=client_loop, args=(slot,)) for slot in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    total_requests = concurrency * requests_per_client
+    return {
+        "requests": total_requests,
+        "tokens_per_second": round(sum(tokens) / elapsed, 1),
+        "requests_per_second": round(total_requests / elapsed, 2),
+        "errors": len(errors)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the batching model server")
+    parser.add_argument("--base-model", default=os.getenv("BASE_MODEL", "microsoft/DialoGPT-medium"))
+    parser.add_argument("--model-path", default=None, help="Optional LoRA adapter directory")
+    parser.add_argument("--concurrency", default="1,2,4,8")
+    parser.add_argument("--requests-per-client", type=int, default=4)
+    parser.add_argument("--new-tokens", type=int, default=32)
+    parser.add_argument("--batch-window-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    generator = load_generator(args.base_model, args.model_path)
+    levels = [int(level) for level in args.concurrency.split(",")]
+    results = {"base_model": args.base_model, "new_tokens": args.new_tokens, "runs": []}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, max_batch in (("serial", 1), ("batched", max(levels))):
+            address = os.path.join(tmp, f"{label}.sock")
+            server = ModelServer(generator, address, max_batch_size=max_batch, batch_window_ms=args.batch_window_ms)
+            server.start()
+            # Warm up once so the first run doesn't pay for lazy initialisation
+            drive(address, 1, 1, args.new_tokens)
+            for concurrency in levels:
+                run = drive(address, concurrency, args.requests_per_client, args.new_tokens)
+                results["runs"].append({"mode": label, "concurrency": concurrency, **run})
+            results[f"{label}_server_stats"] = server.stats()
+            server.close()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
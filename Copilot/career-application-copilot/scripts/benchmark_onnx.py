@@ -0,0 +1,93 @@
+"""
+Benchmark: ONNX Runtime vs. PyTorch generator backends
+Runs the same fixed prompts through LocalGenerator (merged checkpoint) and
+OnnxGenerator (its ONNX export), checks that greedy decoding produces the same
+text on both, single and batched, with and without a cached prefix, and reports
+decode throughput per backend.
+
+Example:
+  python scripts/export_onnx.py
+  python scripts/benchmark_onnx.py --merged-path models/career-copilot-merged --onnx-path models/career-copilot-onnx
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.dirname(__file__))
+
+from benchmark_model_server import PROMPTS
+from generation import DEFAULT_MERGED_MODEL_PATH, LocalGenerator
+from onnx_generator import DEFAULT_ONNX_MODEL_PATH, OnnxGenerator
+
+# The shared instruction start of every benchmark prompt
+PREFIX = "Input: Write a resume bullet about"
+
+
+def check_parity(generators, new_tokens):
+    """Prompts (single, batched, prefixed) whose greedy output differs between the backends"""
+    params = {"max_new_tokens": new_tokens, "temperature": 0.0, "top_p": 1.0}
+    cases = [("single", [prompt], None) for prompt in PROMPTS]
+    cases.append(("batched", PROMPTS, None))
+    cases.append(("prefixed", PROMPTS, PREFIX))
+
+    mismatches = []
+    checked = 0
+    for name, prompts, prefix in cases:
+        outputs = [generator.generate_batch(prompts, prefix=prefix, **params) for generator in generators.values()]
+        for index, (reference, candidate) in enumerate(zip(*outputs)):
+            checked += 1
+            if reference["text"] != candidate["text"]:
+                mismatches.append({"case": name, "prompt": prompts[index],
+                                   "torch": reference["text"], "onnx": candidate["text"]})
+    return checked, mismatches
+
+
+def time_backend(generator, new_tokens, repeats):
+    params = {"max_new_tokens": new_tokens, "temperature": 0.0, "top_p": 1.0}
+    generator.generate_batch([PROMPTS[0]], **params)
+    rates, tokens = [], 0
+    for _ in range(repeats):
+        for prompt in PROMPTS:
+            start = time.perf_counter()
+            result = generator.generate_batch([prompt], **params)[0]
+            rates.append(result["tokens"] / (time.perf_counter() - start))
+            tokens += result["tokens"]
+    return {"tokens_per_sec_median": round(statistics.median(rates), 1), "tokens_generated": tokens}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the ONNX Runtime and PyTorch generator backends")
+    parser.add_argument("--merged-path", default=os.getenv("MERGED_MODEL_PATH", DEFAULT_MERGED_MODEL_PATH))
+    parser.add_argument("--onnx-path", default=os.getenv("ONNX_MODEL_PATH", DEFAULT_ONNX_MODEL_PATH))
+    parser.add_argument("--new-tokens", type=int, default=64)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    generators = {
+        "torch": LocalGenerator.load_merged(args.merged_path),
+        "onnx": OnnxGenerator.load(args.onnx_path)
+    }
+
+    checked, mismatches = check_parity(generators, args.new_tokens)
+    results = {
+        "merged_path": args.merged_path,
+        "onnx_path": args.onnx_path,
+        "new_tokens": args.new_tokens,
+        "greedy_parity": {"outputs_checked": checked, "matching": checked - len(mismatches),
+                          "mismatches": mismatches},
+        "backends": {name: time_backend(generator, args.new_tokens, args.repeats)
+                     for name, generator in generators.items()}
+    }
+    torch_rate = results["backends"]["torch"]["tokens_per_sec_median"]
+    if torch_rate:
+        results["onnx_speedup"] = round(results["backends"]["onnx"]["tokens_per_sec_median"] / torch_rate, 2)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
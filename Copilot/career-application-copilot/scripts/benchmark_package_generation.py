@@ -0,0 +1,82 @@
+"""
+Benchmark: application package latency, sequential vs. batched generation
+Sequential runs generate_resume_bullets() then generate_cover_letter() (the old
+pipeline); batched runs generate_application_package(), which sends both prompts
+through one padded generate() call.
+
+Example:
+  python scripts/benchmark_package_generation.py --base-model microsoft/DialoGPT-medium --model-path models/career-copilot-lora
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.dirname(__file__))
+
+import executor as executor_module
+from benchmark_model_server import load_generator
+from executor import ApplicationExecutor
+from prompt_builder import PromptBuilder
+
+SAMPLE_STRATEGY = {
+    "jd_analysis": {
+        "title": "Machine Learning Intern",
+        "company": "TechCorp",
+        "skills": ["Python", "TensorFlow", "PyTorch", "Machine Learning", "Computer Vision"]
+    },
+    "matching_skills": ["Python", "TensorFlow", "Machine Learning"],
+    "suggested_projects": [],
+    "recommended_focus": ["Highlight machine learning projects"],
+    "match_score": 0.6
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sequential vs. batched package generation")
+    parser.add_argument("--base-model", default=os.getenv("BASE_MODEL", "microsoft/DialoGPT-medium"))
+    parser.add_argument("--model-path", default=None, help="Optional LoRA adapter directory")
+    parser.add_argument("--new-tokens", type=int, default=executor_module.MAX_NEW_TOKENS)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    # Fixed-length completions keep the two modes comparable
+    executor_module.MAX_NEW_TOKENS = args.new_tokens
+
+    executor = ApplicationExecutor()
+    executor.generator = load_generator(args.base_model, args.model_path)
+    executor.tokenizer = executor.generator.tokenizer
+    executor.context_window = executor.generator.context_window
+    executor.use_fine_tuned = True
+    executor.prompt_builder = PromptBuilder(tokenizer=executor.tokenizer, max_prompt_tokens=executor._prompt_token_budget())
+
+    # Warm up (also fills the prompt cache for both modes)
+    executor.generate_application_package(SAMPLE_STRATEGY, use_cache=False)
+
+    sequential, batched = [], []
+    for _ in range(args.repeats):
+        start = time.perf_counter()
+        executor.generate_resume_bullets(SAMPLE_STRATEGY)
+        executor.generate_cover_letter(SAMPLE_STRATEGY)
+        sequential.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        executor.generate_application_package(SAMPLE_STRATEGY, use_cache=False)
+        batched.append(time.perf_counter() - start)
+
+    results = {
+        "base_model": args.base_model,
+        "new_tokens": args.new_tokens,
+        "sequential_seconds_median": round(statistics.median(sequential), 3),
+        "batched_seconds_median": round(statistics.median(batched), 3),
+        "speedup": round(statistics.median(sequential) / statistics.median(batched), 2)
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Benchmark: package store write throughput, lookup latency and index range scans
+Writes synthetic application packages (the same shape generate_application_package
+produces) to a PackageStore in batches, then times random reads by ID and
+company / role / time-range queries. A smaller one-JSON-file-per-package
+directory (the old _save_package layout) is timed alongside for comparison;
+its range scans have to list and open every file.
+
+Example:
+  python scripts/benchmark_package_store.py --packages 1000000
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from package_store import PackageStore, new_package_id
+
+ROLES = ["Machine Learning Intern", "Data Science Intern", "Backend Engineering Intern", "Frontend Developer Intern",
+         "Full Stack Intern", "Data Analyst Intern", "Software Engineering Intern", "DevOps Intern"]
+SKILLS = ["Python", "SQL", "React", "Docker", "Kubernetes", "PyTorch", "TensorFlow", "Pandas", "Go", "Java",
+          "TypeScript", "AWS", "Tableau", "Statistics", "Computer Vision", "NLP", "Spark", "PostgreSQL"]
+VERBS = ["Built", "Designed", "Implemented", "Optimized", "Led", "Deployed", "Automated", "Analyzed"]
+
+
+def synthetic_package(rng, company, role, generated_at):
+    skills = rng.sample(SKILLS, 5)
+    bullets = [f"{rng.choice(VERBS)} a {skill} pipeline that cut processing time by {rng.randint(10, 80)}% "
+               f"for {rng.randint(2, 50)}k users" for skill in skills + rng.sample(SKILLS, 1)]
+    paragraphs = [
+        f"Dear Hiring Manager,\n\nI am excited to apply for the {role} position at {company}.",
+        f"My experience with {', '.join(skills[:3])} matches the requirements of this role, and I have applied "
+        f"these skills in {rng.randint(2, 6)} projects over the past {rng.randint(1, 3)} years.",
+        f"At university I {rng.choice(VERBS).lower()} a {skills[3]} system used by {rng.randint(100, 5000)} students.",
+        f"I would welcome the chance to bring my {skills[4]} background to {company}.\n\nSincerely,\nStudent"
+    ]
+    return {
+        "bullets": bullets,
+        "cover_letter": "\n\n".join(paragraphs),
+        "strategy_used": {
+            "jd_analysis": {"title": role, "company": company, "skills": skills},
+            "matching_skills": skills[:3],
+            "suggested_projects": [],
+            "recommended_focus": [f"Highlight {skills[0]} work"],
+            "match_score": round(rng.random(), 3)
+        },
+        "generated_at": generated_at,
+        "generation_seconds": round(rng.uniform(0.5, 8.0), 3),
+        "cache": "miss",
+        "job_match_score": round(rng.random(), 3)
+    }
+
+
+def package_stream(count, companies, seed=0):
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    step = timedelta(days=365) / count
+    for index in range(count):
+        yield synthetic_package(rng, rng.choice(companies), rng.choice(ROLES), (start + step * index).isoformat())
+
+
+def ms_summary(timings):
+    ordered = sorted(timings)
+    return {
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 3),
+        "p95_ms": round(ordered[min(int(0.95 * len(ordered)), len(ordered) - 1)] * 1000, 3),
+        "mean_ms": round(statistics.mean(ordered) * 1000, 3)
+    }
+
+
+def directory_size(path):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def bench_store(directory, count, batch_size, lookups, queries, companies):
+    store = PackageStore(directory)
+    ids, batch = [], []
+    start = time.perf_counter()
+    for package in package_stream(count, companies):
+        batch.append(package)
+        if len(batch) == batch_size:
+            ids.extend(store.put_many(batch))
+            batch = []
+    if batch:
+        ids.extend(store.put_many(batch))
+    write_seconds = time.perf_counter() - start
+
+    rng = random.Random(1)
+    read_timings = []
+    for package_id in rng.sample(ids, min(lookups, len(ids))):
+        start = time.perf_counter()
+        store.get(package_id)
+        read_timings.append(time.perf_counter() - start)
+
+    single_timings = []
+    for package in package_stream(min(1000, count), companies, seed=2):
+        start = time.perf_counter()
+        store.put(package)
+        single_timings.append(time.perf_counter() - start)
+
+    company_timings, range_timings = [], []
+    for _ in range(queries):
+        start = time.perf_counter()
+        store.query(company=rng.choice(companies), limit=50)
+        company_timings.append(time.perf_counter() - start)
+        since = datetime(2025, 1, 1) + timedelta(days=rng.randint(0, 364))
+        start = time.perf_counter()
+        store.query(role=rng.choice(ROLES), since=since, until=since + timedelta(days=7), limit=50)
+        range_timings.append(time.perf_counter() - start)
+
+    stats = store.stats()
+    store.close()
+    return {
+        "packages": count,
+        "write_seconds": round(write_seconds, 2),
+        "write_packages_per_sec": round(count / write_seconds, 1),
+        "single_put": ms_summary(single_timings),
+        "get_by_id": ms_summary(read_timings),
+        "query_company": ms_summary(company_timings),
+        "query_role_week": ms_summary(range_timings),
+        "disk_mb": round(directory_size(directory) / 2 ** 20, 1),
+        "compression_ratio": stats["compression_ratio"],
+        "segments": stats["segments"]
+    }
+
+
+def bench_json_files(directory, count, lookups, queries, companies):
+    """One pretty-printed JSON file per package, as _save_package used to write"""
+    ids = []
+    start = time.perf_counter()
+    for package in package_stream(count, companies):
+        package_id = new_package_id()
+        with open(os.path.join(directory, f"application_package_{package_id}.json"), 'w', encoding='utf-8') as f:
+            json.dump(package, f, indent=2)
+        ids.append(package_id)
+    write_seconds = time.perf_counter() - start
+
+    rng = random.Random(1)
+    read_timings = []
+    for package_id in rng.sample(ids, min(lookups, len(ids))):
+        start = time.perf_counter()
+        with open(os.path.join(directory, f"application_package_{package_id}.json"), 'r', encoding='utf-8') as f:
+            json.load(f)
+        read_timings.append(time.perf_counter() - start)
+
+    company_timings = []
+    for _ in range(queries):
+        company = rng.choice(companies)
+        start = time.perf_counter()
+        matches = []
+        for path in glob.glob(os.path.join(directory, "application_package_*.json")):
+            with open(path, 'r', encoding='utf-8') as f:
+                package = json.load(f)
+            if package["strategy_used"]["jd_analysis"]["company"] == company:
+                matches.append(package)
+        company_timings.append(time.perf_counter() - start)
+
+    return {
+        "packages": count,
+        "write_packages_per_sec": round(count / write_seconds, 1),
+        "get_by_id": ms_summary(read_timings),
+        "query_company": ms_summary(company_timings),
+        "disk_mb": round(directory_size(directory) / 2 ** 20, 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the application package store")
+    parser.add_argument("--packages", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--lookups", type=int, default=10_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--companies", type=int, default=5000)
+    parser.add_argument("--baseline-packages", type=int, default=20_000,
+                        help="Packages for the JSON-file-per-package comparison (0 to skip)")
+    parser.add_argument("--dir", default=None, help="Work directory (default: a temporary directory)")
+    args = parser.parse_args()
+
+    companies = [f"Company {index}" for index in range(args.companies)]
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        store_dir = os.path.join(tmp, "store")
+        results = {"store": bench_store(store_dir, args.packages, args.batch_size, args.lookups, args.queries,
+                                        companies)}
+        if args.baseline_packages:
+            baseline_dir = os.path.join(tmp, "json_files")
+            os.makedirs(baseline_dir)
+            results["json_files"] = bench_json_files(baseline_dir, args.baseline_packages, args.lookups,
+                                                     max(args.queries // 100, 3), companies)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark: prompt tokens and latency with JD section pruning and token budgeting
+Compares the full-JD prompt with the pruned, budgeted one. Pass --model to also
+time generation with a local causal LM (e.g. --model microsoft/DialoGPT-medium).
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from jd_parser import JD_ANALYSIS_PROMPT
+from job_feed import iter_job_descriptions
+from prompt_builder import PromptBuilder
+
+EEO_BOILERPLATE = """
+Equal Opportunity:
+We are an equal opportunity employer. All qualified applicants will receive consideration for employment without regard to race, color, religion, sex, sexual orientation, gender identity, national origin, disability, or protected veteran status.
+We provide reasonable accommodation to individuals with disabilities throughout the application process.
+"""
+
+
+def load_tokenizer(name):
+    if not name:
+        return None
+    from transformers import AutoTokenizer
+    return AutoTokenizer.from_pretrained(name)
+
+
+def time_generation(model, tokenizer, prompt, new_tokens):
+    import torch
+    inputs = tokenizer(prompt, return_tensors="pt")
+    start = time.perf_counter()
+    with torch.no_grad():
+        model.generate(**inputs, max_new_tokens=new_tokens, min_new_tokens=new_tokens,
+                       do_sample=False, pad_token_id=tokenizer.eos_token_id)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark prompt pruning and token budgeting")
+    parser.add_argument("--source", default="data/sample_jds")
+    parser.add_argument("--tokenizer", help="HF tokenizer to count with (default: chars/4 approximation)")
+    parser.add_argument("--model", help="HF causal LM to time generation with (implies --tokenizer)")
+    parser.add_argument("--jd-budget", type=int, default=600)
+    parser.add_argument("--no-boilerplate", action="store_true", help="Don't append a typical EEO section to each JD")
+    parser.add_argument("--new-tokens", type=int, default=32)
+    args = parser.parse_args()
+
+    tokenizer = load_tokenizer(args.tokenizer or args.model)
+    builder = PromptBuilder(tokenizer=tokenizer, jd_token_budget=args.jd_budget)
+
+    jds = [record["text"] + ("" if args.no_boilerplate else EEO_BOILERPLATE)
+           for record in iter_job_descriptions(args.source)]
+
+    raw_prompts = [JD_ANALYSIS_PROMPT.format(jd_text=jd) for jd in jds]
+
+    start = time.perf_counter()
+    built_prompts = [builder.build_with_jd("jd_analysis", JD_ANALYSIS_PROMPT, jd) for jd in jds]
+    cold_ms = (time.perf_counter() - start) / len(jds) * 1000
+
+    start = time.perf_counter()
+    for jd in jds:
+        builder.build_with_jd("jd_analysis", JD_ANALYSIS_PROMPT, jd)
+    cached_ms = (time.perf_counter() - start) / len(jds) * 1000
+
+    raw_tokens = [builder.count_tokens(prompt) for prompt in raw_prompts]
+    built_tokens = [builder.count_tokens(prompt) for prompt in built_prompts]
+
+    results = {
+        "jds": len(jds),
+        "tokenizer": builder.stats()["tokenizer"],
+        "raw_prompt_tokens_mean": round(statistics.mean(raw_tokens), 1),
+        "pruned_prompt_tokens_mean": round(statistics.mean(built_tokens), 1),
+        "prompt_token_reduction": round(1 - sum(built_tokens) / sum(raw_tokens), 4),
+        "build_cold_ms": round(cold_ms, 3),
+        "build_cached_ms": round(cached_ms, 4),
+        "builder_stats": builder.stats()
+    }
+
+    if args.model:
+        from transformers import AutoModelForCausalLM
+        model = AutoModelForCausalLM.from_pretrained(args.model).eval()
+        # Prompts longer than the context window are cut from the left for the raw run
+        limit = getattr(tokenizer, "model_max_length", 1024) - args.new_tokens
+        raw_seconds, pruned_seconds = [], []
+        for raw, built in zip(raw_prompts, built_prompts):
+            raw = tokenizer.decode(tokenizer.encode(raw)[-limit:])
+            raw_seconds.append(time_generation(model, tokenizer, raw, args.new_tokens))
+            pruned_seconds.append(time_generation(model, tokenizer, built, args.new_tokens))
+        results["generation_raw_seconds_mean"] = round(statistics.mean(raw_seconds), 3)
+        results["generation_pruned_seconds_mean"] = round(statistics.mean(pruned_seconds), 3)
+        results["generation_speedup"] = round(statistics.mean(raw_seconds) / statistics.mean(pruned_seconds), 2)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: legacy substring skill matching vs the canonical SkillIndex
+Runs on synthetic profiles with hundreds of skills and JDs with dozens of requirements
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from skill_index import SKILL_ALIASES, SkillIndex
+
+
+def legacy_match(required_skills, user_skills):
+    """The original nested substring scan from plan_application"""
+    matching, missing = [], []
+    for req_skill in required_skills:
+        found_match = False
+        for user_skill in user_skills:
+            if req_skill.lower() in user_skill.lower() or user_skill.lower() in req_skill.lower():
+                matching.append(req_skill)
+                found_match = True
+                break
+        if not found_match:
+            missing.append(req_skill)
+    return matching, missing
+
+
+def build_corpus(num_profile_skills: int, num_required: int, seed: int):
+    rng = random.Random(seed)
+    known = [aliases[0].title() for aliases in SKILL_ALIASES.values()]
+    synthetic = [f"Skill {i:04d}" for i in range(num_profile_skills)]
+
+    profile_skills = rng.sample(known, len(known) // 2) + synthetic[:max(0, num_profile_skills - len(known) // 2)]
+    required = rng.sample(known, min(num_required // 2, len(known)))
+    required += [f"Skill {rng.randrange(num_profile_skills * 2):04d}" for _ in range(num_required - len(required))]
+    return profile_skills, required
+
+
+def time_call(fn, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark skill matching")
+    parser.add_argument("--profile-skills", type=int, nargs="+", default=[100, 300, 1000])
+    parser.add_argument("--required", type=int, nargs="+", default=[20, 50])
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    results = []
+    for num_skills in args.profile_skills:
+        for num_required in args.required:
+            profile_skills, required = build_corpus(num_skills, num_required, args.seed)
+            index = SkillIndex(profile_skills)
+
+            legacy_us = time_call(lambda: legacy_match(required, profile_skills), args.repeats)
+            indexed_us = time_call(lambda: index.match(required), args.repeats)
+            build_us = time_call(lambda: SkillIndex(profile_skills), max(1, args.repeats // 10))
+
+            results.append({
+                "profile_skills": num_skills,
+                "required_skills": num_required,
+                "legacy_match_us": round(legacy_us, 2),
+                "index_match_us": round(indexed_us, 2),
+                "index_build_us": round(build_us, 2),
+                "speedup": round(legacy_us / indexed_us, 1) if indexed_us else None,
+                "legacy_matches": len(legacy_match(required, profile_skills)[0]),
+                "index_matches": len(index.match(required)[0])
+            })
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
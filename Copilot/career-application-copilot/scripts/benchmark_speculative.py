@@ -0,0 +1,127 @@
+"""
+Benchmark: speculative decoding with a draft model vs. plain greedy decoding
+Plans a strategy for each sample JD, builds the executor's bullet and cover
+letter prompts from it and generates each one plain, speculatively, and
+speculatively with the cached prompt prefix. Reports the draft acceptance rate
+and the end-to-end speedup per endpoint. Decoding is greedy, so all three must
+produce the same text; the script exits with status 1 if any prompt differs.
+
+Example:
+  python scripts/benchmark_speculative.py --base-model microsoft/DialoGPT-medium --model-path models/career-copilot-lora --draft-model microsoft/DialoGPT-small
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.dirname(__file__))
+
+from benchmark_model_server import load_generator
+from executor import BULLET_COUNT, ApplicationExecutor
+from job_feed import iter_job_descriptions
+from planner import JobDescriptionPlanner
+from prompt_builder import PromptBuilder
+
+
+# (speculative, use the cached prefix); the first mode is the reference output
+MODES = {"plain": (False, False), "speculative": (True, False), "speculative_prefix": (True, True)}
+
+
+def run_endpoint(generator, prompts, prefixes, json_max_items, params, repeats):
+    """Median seconds per prompt for each mode, draft acceptance, and prompts whose outputs differ"""
+    timings = {mode: [] for mode in MODES}
+    mismatches = []
+    before = generator.speculative_stats()
+    for _ in range(repeats):
+        for index, (prompt, prefix) in enumerate(zip(prompts, prefixes)):
+            texts = {}
+            for mode, (speculative, use_prefix) in MODES.items():
+                start = time.perf_counter()
+                result = generator.generate_batch([prompt], json_max_items=json_max_items,
+                                                  prefix=prefix if use_prefix else None,
+                                                  speculative=speculative, **params)[0]
+                timings[mode].append(time.perf_counter() - start)
+                texts[mode] = result["text"]
+            differing = [mode for mode, text in texts.items() if text != texts["plain"]]
+            if differing and index not in (mismatch["prompt"] for mismatch in mismatches):
+                mismatches.append({"prompt": index, "modes": differing})
+    after = generator.speculative_stats()
+
+    proposed = after["draft_tokens_proposed"] - before["draft_tokens_proposed"]
+    accepted = after["draft_tokens_accepted"] - before["draft_tokens_accepted"]
+    medians = {mode: statistics.median(seconds) for mode, seconds in timings.items()}
+    return {
+        **{f"{mode}_ms_median": round(seconds * 1000, 1) for mode, seconds in medians.items()},
+        "speedup": round(medians["plain"] / medians["speculative"], 2) if medians["speculative"] else None,
+        "acceptance_rate": round(accepted / proposed, 4) if proposed else 0.0,
+        "identical_outputs": f"{len(prompts) - len(mismatches)}/{len(prompts)}",
+        "mismatches": mismatches
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark speculative decoding on the sample JD strategies")
+    parser.add_argument("--base-model", default=os.getenv("BASE_MODEL", "microsoft/DialoGPT-medium"))
+    parser.add_argument("--model-path", default=None, help="Optional LoRA adapter directory")
+    parser.add_argument("--draft-model", default=os.getenv("DRAFT_MODEL") or "microsoft/DialoGPT-small")
+    parser.add_argument("--num-tokens", type=int, default=int(os.getenv("SPECULATIVE_NUM_TOKENS", "5")),
+                        help="Draft tokens proposed per verification round")
+    parser.add_argument("--source", default="data/sample_jds")
+    parser.add_argument("--new-tokens", type=int, default=128)
+    parser.add_argument("--repeats", type=int, default=2)
+    args = parser.parse_args()
+
+    planner = JobDescriptionPlanner()
+    strategies = [planner.plan_application(record["text"]) for record in iter_job_descriptions(args.source)]
+
+    executor = ApplicationExecutor()
+    generator = load_generator(args.base_model, args.model_path)
+    generator.load_draft(args.draft_model, num_tokens=args.num_tokens)
+    executor.tokenizer = generator.tokenizer
+    executor.context_window = generator.context_window
+    executor.prompt_builder = PromptBuilder(tokenizer=executor.tokenizer, max_prompt_tokens=executor._prompt_token_budget())
+
+    endpoints = {
+        "bullets": ([executor._build_bullets_prompt(executor._bullets_context(s)) for s in strategies], BULLET_COUNT),
+        "cover_letter": ([executor._strategy_cover_letter_prompt(s) for s in strategies], None)
+    }
+    params = {"max_new_tokens": args.new_tokens, "temperature": 0.2, "top_p": 0.95}
+
+    # Warm up both paths (and the prefix cache) once
+    warmup = endpoints["bullets"][0][0]
+    for speculative in (False, True):
+        generator.generate_batch([executor._format_prompt(warmup)], prefix=executor._prompt_prefix(warmup),
+                                 speculative=speculative, **params)
+
+    results = {
+        "base_model": args.base_model,
+        "draft_model": args.draft_model,
+        "draft_tokens_per_round": args.num_tokens,
+        "strategies": len(strategies),
+        "new_tokens": args.new_tokens,
+        "endpoints": {}
+    }
+    for name, (prompts, json_max_items) in endpoints.items():
+        results["endpoints"][name] = run_endpoint(
+            generator,
+            [executor._format_prompt(prompt) for prompt in prompts],
+            [executor._prompt_prefix(prompt) for prompt in prompts],
+            json_max_items, params, args.repeats
+        )
+    results["speculative_decoding"] = generator.speculative_stats()
+    results["prefix_cache"] = generator.prefix_cache.stats()
+    print(json.dumps(results, indent=2))
+
+    mismatched = {name: endpoint["mismatches"] for name, endpoint in results["endpoints"].items()
+                  if endpoint["mismatches"]}
+    if mismatched:
+        print(f"❌ Greedy outputs differ between decoding modes: {json.dumps(mismatched)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
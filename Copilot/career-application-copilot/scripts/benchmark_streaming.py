@@ -0,0 +1,86 @@
+"""
+Benchmark: time to first token, streamed vs. blocking generation
+A blocking generate() only shows text once the whole completion is done, so its
+time to first visible text equals the total latency. Streaming through
+LocalGenerator.stream() (in-process) and ModelClient.stream() (model server)
+shows the first words after roughly one forward pass.
+
+Example:
+  python scripts/benchmark_streaming.py --base-model microsoft/DialoGPT-medium --model-path models/career-copilot-lora
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from model_server import ModelClient, ModelServer
+from benchmark_model_server import PROMPTS, load_generator
+
+
+def time_blocking(generate, prompt, params):
+    start = time.perf_counter()
+    generate(prompt, **params)
+    total = time.perf_counter() - start
+    return total, total
+
+
+def time_stream(stream, prompt, params):
+    start = time.perf_counter()
+    first = None
+    for _ in stream(prompt, **params):
+        if first is None:
+            first = time.perf_counter() - start
+    total = time.perf_counter() - start
+    return (first if first is not None else total), total
+
+
+def summarize(timings):
+    ttfts = [ttft * 1000 for ttft, _ in timings]
+    totals = [total * 1000 for _, total in timings]
+    return {
+        "ttft_ms_median": round(statistics.median(ttfts), 1),
+        "total_ms_median": round(statistics.median(totals), 1),
+        "ttft_share_of_total": round(statistics.median(ttfts) / statistics.median(totals), 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streamed vs. blocking generation latency")
+    parser.add_argument("--base-model", default=os.getenv("BASE_MODEL", "microsoft/DialoGPT-medium"))
+    parser.add_argument("--model-path", default=None, help="Optional LoRA adapter directory")
+    parser.add_argument("--new-tokens", type=int, default=128)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    generator = load_generator(args.base_model, args.model_path)
+    params = {"max_new_tokens": args.new_tokens, "temperature": 0.0, "top_p": 1.0}
+    prompts = PROMPTS * args.repeats
+    results = {"base_model": args.base_model, "new_tokens": args.new_tokens, "runs": {}}
+
+    # Warm up once so the first run doesn't pay for lazy initialisation
+    generator.generate(PROMPTS[0], **params)
+
+    results["runs"]["in_process_blocking"] = summarize([time_blocking(generator.generate, p, params) for p in prompts])
+    results["runs"]["in_process_stream"] = summarize([time_stream(generator.stream, p, params) for p in prompts])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        address = os.path.join(tmp, "stream.sock")
+        server = ModelServer(generator, address)
+        server.start()
+        client = ModelClient(address)
+        results["runs"]["server_blocking"] = summarize([time_blocking(client.generate, p, params) for p in prompts])
+        results["runs"]["server_stream"] = summarize([time_stream(client.stream, p, params) for p in prompts])
+        client.close()
+        server.close()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
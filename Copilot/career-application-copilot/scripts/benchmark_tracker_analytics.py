@@ -0,0 +1,174 @@
+"""
+Benchmark: vectorized tracker analytics vs. the previous per-group / per-row versions
+Writes a synthetic tracker CSV (same columns as logs/applications.csv), loads it
+once, and times success rates by company and role, successful-skill counts and
+applications over time with both implementations, checking the results match.
+Small edge-case trackers (no skills matched at all, no successful applications)
+are compared too; the script exits with status 1 if any result differs.
+
+Example:
+  python scripts/benchmark_tracker_analytics.py --rows 1000000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import tracker_analytics
+from tracker_storage import COLUMNS
+
+SKILLS = np.array(["Python", "SQL", "React", "Docker", "PyTorch", "TensorFlow", "Pandas", "Java", "AWS", "Tableau",
+                   "Kubernetes", "Go", "TypeScript", "Spark", "Statistics", "Machine Learning"])
+STATUSES = np.array(["applied", "applied", "applied", "rejected", "interview", "offer", "accepted"])
+
+
+def write_synthetic_csv(path, rows, companies, roles, seed=0):
+    rng = np.random.default_rng(seed)
+    start = np.datetime64("2025-01-01T00:00:00")
+    timestamps = start + np.sort(rng.integers(0, 365 * 86400, rows)).astype("timedelta64[s]")
+    skills = SKILLS[rng.integers(0, len(SKILLS), (rows, 3))]
+    skills_matched = pd.Series(skills[:, 0]) + ", " + skills[:, 1] + ", " + skills[:, 2]
+    # Some applications matched no skills
+    skills_matched[rng.random(rows) < 0.05] = ""
+    df = pd.DataFrame({
+        "timestamp": np.datetime_as_string(timestamps, unit="us"),
+        "company": np.char.add("Company ", rng.integers(0, companies, rows).astype(str)),
+        "role": np.char.add("Role ", rng.integers(0, roles, rows).astype(str)),
+        "job_type": "internship",
+        "location": "Remote",
+        "jd_snippet": "Looking for an intern with Python experience...",
+        "bullets": "Built a pipeline | Shipped a feature",
+        "cover_letter_snippet": "Dear Hiring Manager...",
+        "status": STATUSES[rng.integers(0, len(STATUSES), rows)],
+        "match_score": rng.random(rows).round(3),
+        "skills_matched": skills_matched,
+        "application_url": "",
+        "notes": ""
+    })[COLUMNS]
+    df.to_csv(path, index=False)
+
+
+# The implementations tracker.py used before tracker_analytics
+SUCCESS_STATUSES = ['interview', 'offer', 'accepted']
+
+
+def legacy_success_rates(df, group_by):
+    grouped = df.groupby(group_by)['status'].apply(
+        lambda x: (x.isin(SUCCESS_STATUSES).sum() / len(x)) * 100
+    ).round(2)
+    return grouped.to_dict()
+
+
+def legacy_successful_skills(df):
+    successful_apps = df[df['status'].isin(SUCCESS_STATUSES)]
+    all_skills = []
+    for skills_str in successful_apps['skills_matched'].dropna():
+        skills = [skill.strip() for skill in skills_str.split(',')]
+        all_skills.extend(skills)
+    if not all_skills:
+        return []
+    return pd.Series(all_skills).value_counts().head(10).index.tolist()
+
+
+def legacy_applications_over_time(df):
+    df = df.copy()
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    df['date'] = df['timestamp'].dt.date
+    return df.groupby('date').size().tail(30).to_dict()
+
+
+def edge_case_frames(directory):
+    """Trackers read back from CSV whose skills column is all empty, or with no successes"""
+    path = os.path.join(directory, "edge.csv")
+    write_synthetic_csv(path, 200, 10, 3, seed=1)
+    base = pd.read_csv(path)
+    frames = {
+        "no_skills_matched": base.assign(skills_matched=""),
+        "no_successful_applications": base.assign(status="applied")
+    }
+    for name, frame in frames.items():
+        # Round-trip through CSV so dtypes are what the CSV backend loads
+        frame.to_csv(path, index=False)
+        frames[name] = pd.read_csv(path)
+    return frames
+
+
+def timed(fn, *args, repeats=1):
+    best, result = None, None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized tracker analytics")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--companies", type=int, default=5000)
+    parser.add_argument("--roles", type=int, default=40)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "applications.csv")
+        start = time.perf_counter()
+        write_synthetic_csv(path, args.rows, args.companies, args.roles)
+        write_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        df = pd.read_csv(path)
+        read_seconds = time.perf_counter() - start
+        edge_frames = edge_case_frames(tmp)
+
+    cases = {
+        "success_rate_by_company": (lambda: legacy_success_rates(df, 'company'),
+                                    lambda: tracker_analytics.success_rates(df, 'company')),
+        "success_rate_by_role": (lambda: legacy_success_rates(df, 'role'),
+                                 lambda: tracker_analytics.success_rates(df, 'role')),
+        "top_skills_in_successful_apps": (lambda: legacy_successful_skills(df),
+                                          lambda: tracker_analytics.successful_skills(df)),
+        "applications_over_time": (lambda: legacy_applications_over_time(df),
+                                   lambda: tracker_analytics.applications_over_time(df))
+    }
+
+    results = {"rows": args.rows, "csv_write_seconds": round(write_seconds, 2),
+               "csv_read_seconds": round(read_seconds, 2), "analytics": {}}
+    for name, (legacy, vectorized) in cases.items():
+        legacy_result, legacy_seconds = timed(legacy, repeats=args.repeats)
+        vectorized_result, vectorized_seconds = timed(vectorized, repeats=args.repeats)
+        results["analytics"][name] = {
+            "legacy_ms": round(legacy_seconds * 1000, 1),
+            "vectorized_ms": round(vectorized_seconds * 1000, 1),
+            "speedup": round(legacy_seconds / vectorized_seconds, 1),
+            "identical": legacy_result == vectorized_result
+        }
+    _, analyze_seconds = timed(tracker_analytics.analyze, df, repeats=args.repeats)
+    results["analyze_ms"] = round(analyze_seconds * 1000, 1)
+
+    results["edge_cases"] = {}
+    for name, frame in edge_frames.items():
+        tracker_analytics.analyze(frame)
+        results["edge_cases"][name] = {
+            "skills_dtype": str(frame["skills_matched"].dtype),
+            "identical": (legacy_successful_skills(frame) == tracker_analytics.successful_skills(frame)
+                          and legacy_success_rates(frame, 'company') == tracker_analytics.success_rates(frame, 'company'))
+        }
+    print(json.dumps(results, indent=2))
+
+    checks = list(results["analytics"].values()) + list(results["edge_cases"].values())
+    if not all(check["identical"] for check in checks):
+        print("❌ Vectorized analytics differ from the previous implementation", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
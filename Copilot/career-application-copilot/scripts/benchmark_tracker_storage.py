@@ -0,0 +1,161 @@
+"""
+Benchmark: tracker status-update and summary latency, CSV vs. SQLite backend
+Fills both backends with the same synthetic applications, then times
+update_status on random company/role pairs, get_applications_summary (read from
+the running aggregates), the aggregate counters against a full recompute, and
+the response-time and funnel metrics read from the history counters against a
+single pass over the status event log.
+The CSV backend rewrites the whole file per update, so it gets fewer updates.
+
+Example:
+  python scripts/benchmark_tracker_storage.py --applications 100000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tracker import ApplicationTracker
+from tracker_history import history_metrics
+
+ROLES = ["ML Intern", "Data Science Intern", "Backend Intern", "Frontend Intern", "Full Stack Intern",
+         "Data Analyst Intern", "SWE Intern", "DevOps Intern"]
+SKILLS = ["Python", "SQL", "React", "Docker", "PyTorch", "TensorFlow", "Pandas", "Java", "AWS", "Tableau"]
+STATUSES = ["applied", "applied", "applied", "rejected", "interview", "offer"]
+
+
+def synthetic_rows(count, companies, seed=0):
+    rng = random.Random(seed)
+    start = datetime.now() - timedelta(days=365)
+    step = timedelta(days=365) / count
+    for index in range(count):
+        yield {
+            "timestamp": (start + step * index).isoformat(),
+            "company": rng.choice(companies),
+            "role": rng.choice(ROLES),
+            "job_type": "internship",
+            "location": rng.choice(["Remote", "Bangalore", "Delhi", "Hyderabad"]),
+            "jd_snippet": "Looking for an intern with Python and SQL experience to join our team...",
+            "bullets": " | ".join(f"Built a {skill} pipeline" for skill in rng.sample(SKILLS, 3)),
+            "cover_letter_snippet": "Dear Hiring Manager, I am excited to apply for this position...",
+            "status": rng.choice(STATUSES),
+            "match_score": round(rng.random(), 3),
+            "skills_matched": ", ".join(rng.sample(SKILLS, 3)),
+            "application_url": "",
+            "notes": ""
+        }
+
+
+def ms_summary(timings):
+    ordered = sorted(timings)
+    return {
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 3),
+        "p95_ms": round(ordered[min(int(0.95 * len(ordered)), len(ordered) - 1)] * 1000, 3),
+        "mean_ms": round(statistics.mean(ordered) * 1000, 3)
+    }
+
+
+def quiet(fn, *args):
+    # The tracker prints a line per call; keep it out of the timings and the output
+    stdout, sys.stdout = sys.stdout, open(os.devnull, 'w')
+    try:
+        return fn(*args)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+
+def bench_backend(backend, directory, count, updates, summaries, companies):
+    tracker = ApplicationTracker(os.path.join(directory, f"{backend}.csv"), backend=backend)
+    start = time.perf_counter()
+    tracker.storage.append_many(synthetic_rows(count, companies))
+    load_seconds = time.perf_counter() - start
+
+    rng = random.Random(1)
+    update_timings, found = [], 0
+    for _ in range(updates):
+        company, role = rng.choice(companies), rng.choice(ROLES)
+        start = time.perf_counter()
+        found += bool(quiet(tracker.update_status, company, role, rng.choice(STATUSES), "benchmark note"))
+        update_timings.append(time.perf_counter() - start)
+
+    log_timings = []
+    package = {"bullets": ["Built a thing"], "cover_letter": "Dear Hiring Manager", "job_match_score": 0.5,
+               "strategy_used": {"jd_analysis": {}, "matching_skills": ["Python"]}}
+    for _ in range(updates):
+        start = time.perf_counter()
+        quiet(tracker.log_application, rng.choice(companies), rng.choice(ROLES), "JD text", package)
+        log_timings.append(time.perf_counter() - start)
+
+    summary_timings = []
+    for _ in range(summaries):
+        start = time.perf_counter()
+        tracker.get_applications_summary()
+        summary_timings.append(time.perf_counter() - start)
+
+    recompute_timings = []
+    for _ in range(max(summaries // 4, 1)):
+        start = time.perf_counter()
+        consistent = not tracker.storage.verify_aggregates()
+        recompute_timings.append(time.perf_counter() - start)
+
+    history_timings = []
+    for _ in range(summaries):
+        start = time.perf_counter()
+        history = tracker.storage.history_metrics()
+        history_timings.append(time.perf_counter() - start)
+
+    history_recompute_timings = []
+    for _ in range(max(summaries // 4, 1)):
+        start = time.perf_counter()
+        history_consistent = history_metrics(tracker.storage.events()) == history
+        history_recompute_timings.append(time.perf_counter() - start)
+
+    return {
+        "applications": len(tracker.storage),
+        "status_events": len(tracker.storage.events()),
+        "bulk_load_seconds": round(load_seconds, 2),
+        "update_status": ms_summary(update_timings),
+        "updates_matched": f"{found}/{updates}",
+        "log_application": ms_summary(log_timings),
+        "summary": ms_summary(summary_timings),
+        "aggregates_recompute": ms_summary(recompute_timings),
+        "aggregates_consistent": consistent,
+        "history_metrics": ms_summary(history_timings),
+        "history_recompute": ms_summary(history_recompute_timings),
+        "history_consistent": history_consistent,
+        "funnel": history["funnel"]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the tracker storage backends")
+    parser.add_argument("--applications", type=int, default=100_000)
+    parser.add_argument("--companies", type=int, default=2000)
+    parser.add_argument("--updates", type=int, default=1000, help="Status updates for the SQLite backend")
+    parser.add_argument("--csv-updates", type=int, default=20, help="Status updates for the CSV backend")
+    parser.add_argument("--summaries", type=int, default=20)
+    args = parser.parse_args()
+
+    companies = [f"Company {index}" for index in range(args.companies)]
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {
+            "sqlite": bench_backend("sqlite", tmp, args.applications, args.updates, args.summaries, companies),
+            "csv": bench_backend("csv", tmp, args.applications, args.csv_updates, max(args.summaries // 4, 3),
+                                 companies)
+        }
+    results["update_speedup"] = round(results["csv"]["update_status"]["p50_ms"]
+                                      / results["sqlite"]["update_status"]["p50_ms"], 1)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
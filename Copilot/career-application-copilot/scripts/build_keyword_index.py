@@ -0,0 +1,45 @@
+"""
+Fit TF-IDF statistics over a JD corpus and persist vocabulary + IDF arrays
+Examples:
+  python scripts/build_keyword_index.py --source data/sample_jds
+  python scripts/build_keyword_index.py --source postings.jsonl --min-df 3 --max-features 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from job_feed import iter_job_descriptions
+from keyword_extractor import SAMPLE_JDS_DIR, KeywordExtractor, default_idf_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the keyword IDF table")
+    parser.add_argument("--source", default=SAMPLE_JDS_DIR, help="JSONL file or directory of .txt JDs")
+    parser.add_argument("--output", default=default_idf_path(),
+                        help="Where the planner looks for it (KEYWORD_IDF_PATH, relative to the project root)")
+    parser.add_argument("--min-df", type=int, default=1)
+    parser.add_argument("--max-features", type=int, default=50000)
+    parser.add_argument("--max-ngram", type=int, default=2)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    extractor = KeywordExtractor.fit(
+        (record["text"] for record in iter_job_descriptions(args.source)),
+        ngram_range=(1, args.max_ngram),
+        min_df=args.min_df,
+        max_features=args.max_features
+    )
+    extractor.save(args.output)
+
+    print(f"✅ IDF table saved to {args.output}")
+    print(f"   Vocabulary: {extractor.vocabulary_size} terms")
+    print(f"   Size: {os.path.getsize(args.output) / 1024:.1f} KB")
+    print(f"   Fit time: {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
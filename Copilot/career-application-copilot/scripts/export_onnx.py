@@ -0,0 +1,171 @@
+"""
+Export the merged fine-tuned generator to ONNX for the ONNX Runtime backend
+The graph takes the key/values of earlier positions as inputs and returns the
+updated ones, so decoding feeds one token per step instead of the whole sequence:
+
+  inputs:  input_ids, attention_mask, position_ids [batch, seq | total],
+           past_keys, past_values [layers, batch, heads, past, head_dim]
+  outputs: logits, present_keys, present_values
+
+Run scripts/merge_lora.py first, then point the backend at the export with
+GENERATOR_BACKEND=onnx and ONNX_MODEL_PATH.
+
+Example:
+  python scripts/export_onnx.py --merged-path models/career-copilot-merged --output models/career-copilot-onnx
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import torch
+from transformers import AutoModelForCausalLM, AutoTokenizer, DynamicCache
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from generation import DEFAULT_MERGED_MODEL_PATH, LocalGenerator, model_fingerprint
+from onnx_generator import DEFAULT_ONNX_MODEL_PATH, ONNX_CONFIG_FILE, ONNX_MODEL_FILE
+
+
+class KVCacheDecoder(torch.nn.Module):
+    """Flat key/value tensors in and out, around the model's own cache object"""
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+        self.num_layers = model.config.num_hidden_layers
+
+    def forward(self, input_ids, attention_mask, position_ids, past_keys, past_values):
+        cache = DynamicCache()
+        for layer in range(self.num_layers):
+            cache.update(past_keys[layer], past_values[layer], layer)
+        outputs = self.model(input_ids=input_ids, attention_mask=attention_mask, position_ids=position_ids,
+                             past_key_values=cache, use_cache=True)
+        layers = outputs.past_key_values.layers
+        return (outputs.logits,
+                torch.stack([layer.keys for layer in layers]),
+                torch.stack([layer.values for layer in layers]))
+
+
+def export_onnx(merged_path: str, output: str, opset: int = 18) -> dict:
+    start = time.perf_counter()
+
+    # Eager attention exports as plain matmuls; the fused kernels don't all have ONNX equivalents
+    model = AutoModelForCausalLM.from_pretrained(merged_path, torch_dtype=torch.float32,
+                                                 attn_implementation="eager").eval()
+    tokenizer = AutoTokenizer.from_pretrained(merged_path)
+    config = model.config
+    num_layers = config.num_hidden_layers
+    num_heads = config.num_attention_heads
+    head_dim = config.hidden_size // num_heads
+
+    # Example inputs with a non-empty past, so no shape is specialised to zero
+    batch, seq, past = 2, 3, 2
+    example = (
+        torch.ones(batch, seq, dtype=torch.long),
+        torch.ones(batch, past + seq, dtype=torch.long),
+        torch.arange(past, past + seq).expand(batch, seq).contiguous(),
+        torch.zeros(num_layers, batch, num_heads, past, head_dim),
+        torch.zeros(num_layers, batch, num_heads, past, head_dim)
+    )
+    batch_dim = torch.export.Dim("batch", max=256)
+    seq_dim = torch.export.Dim("seq", max=8192)
+    past_dim = torch.export.Dim("past", max=8192)
+    total_dim = torch.export.Dim("total", max=16384)
+    dynamic_shapes = {
+        "input_ids": {0: batch_dim, 1: seq_dim},
+        "attention_mask": {0: batch_dim, 1: total_dim},
+        "position_ids": {0: batch_dim, 1: seq_dim},
+        "past_keys": {1: batch_dim, 3: past_dim},
+        "past_values": {1: batch_dim, 3: past_dim}
+    }
+
+    os.makedirs(output, exist_ok=True)
+    with torch.no_grad():
+        torch.onnx.export(
+            KVCacheDecoder(model), example, os.path.join(output, ONNX_MODEL_FILE),
+            input_names=["input_ids", "attention_mask", "position_ids", "past_keys", "past_values"],
+            output_names=["logits", "present_keys", "present_values"],
+            dynamic_shapes=dynamic_shapes,
+            opset_version=opset,
+            dynamo=True
+        )
+    tokenizer.save_pretrained(output)
+
+    # Same version string the PyTorch backend reports for this checkpoint
+    base_model = LocalGenerator._merged_base_model(merged_path)
+    info = {
+        "base_model": base_model,
+        "merged_path": merged_path,
+        "model_version": model_fingerprint(base_model, merged_path),
+        "n_layer": num_layers,
+        "n_head": num_heads,
+        "head_dim": head_dim,
+        "n_positions": getattr(config, "n_positions", None) or config.max_position_embeddings,
+        "eos_token_id": tokenizer.eos_token_id,
+        "pad_token_id": tokenizer.pad_token_id,
+        "opset": opset,
+        "exported_at": datetime.now().isoformat(),
+        "export_seconds": round(time.perf_counter() - start, 2)
+    }
+    with open(os.path.join(output, ONNX_CONFIG_FILE), 'w', encoding='utf-8') as f:
+        json.dump(info, f, indent=2)
+
+    info["max_logit_diff"] = check_export(model, tokenizer, output)
+    return info
+
+
+def check_export(model, tokenizer, output: str) -> float:
+    """Largest logit difference between PyTorch and ONNX Runtime on a prefill plus one cached step"""
+    import onnxruntime as ort
+
+    session = ort.InferenceSession(os.path.join(output, ONNX_MODEL_FILE), providers=["CPUExecutionProvider"])
+    config = model.config
+    head_dim = config.hidden_size // config.num_attention_heads
+    ids = tokenizer.encode("Input: Write a resume bullet about a Flask API.\n\nOutput:")
+    split = len(ids) - 1
+
+    with torch.no_grad():
+        expected = model(torch.tensor([ids])).logits[0].numpy()
+    empty = np.zeros((config.num_hidden_layers, 1, config.num_attention_heads, 0, head_dim), dtype=np.float32)
+    prefill, keys, values = session.run(None, {
+        "input_ids": np.array([ids[:split]], dtype=np.int64),
+        "attention_mask": np.ones((1, split), dtype=np.int64),
+        "position_ids": np.arange(split, dtype=np.int64)[None],
+        "past_keys": empty,
+        "past_values": empty
+    })
+    step, _, _ = session.run(None, {
+        "input_ids": np.array([ids[split:]], dtype=np.int64),
+        "attention_mask": np.ones((1, len(ids)), dtype=np.int64),
+        "position_ids": np.array([[split]], dtype=np.int64),
+        "past_keys": keys,
+        "past_values": values
+    })
+    actual = np.concatenate([prefill[0], step[0]])
+    return float(np.abs(actual - expected).max())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the merged generator to ONNX with key/value cache inputs")
+    parser.add_argument("--merged-path", default=os.getenv("MERGED_MODEL_PATH", DEFAULT_MERGED_MODEL_PATH))
+    parser.add_argument("--output", default=os.getenv("ONNX_MODEL_PATH", DEFAULT_ONNX_MODEL_PATH))
+    parser.add_argument("--opset", type=int, default=18)
+    args = parser.parse_args()
+
+    if not os.path.exists(os.path.join(args.merged_path, "config.json")):
+        print(f"❌ Merged model not found at {args.merged_path} (run scripts/merge_lora.py first)")
+        sys.exit(1)
+
+    print(f"🔄 Exporting {args.merged_path} to ONNX...")
+    info = export_onnx(args.merged_path, args.output, args.opset)
+    print(f"✅ ONNX model saved to {args.output} ({info['export_seconds']}s, "
+          f"max logit difference vs PyTorch {info['max_logit_diff']:.2e})")
+
+
+if __name__ == "__main__":
+    main()
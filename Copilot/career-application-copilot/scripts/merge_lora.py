@@ -0,0 +1,71 @@
+"""
+Merge the LoRA adapter into the base weights once and save a safetensors checkpoint
+The merged model loads without PEFT (no adapter overhead per forward pass) and is
+picked up automatically by the generator from MERGED_MODEL_PATH.
+
+Example:
+  python scripts/merge_lora.py --model-path models/career-copilot-lora --output models/career-copilot-merged
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+import torch
+from peft import PeftModel
+from transformers import AutoModelForCausalLM, AutoTokenizer
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from generation import DEFAULT_BASE_MODEL, DEFAULT_MERGED_MODEL_PATH, DEFAULT_MODEL_PATH, MERGE_INFO_FILE
+
+
+def merge_lora(base_model: str, model_path: str, output: str) -> dict:
+    start = time.perf_counter()
+
+    # Merging needs full-precision weights; 8-bit layers cannot absorb the adapter
+    model = AutoModelForCausalLM.from_pretrained(base_model, torch_dtype=torch.float32, low_cpu_mem_usage=True)
+    model = PeftModel.from_pretrained(model, model_path)
+    model = model.merge_and_unload()
+
+    # The training script saves the tokenizer next to the adapter
+    tokenizer_source = model_path if os.path.exists(os.path.join(model_path, "tokenizer_config.json")) else base_model
+    tokenizer = AutoTokenizer.from_pretrained(tokenizer_source)
+
+    os.makedirs(output, exist_ok=True)
+    model.save_pretrained(output, safe_serialization=True)
+    tokenizer.save_pretrained(output)
+
+    info = {
+        "base_model": base_model,
+        "adapter_path": model_path,
+        "merged_at": datetime.now().isoformat(),
+        "merge_seconds": round(time.perf_counter() - start, 2),
+        "parameters": sum(p.numel() for p in model.parameters())
+    }
+    with open(os.path.join(output, MERGE_INFO_FILE), 'w', encoding='utf-8') as f:
+        json.dump(info, f, indent=2)
+    return info
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge the LoRA adapter into the base model")
+    parser.add_argument("--base-model", default=os.getenv("BASE_MODEL", DEFAULT_BASE_MODEL))
+    parser.add_argument("--model-path", default=os.getenv("FINE_TUNED_MODEL_PATH", DEFAULT_MODEL_PATH))
+    parser.add_argument("--output", default=os.getenv("MERGED_MODEL_PATH", DEFAULT_MERGED_MODEL_PATH))
+    args = parser.parse_args()
+
+    if not os.path.exists(args.model_path):
+        print(f"❌ LoRA adapter not found at {args.model_path}")
+        sys.exit(1)
+
+    print(f"🔄 Merging {args.model_path} into {args.base_model}...")
+    info = merge_lora(args.base_model, args.model_path, args.output)
+    print(f"✅ Merged model saved to {args.output} ({info['merge_seconds']}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Copy an existing tracker CSV into the SQLite tracker backend (one-shot)
+The CSV is left untouched; the tracker stops reading it once TRACKER_BACKEND is sqlite.
+
+Example:
+  python scripts/migrate_tracker.py --csv logs/applications.csv
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tracker_storage import SqliteTrackerStorage, migrate_csv_to_sqlite
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate the application tracker CSV to SQLite")
+    parser.add_argument("--csv", default="logs/applications.csv")
+    parser.add_argument("--db", default=None, help="SQLite path (default: the CSV path with a .sqlite extension)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.csv):
+        print(f"❌ {args.csv} not found")
+        sys.exit(1)
+
+    db_path = args.db or os.path.splitext(args.csv)[0] + ".sqlite"
+    start = time.perf_counter()
+    storage = SqliteTrackerStorage(db_path)
+    copied = migrate_csv_to_sqlite(args.csv, storage)
+    print(f"✅ Migrated {copied} applications to {db_path} in {time.perf_counter() - start:.2f}s "
+          f"({len(storage)} total)")
+    storage.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Rank a job-description feed against one or more profiles
+Examples:
+  python scripts/rank_job_feed.py --source data/sample_jds
+  python scripts/rank_job_feed.py --source nightly_dump.jsonl --top-k 25 --workers 8
+  python scripts/rank_job_feed.py --synthetic 50000          # throughput benchmark
+"""
+import argparse
+import json
+import os
+import random
+import sys
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from job_feed import JobFeedRanker, iter_job_descriptions
+
+
+def synthetic_feed(template_dir: str, count: int, seed: int = 0):
+    """Generator of mutated copies of the sample JDs (nothing is held in memory)"""
+    rng = random.Random(seed)
+    templates = [record["text"] for record in iter_job_descriptions(template_dir)]
+    extra_skills = ["Docker", "Kubernetes", "SQL", "React", "Go", "Rust", "NLP", "GraphQL", "Azure", "Java"]
+    for i in range(count):
+        text = rng.choice(templates)
+        text += "\nAlso nice to have: " + ", ".join(rng.sample(extra_skills, rng.randint(0, 4)))
+        yield {"id": f"synthetic-{i}", "text": text}
+
+
+def load_profiles(paths):
+    profiles = {}
+    for path in paths:
+        with open(path, 'r') as f:
+            profile = json.load(f)
+        profiles[profile.get("name") or os.path.basename(path)] = profile.get("skills", [])
+    return profiles
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank a JD feed against profiles")
+    parser.add_argument("--source", default="data/sample_jds", help="JSONL file or directory of .txt JDs")
+    parser.add_argument("--profiles", nargs="+", default=["data/profile.json"], help="Profile JSON files")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=2048)
+    parser.add_argument("--synthetic", type=int, default=0, help="Rank N synthetic JDs built from --source")
+    parser.add_argument("--output", help="Write rankings JSON here instead of stdout")
+    args = parser.parse_args()
+
+    ranker = JobFeedRanker(load_profiles(args.profiles), top_k=args.top_k,
+                           batch_size=args.batch_size, workers=args.workers)
+    source = synthetic_feed(args.source, args.synthetic) if args.synthetic else args.source
+    result = ranker.rank(source)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(json.dumps(result["stats"], indent=2))
+    else:
+        print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -171,6 +171,265 @@ def test_evaluation_module():
         print(f"❌ Evaluation test failed: {e}")
         return False
 
+def test_jd_dedup():
+    """Test near-duplicate JD detection and the cached analyses it hands out"""
+    from jd_dedup import DedupAnalysisCache
+    
+    with open('data/sample_jds/ml_intern_techcorp.txt', 'r') as f:
+        ml_jd = f.read()
+    with open('data/sample_jds/fullstack_intern_startupx.txt', 'r') as f:
+        fullstack_jd = f.read()
+    
+    cache = DedupAnalysisCache()
+    analysis, info = cache.lookup(ml_jd)
+    assert analysis is None, "Empty cache should miss"
+    cache.store(info, {"title": "ML Intern", "company": "TechCorp AI", "location": "Bangalore, India (Hybrid)",
+                       "skills": ["Python", "PyTorch"]}, 1.0)
+    
+    # Same posting again: hit, and callers get their own copy
+    analysis, info = cache.lookup(ml_jd)
+    assert analysis is not None and info["duplicate_of"], "Resubmitted JD should hit"
+    analysis["skills"].append("Mutated")
+    assert cache.lookup(ml_jd)[0]["skills"] == ["Python", "PyTorch"], "Cached analysis was mutated"
+    
+    # A different posting misses
+    assert cache.lookup(fullstack_jd)[0] is None, "Unrelated JD should miss"
+    
+    # Same posting from another company: still a duplicate, but names the new company
+    swapped = ml_jd.replace("Company: TechCorp AI", "Company: DataFlow Analytics")
+    analysis, info = cache.lookup(swapped)
+    assert analysis is not None and info["similarity"] > 0.9, "Company-swapped JD should be a near-duplicate"
+    assert analysis["company"] == "DataFlow Analytics", f"Wrong company on dedup hit: {analysis['company']}"
+    assert analysis["location"] == "Bangalore, India (Hybrid)"
+    assert analysis["skills"] == ["Python", "PyTorch"]
+    
+    print("✅ JD dedup working")
+    print(f"   Dedup stats: {cache.stats()['duplicates']}/{cache.stats()['lookups']} lookups were duplicates")
+    return True
+
+def test_skill_index():
+    """Test canonical skill matching on names that substring matching confused"""
+    from skill_index import SkillIndex, canonical_skill_id, skill_ids_in_text
+    
+    # "Go" must not match "Google Cloud", nor "Java" match "JavaScript"
+    index = SkillIndex(["Google Cloud", "JavaScript"])
+    assert "Go" not in index and "Java" not in index
+    assert "GCP" in index and "js" in index
+    matching, missing = index.match(["Go", "Java", "google cloud platform", "ECMAScript", "JS"])
+    assert matching == ["google cloud platform", "ECMAScript"], f"Unexpected matches: {matching}"
+    assert missing == ["Go", "Java"], f"Unexpected missing skills: {missing}"
+    assert canonical_skill_id("Golang") == canonical_skill_id("Go") == "go"
+    assert canonical_skill_id("Node.js") == canonical_skill_id("nodejs") == "nodejs"
+    
+    # Free text: long forms always count, ambiguous short aliases only as listed skills
+    assert skill_ids_in_text("Experience with Google Cloud and JavaScript") == {"gcp", "javascript"}
+    assert "go" in skill_ids_in_text("Languages: Go, Python and Docker")
+    assert "go" not in skill_ids_in_text("We go live next month")
+    assert "cv" not in skill_ids_in_text("Send your CV to careers@example.com")
+    assert {"machine_learning", "artificial_intelligence"} <= skill_ids_in_text("Background in ML/AI")
+    assert "machine_learning" not in skill_ids_in_text("Serve 5 ml of sample")
+    
+    print("✅ Skill index working")
+    return True
+
+def test_structured_output():
+    """Test closing off JSON that generation stopped early or cut mid-value"""
+    from structured_output import complete_json, parse_json_prefix
+    
+    # Complete output, with a preamble before the JSON
+    assert parse_json_prefix('Here are your bullets: {"bullets": ["a", "b"]} thanks') == {"bullets": ["a", "b"]}
+    
+    # Stopped after max_items: the list and object are closed
+    stopped = '{"bullets": ["one", "two", "three", "four"'
+    assert parse_json_prefix(stopped, max_items=3) == {"bullets": ["one", "two", "three"]}
+    
+    # Ran out of tokens mid-string: the half-written item is dropped, not closed
+    assert parse_json_prefix('{"bullets": ["Built a model", "Deployed the', max_items=4) == {"bullets": ["Built a model"]}
+    assert parse_json_prefix('{"bullets": ["Built \\"fast\\" APIs", "Led', max_items=4) == {"bullets": ['Built "fast" APIs']}
+    assert parse_json_prefix('{"bullets": ["a"], "cover_letter": "Dear Hiring') == {"bullets": ["a"]}
+    
+    # Ran out of tokens after a separator
+    assert parse_json_prefix('{"bullets": ["a", "b",') == {"bullets": ["a", "b"]}
+    
+    # Not JSON at all
+    assert complete_json("Sure! Here are some bullets") is None
+    assert complete_json('{"bullets": [<unk>]}') is None
+    try:
+        parse_json_prefix("no json here")
+        assert False, "Expected ValueError"
+    except ValueError:
+        pass
+    
+    print("✅ Structured output completion working")
+    return True
+
+def test_semantic_matcher_cache():
+    """Test that the skill embedding cache pins the vocabulary and bounds everything else"""
+    import hashlib
+    import numpy as np
+    from semantic_matcher import SemanticSkillMatcher
+    from skill_index import SKILL_ALIASES
+    
+    class HashEncoder:
+        """Deterministic stand-in for a sentence embedding model"""
+        def __init__(self):
+            self.encoded = 0
+        def encode(self, texts):
+            self.encoded += len(texts)
+            return np.stack([np.frombuffer(hashlib.sha256(text.encode()).digest(), dtype=np.uint8).astype(np.float32)
+                             for text in texts])
+    
+    encoder = HashEncoder()
+    matcher = SemanticSkillMatcher(encoder, cache_size=10)
+    assert matcher.cached_skills == len(SKILL_ALIASES)
+    
+    vectors = matcher.embed([f"Internal Tool {i}" for i in range(25)] + ["Golang"])
+    assert vectors.shape[0] == 26
+    assert matcher.cached_skills == len(SKILL_ALIASES) + 10, "Free-text skills should be capped at cache_size"
+    
+    # Vocabulary stays pinned and recent skills are reused without re-encoding
+    encoded = encoder.encoded
+    matcher.embed(["golang", "Python"] + [f"Internal Tool {i}" for i in range(15, 25)])
+    assert encoder.encoded == encoded, "Cached skills were encoded again"
+    
+    print("✅ Semantic matcher cache bounded")
+    return True
+
+def test_package_store():
+    """Test package round trips, corruption detection and index queries"""
+    import tempfile
+    from package_store import PackageStore
+    
+    def package(company, title, generated_at):
+        return {"bullets": [f"Built things at {company}"], "cover_letter": "Dear Hiring Manager, " * 20,
+                "generated_at": generated_at,
+                "strategy_used": {"jd_analysis": {"company": company, "title": title}}}
+    
+    with tempfile.TemporaryDirectory() as store_dir:
+        store = PackageStore(store_dir, max_segment_bytes=4096)
+        ml_id = store.put(package("TechCorp AI", "ML Intern", "2024-01-10T09:00:00"))
+        other_ids = store.put_many([package("StartupX", "Full Stack Intern", "2024-02-01T09:00:00"),
+                                    package("TechCorp AI", "Data Intern", "2024-03-05T09:00:00")])
+        
+        # Round trip
+        stored = store.get(ml_id)
+        assert stored["package_id"] == ml_id and stored["bullets"] == ["Built things at TechCorp AI"]
+        assert set(store.get_many([ml_id, *other_ids, "missing"])) == {ml_id, *other_ids}
+        assert store.get("missing") is None and len(store) == 3
+        
+        # Filters: case-insensitive company/role, half-open time range, ordering
+        assert [e["package_id"] for e in store.query(company="techcorp ai")] == [other_ids[1], ml_id]
+        assert [e["package_id"] for e in store.query(role="ML INTERN")] == [ml_id]
+        assert [e["package_id"] for e in store.query(since="2024-02-01T09:00:00", until="2024-03-05T09:00:00")] == [other_ids[0]]
+        assert [e["package_id"] for e in store.query(newest_first=False, limit=2)] == [ml_id, other_ids[0]]
+        
+        # A flipped byte in the compressed payload fails the CRC instead of returning garbage
+        segment_id, offset, length = store._db.execute(
+            "SELECT segment_id, offset, length FROM packages WHERE package_id = ?", (ml_id,)).fetchone()
+        with open(store._segment_path(segment_id), "r+b") as segment:
+            segment.seek(offset + length - 1)
+            last = segment.read(1)
+            segment.seek(offset + length - 1)
+            segment.write(bytes([last[0] ^ 0xFF]))
+        assert store.get(ml_id) is None
+        assert store.stats()["read_errors"] == 1
+        assert store.get(other_ids[0])["package_id"] == other_ids[0], "Other packages should still be readable"
+        store.close()
+    
+    print("✅ Package store working")
+    return True
+
+def _tracker_rows(count):
+    """Application rows spread over a few companies, roles and skills"""
+    companies, roles = ["TechCorp AI", "StartupX", "DataFlow"], ["ML Intern", "Full Stack Intern"]
+    return [{"timestamp": f"2024-01-{day % 28 + 1:02d}T10:00:00", "company": companies[day % 3],
+             "role": roles[day % 2], "job_type": "internship", "location": "Remote", "jd_snippet": "...",
+             "bullets": "Built things", "cover_letter_snippet": "Dear...", "status": "applied",
+             "match_score": round(0.5 + (day % 5) / 10, 2), "skills_matched": "Python, SQL" if day % 2 else "React",
+             "application_url": "", "notes": ""} for day in range(count)]
+
+def test_tracker_migration():
+    """Test copying a CSV tracker, with its status events, into SQLite"""
+    import tempfile
+    from tracker_storage import CsvTrackerStorage, migrate_csv_to_sqlite, open_tracker_storage
+    
+    with tempfile.TemporaryDirectory() as log_dir:
+        log_file = os.path.join(log_dir, "applications.csv")
+        csv_storage = CsvTrackerStorage(log_file)
+        csv_storage.append_many(_tracker_rows(12))
+        assert csv_storage.update_latest("StartupX", "Full Stack Intern", "interview", "Phone screen")
+        assert csv_storage.update_latest("DataFlow", "ML Intern", "rejected")
+        
+        sqlite_storage = open_tracker_storage(log_file, "sqlite")
+        assert len(sqlite_storage) == len(csv_storage) == 12
+        csv_df, sqlite_df = csv_storage.dataframe(), sqlite_storage.dataframe()
+        assert list(sqlite_df["company"]) == list(csv_df["company"])
+        assert list(sqlite_df["status"]) == list(csv_df["status"])
+        assert sqlite_df["match_score"].tolist() == csv_df["match_score"].tolist()
+        
+        # The event log comes along, re-keyed from CSV row positions to SQLite row IDs
+        assert [(application_id + 1, status, timestamp) for application_id, status, timestamp
+                in csv_storage.events()] == [tuple(event) for event in sqlite_storage.events()]
+        assert [event["status"] for event in sqlite_storage.history("StartupX", "Full Stack Intern")] == \
+            ["applied", "interview"]
+        assert sqlite_storage.summary()["by_status"] == csv_storage.summary()["by_status"]
+        assert sqlite_storage.verify_aggregates() == {}
+        
+        # A second migration (another worker, or a restart) copies nothing
+        assert migrate_csv_to_sqlite(log_file, sqlite_storage) == 0
+        reopened = open_tracker_storage(log_file, "sqlite")
+        assert len(reopened) == 12
+        reopened.close()
+        sqlite_storage.close()
+    
+    print("✅ Tracker CSV to SQLite migration working")
+    return True
+
+def test_tracker_aggregates():
+    """Test that the running aggregates and history counters match a full recompute on both backends"""
+    import random
+    import tempfile
+    from tracker_aggregates import TrackerAggregates
+    from tracker_analytics import analyze
+    from tracker_history import history_metrics
+    from tracker_storage import CsvTrackerStorage, SqliteTrackerStorage
+    
+    rng = random.Random(7)
+    rows = _tracker_rows(40)
+    updates = [(row["company"], row["role"], rng.choice(["interview", "rejected", "offer", "accepted"]))
+               for row in rng.sample(rows, 15)]
+    
+    with tempfile.TemporaryDirectory() as log_dir:
+        backends = [CsvTrackerStorage(os.path.join(log_dir, "applications.csv")),
+                    SqliteTrackerStorage(os.path.join(log_dir, "applications.sqlite"))]
+        for storage in backends:
+            storage.append_many(rows[:30])
+            for company, role, status in updates:
+                storage.update_latest(company, role, status)
+            for row in rows[30:]:
+                storage.append(row)
+            
+            assert storage.verify_aggregates() == {}, f"{storage.backend} aggregates drifted"
+            recomputed = TrackerAggregates.from_rows(storage.dataframe().to_dict("records"))
+            aggregates = storage.aggregates()
+            assert aggregates.total() == 40
+            assert aggregates.success_rates("company") == recomputed.success_rates("company")
+            assert aggregates.success_rates("company") == analyze(storage.dataframe())["success_rate_by_company"]
+            assert storage.history_metrics() == history_metrics(storage.events()), \
+                f"{storage.backend} history counters drifted"
+        
+        # Reopening rebuilds (CSV) or reads back (SQLite) the same numbers
+        reopened = [CsvTrackerStorage(backends[0].log_file), SqliteTrackerStorage(backends[1].db_path)]
+        for before, after in zip(backends, reopened):
+            assert after.history_metrics() == before.history_metrics()
+            assert after.summary()["by_status"] == before.summary()["by_status"]
+        assert reopened[0].history_metrics() == reopened[1].history_metrics()
+        for storage in backends[1:] + reopened[1:]:
+            storage.close()
+    
+    print("✅ Tracker aggregates match a full recompute")
+    return True
+
 def test_directory_structure():
     """Test if all required directories exist"""
     required_dirs = [
@@ -205,6 +464,13 @@ def run_system_test():
         ("Tracker Module", test_tracker),
         ("Mock Form", test_mock_form),
         ("Evaluation Module", test_evaluation_module),
+        ("JD Dedup", test_jd_dedup),
+        ("Skill Index", test_skill_index),
+        ("Structured Output", test_structured_output),
+        ("Semantic Matcher Cache", test_semantic_matcher_cache),
+        ("Package Store", test_package_store),
+        ("Tracker Migration", test_tracker_migration),
+        ("Tracker Aggregates", test_tracker_aggregates),
     ]
     
     passed = 0
@@ -3,11 +3,12 @@ Auto-Fill Demo: Automated form filling using Playwright
 Demonstrates safe auto-fill capabilities on mock application forms
 """
 import os
-import json
 import time
 from typing import List
 from datetime import datetime
 
+from profile_provider import get_profile_provider
+
 try:
     from playwright.sync_api import sync_playwright
     PLAYWRIGHT_AVAILABLE = True
@@ -27,18 +28,14 @@ except ImportError:
     print("Selenium not available. Install with: pip install selenium")
 
 class AutoFillDemo:
-    def __init__(self, profile_path: str = "data/profile.json"):
+    def __init__(self, profile_path: str = "data/profile.json", profile_provider=None):
         self.profile_path = profile_path
-        self.profile = self._load_profile()
+        self.profile_provider = profile_provider or get_profile_provider()
         
-    def _load_profile(self) -> dict:
-        """Load user profile for auto-filling personal information"""
-        try:
-            with open(self.profile_path, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Warning: Could not load profile: {e}")
-            return {}
+    @property
+    def profile(self) -> dict:
+        """User profile for auto-filling personal information (shared cache)"""
+        return self.profile_provider.get_profile(self.profile_path)
     
     def fill_application_form(self, bullets: List[str], cover_letter: str, use_selenium: bool = False):
         """
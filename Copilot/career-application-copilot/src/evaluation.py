@@ -25,9 +25,10 @@ except ImportError:
     TEXTSTAT_AVAILABLE = False
     print("Warning: textstat not available. Install with: pip install textstat")
 
-from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
+from keyword_extractor import get_keyword_extractor
+
 class ApplicationEvaluator:
     """
     Comprehensive evaluation system for AI agent performance
@@ -40,6 +41,7 @@ class ApplicationEvaluator:
         else:
             self.embedding_model = None
         
+        self.keyword_extractor = get_keyword_extractor()
         self.evaluation_history = []
         self.metrics_weights = {
             'relevance': 0.3,
@@ -363,6 +365,17 @@ class ApplicationEvaluator:
     def _analyze_keyword_matches(self, job_description: str, package: Dict) -> Dict:
         """Analyze keyword matches between job description and package"""
         
+        if self.keyword_extractor is not None:
+            result = self.keyword_extractor.match_keywords(
+                job_description, self._combine_package_text(package)
+            )
+            return {
+                'total_job_keywords': len(result['job_keywords']),
+                'matched_keywords': result['matched'],
+                'missing_keywords': result['missing'],
+                'match_percentage': len(result['matched']) / max(len(result['job_keywords']), 1) * 100
+            }
+        
         job_keywords = self._extract_keywords(job_description)
         package_keywords = self._extract_keywords(self._combine_package_text(package))
         
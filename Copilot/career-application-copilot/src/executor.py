@@ -4,145 +4,215 @@ Executor Agent: Generates tailored resume bullets and cover letters
 import json
 import os
 import re
-from typing import Dict, List, Optional
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime
 import openai
 from dotenv import load_dotenv
 
+from profile_provider import get_profile_provider
+from interaction_logger import get_interaction_logger
+from prompt_builder import PromptBuilder
+from generation_cache import GenerationCache, package_key
+from package_store import get_package_store
+from structured_output import INVALID, parse_json_prefix
+from model_server import ModelClient
+
 load_dotenv()
+
+# The backend is chosen before importing it, so ONNX Runtime workers never import torch
+GENERATOR_BACKEND = os.getenv("GENERATOR_BACKEND", "torch").lower()
+if GENERATOR_BACKEND == "onnx":
+    from onnx_generator import ONNX_AVAILABLE as FINE_TUNING_AVAILABLE, OnnxGenerator as Generator
+else:
+    # Fine-tuning libraries are imported conditionally by the generator module
+    from generation import GENERATION_AVAILABLE as FINE_TUNING_AVAILABLE, LocalGenerator as Generator
 openai.api_key = os.getenv("OPENAI_API_KEY")
 
-# Import fine-tuning libraries conditionally
-try:
-    import torch
-    from transformers import AutoModelForCausalLM, AutoTokenizer
-    from peft import PeftModel
-    FINE_TUNING_AVAILABLE = True
-except ImportError:
-    FINE_TUNING_AVAILABLE = False
-    print("Warning: Fine-tuning libraries not available, falling back to OpenAI API")
+MAX_NEW_TOKENS = 600
+# Bullets asked for by BULLETS_PROMPT; structured decoding stops after this many
+BULLET_COUNT = 6
+# Part of the generation cache key; bump when output parsing or the fallbacks change
+# (template and prompt budget changes already change the rendered prompts in the key)
+PROMPT_VERSION = 1
+# Generation entry points that can opt into speculative decoding (SPECULATIVE_ENDPOINTS)
+GENERATION_ENDPOINTS = ("bullets", "cover_letter", "cover_letter_stream", "application_package")
+
+# Each prompt opens with a static prefix (instructions + candidate profile) that is
+# the same for every JD, so the generator can reuse its cached key/values.
+# The prefix ends on a word and the JD-specific part starts with a blank line,
+# which keeps the tokenization identical across the boundary.
+BULLETS_PROMPT_PREFIX = """You are an expert resume writer specializing in creating ATS-friendly bullet points for undergraduate students applying to internships.
+
+Create 6 compelling resume bullet points that highlight the candidate's most relevant experiences for this specific role. Each bullet should:
+- Start with a strong action verb
+- Include specific metrics, technologies, or outcomes where possible
+- Be 1-2 lines maximum
+- Incorporate keywords from the job requirements naturally
+- Showcase projects and experiences that match the role
+
+Return ONLY a JSON object in this exact format:
+{{"bullets": ["First bullet point", "Second bullet point", "Third bullet point", "Fourth bullet point", "Fifth bullet point", "Sixth bullet point"]}}
+
+Candidate Profile:
+Education: {education}
+Experience:
+{experience}"""
+
+BULLETS_PROMPT_SUFFIX = """
+
+Job Title: {job_title}
+Required Skills: {required_skills}
+Candidate's Matching Skills: {matching_skills}
+Key Projects:
+{projects}"""
+
+BULLETS_PROMPT = BULLETS_PROMPT_PREFIX + BULLETS_PROMPT_SUFFIX
+
+COVER_LETTER_PROMPT_PREFIX = """You are a professional cover letter writer specializing in internship applications for computer science students.
+
+Write a compelling cover letter (maximum 350 words) for this internship application. The cover letter should:
+- Have a strong opening that mentions the specific role and company
+- Highlight 2-3 most relevant projects/experiences that match the job requirements
+- Demonstrate genuine interest in the role and company
+- Show how the candidate's skills align with the position
+- End with a professional closing and call to action
+- Use a confident but humble tone appropriate for a student
+
+Write the cover letter in a professional format with proper paragraphs. Do not include a date or address header.
+
+Candidate Information:
+- Name: {name}
+- University: {education}
+- Key Experience: {experience}"""
+
+COVER_LETTER_PROMPT_SUFFIX = """
+
+Job Details:
+- Title: {job_title}
+- Company: {company}
+- Required Skills: {required_skills}
+
+Candidate Fit:
+- Matching Skills: {matching_skills}
+- Top Relevant Project: {project}
+
+Focus Areas: {focus_areas}"""
+
+COVER_LETTER_PROMPT = COVER_LETTER_PROMPT_PREFIX + COVER_LETTER_PROMPT_SUFFIX
 
 class ApplicationExecutor:
-    def __init__(self, profile_path: str = "data/profile.json"):
+    def __init__(self, profile_path: str = "data/profile.json", profile_provider=None):
         self.profile_path = profile_path
-        self.profile = self._load_profile()
+        self.profile_provider = profile_provider or get_profile_provider()
+        self.interaction_logger = get_interaction_logger()
+        self.package_store = get_package_store()
         
-        # Load fine-tuned model if available
-        self.fine_tuned_model = None
+        # Fine-tuned generator: a shared model server if configured, else an in-process model
+        self.generator = None
         self.tokenizer = None
+        self.context_window = None
+        self.model_version = "fallback"
         self.use_fine_tuned = False
+        self.speculative_endpoints = self._speculative_endpoints()
         
-        # Try to load the fine-tuned model
-        if FINE_TUNING_AVAILABLE:
+        server_address = os.getenv("MODEL_SERVER_ADDRESS")
+        if server_address:
+            self._connect_model_server(server_address)
+        elif FINE_TUNING_AVAILABLE:
             self._load_fine_tuned_model()
+        
+        self.prompt_builder = PromptBuilder(
+            tokenizer=self.tokenizer,
+            max_prompt_tokens=self._prompt_token_budget()
+        )
+        
+        cache_dir = os.getenv("GENERATION_CACHE_DIR", "data/generation_cache")
+        self.generation_cache = GenerationCache(
+            max_entries=int(os.getenv("GENERATION_CACHE_SIZE", "256")),
+            cache_dir=cache_dir or None
+        )
+        
+        # (time to first token, total) per streamed cover letter, in seconds
+        self._stream_timings = deque(maxlen=1000)
+        self._stream_lock = threading.Lock()
+        
+        self._bullet_stats = {"requests": 0, "tokens_generated": 0,
+                              "stop_reasons": Counter(), "outcomes": Counter()}
+        self._stats_lock = threading.Lock()
     
     def _load_fine_tuned_model(self):
-        """Load the fine-tuned LoRA model if available"""
+        """Load the fine-tuned model (ONNX export, merged checkpoint or base + adapter) if available"""
         try:
-            model_path = os.getenv("FINE_TUNED_MODEL_PATH", "./models/career-copilot-lora")
-            base_model = "microsoft/DialoGPT-medium"  # This should match what was used in training
-            
-            # Check if model path exists
-            if not os.path.exists(model_path):
-                print(f"⚠️ Fine-tuned model not found at {model_path}, falling back to OpenAI API")
-                return
-                
-            print(f"🔄 Loading fine-tuned model from {model_path}...")
-            
-            # Load tokenizer and model
-            self.tokenizer = AutoTokenizer.from_pretrained(base_model)
-            
-            # Load the base model
-            base_model = AutoModelForCausalLM.from_pretrained(
-                base_model,
-                load_in_8bit=True,
-                device_map="auto",
-                torch_dtype=torch.float16
-            )
-            
-            # Load the fine-tuned model
-            self.fine_tuned_model = PeftModel.from_pretrained(
-                base_model,
-                model_path,
-                torch_dtype=torch.float16,
-                device_map="auto"
-            )
-            
-            # Set generation config
-            self.fine_tuned_model.config.pad_token_id = self.tokenizer.eos_token_id
-            self.fine_tuned_model.eval()
-            
-            print("✅ Fine-tuned LoRA model loaded successfully!")
+            self.generator = Generator.load()
+            self.tokenizer = self.generator.tokenizer
+            self.context_window = self.generator.context_window
+            self.model_version = self.generator.model_version
             self.use_fine_tuned = True
             
+        except FileNotFoundError as e:
+            print(f"⚠️ {e}, falling back to OpenAI API")
         except Exception as e:
             print(f"❌ Error loading fine-tuned model: {e}")
             print("⚠️ Falling back to OpenAI API")
             self.use_fine_tuned = False
-        
-    def _load_profile(self) -> Dict:
-        """Load user profile from JSON file"""
+    
+    def _connect_model_server(self, address: str):
+        """Use the shared model server instead of loading a model copy into this process"""
         try:
-            with open(self.profile_path, 'r') as f:
-                return json.load(f)
+            client = ModelClient(address)
+            info = client.info()
+            self.generator = client
+            self.context_window = info.get("context_window")
+            self.model_version = info.get("model_version") or info.get("base_model", "model-server")
+            self.use_fine_tuned = True
+            print(f"✅ Connected to model server at {address} ({info.get('base_model')})")
         except Exception as e:
-            print(f"Error loading profile: {e}")
-            return {}
+            print(f"❌ Model server at {address} not reachable: {e}")
+            print("⚠️ Falling back to OpenAI API")
+            return
+        
+        # The tokenizer is only needed for prompt budgeting, which can approximate without it
+        if FINE_TUNING_AVAILABLE:
+            try:
+                from transformers import AutoTokenizer
+                self.tokenizer = AutoTokenizer.from_pretrained(info["base_model"])
+            except Exception as e:
+                print(f"⚠️ Tokenizer for {info.get('base_model')} not available, approximating prompt tokens: {e}")
+        
+    def _prompt_token_budget(self) -> int:
+        """Prompt tokens that still leave room for MAX_NEW_TOKENS in the model's context window"""
+        budget = int(os.getenv("PROMPT_MAX_TOKENS", "1024"))
+        context_window = self.context_window
+        if context_window is None and self.tokenizer is not None:
+            context_window = getattr(self.tokenizer, "model_max_length", None)
+        if context_window is not None:
+            # Tokenizers without a configured limit report a huge sentinel value
+            if context_window < 100_000:
+                # A few tokens are reserved for the "Input: ... Output:" wrapper
+                budget = min(budget, context_window - MAX_NEW_TOKENS - 8)
+        return max(budget, 128)
+    
+    @property
+    def profile(self) -> Dict:
+        """Current user profile, served from the shared cache so edits are picked up"""
+        return self.profile_provider.get_profile(self.profile_path)
     
     def generate_resume_bullets(self, strategy: Dict) -> List[str]:
         """Generate tailored resume bullets based on job strategy"""
         
-        jd_analysis = strategy.get("jd_analysis", {})
-        matching_skills = strategy.get("matching_skills", [])
-        relevant_projects = strategy.get("suggested_projects", [])
-        
-        # Create context for LLM
-        context = {
-            "job_title": jd_analysis.get("title", "Unknown Role"),
-            "required_skills": jd_analysis.get("skills", []),
-            "matching_skills": matching_skills,
-            "relevant_projects": relevant_projects,
-            "profile": self.profile
-        }
-        
-        prompt = f"""
-        You are an expert resume writer specializing in creating ATS-friendly bullet points for undergraduate students applying to internships. 
-
-        Create 6 compelling resume bullet points that highlight the candidate's most relevant experiences for this specific role. Each bullet should:
-        - Start with a strong action verb
-        - Include specific metrics, technologies, or outcomes where possible
-        - Be 1-2 lines maximum
-        - Incorporate keywords from the job requirements naturally
-        - Showcase projects and experiences that match the role
-
-        Job Title: {context['job_title']}
-        Required Skills: {', '.join(context['required_skills'])}
-        Candidate's Matching Skills: {', '.join(context['matching_skills'])}
-
-        Candidate Profile:
-        Education: {self.profile.get('university', '')} - {self.profile.get('department', '')}
-        Key Projects: {json.dumps([p['project']['title'] + ': ' + p['project']['description'] for p in context['relevant_projects'][:3]], indent=2)}
-        Experience: {json.dumps([exp['role'] + ' - ' + exp['description'] for exp in self.profile.get('experience', [])], indent=2)}
-
-        Return ONLY a JSON object in this exact format:
-        {{
-            "bullets": [
-                "First bullet point",
-                "Second bullet point", 
-                "Third bullet point",
-                "Fourth bullet point",
-                "Fifth bullet point",
-                "Sixth bullet point"
-            ]
-        }}
-        """
+        context = self._bullets_context(strategy)
+        prompt = self._build_bullets_prompt(context)
         
         # Log the prompt for evaluation
         print(f"🔄 Generating resume bullets using {'fine-tuned LoRA model' if self.use_fine_tuned else 'FALLBACK mode - model not available'}...")
         
         try:
             # Always try to use fine-tuned model first
-            if self.use_fine_tuned and self.fine_tuned_model:
+            if self.use_fine_tuned and self.generator:
                 print("✅ Using LoRA fine-tuned model for generation")
                 return self._generate_with_fine_tuned(prompt)
             else:
@@ -154,54 +224,215 @@ class ApplicationExecutor:
             print(f"Error generating bullets: {e}")
             return self._fallback_bullets(context)
     
-    def _generate_with_fine_tuned(self, prompt: str) -> List[str]:
-        """Generate content using the fine-tuned model"""
-        # Format prompt for the model
-        formatted_prompt = f"Input: {prompt}\n\nOutput:"
-        
-        # Tokenize the prompt
-        inputs = self.tokenizer(formatted_prompt, return_tensors="pt").to("cuda" if torch.cuda.is_available() else "cpu")
-        
-        # Generate the response
-        with torch.no_grad():
-            outputs = self.fine_tuned_model.generate(
-                inputs["input_ids"],
-                max_new_tokens=600,
-                temperature=0.2,
-                top_p=0.95,
-                num_return_sequences=1,
-                pad_token_id=self.tokenizer.eos_token_id
+    def _bullets_context(self, strategy: Dict) -> Dict:
+        """Create context for LLM"""
+        jd_analysis = strategy.get("jd_analysis", {})
+        return {
+            "job_title": jd_analysis.get("title", "Unknown Role"),
+            "required_skills": jd_analysis.get("skills", []),
+            "matching_skills": strategy.get("matching_skills", []),
+            "relevant_projects": strategy.get("suggested_projects", []),
+            "profile": self.profile
+        }
+    
+    def _strategy_cover_letter_prompt(self, strategy: Dict) -> str:
+        return self._build_cover_letter_prompt(
+            strategy.get("jd_analysis", {}),
+            strategy.get("matching_skills", []),
+            strategy.get("suggested_projects", []),
+            strategy.get("recommended_focus", [])
+        )
+    
+    def _profile_version(self) -> str:
+        return self.profile_provider.get(self.profile_path).version
+    
+    def _education(self) -> str:
+        profile = self.profile
+        return f"{profile.get('university', '')} - {profile.get('department', '')}"
+    
+    def _bullets_prompt_prefix(self) -> str:
+        """Instructions and the candidate's education/experience; the same for every JD"""
+        experience = [exp['role'] + ' - ' + exp['description'] for exp in self.profile.get('experience', [])]
+        
+        def render() -> str:
+            # A fixed share of the budget, so the prefix doesn't depend on the JD
+            fitted_experience = self.prompt_builder.fit_lines(experience, self.prompt_builder.max_prompt_tokens // 4)
+            return BULLETS_PROMPT_PREFIX.format(
+                education=self._education(),
+                experience="\n".join(f"- {line}" for line in fitted_experience) or "- Academic projects and coursework"
             )
         
-        # Decode the response
-        response_text = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
+        return self.prompt_builder.build("bullets_prefix", (self._profile_version(),), render)
+    
+    def _build_bullets_prompt(self, context: Dict) -> str:
+        """Bullet prompt with the project descriptions fitted to the prompt token budget"""
+        prefix = self._bullets_prompt_prefix()
+        projects = [p['project']['title'] + ': ' + p['project']['description'] for p in context['relevant_projects'][:3]]
+        fields = {
+            "job_title": context['job_title'],
+            "required_skills": ', '.join(context['required_skills']),
+            "matching_skills": ', '.join(context['matching_skills'])
+        }
+        
+        def render() -> str:
+            builder = self.prompt_builder
+            remaining = builder.max_prompt_tokens - builder.count_tokens(
+                prefix + BULLETS_PROMPT_SUFFIX.format(projects="", **fields))
+            # Projects are already ranked by relevance
+            fitted_projects = builder.fit_lines(projects, remaining)
+            return prefix + BULLETS_PROMPT_SUFFIX.format(
+                projects="\n".join(f"- {line}" for line in fitted_projects),
+                **fields
+            )
         
+        return self.prompt_builder.build(
+            "bullets", (self._profile_version(), sorted(fields.items()), projects), render)
+    
+    def _cover_letter_prompt_prefix(self) -> str:
+        """Instructions and the candidate's name, education and key experience; the same for every JD"""
+        profile = self.profile
+        experience = profile.get('experience', [])
+        key_experience = (experience[0].get('role', '') + ' - ' + experience[0].get('description', '')
+                          if experience else 'Academic projects and coursework')
+        
+        def render() -> str:
+            return COVER_LETTER_PROMPT_PREFIX.format(
+                name=profile.get('name', 'Student'),
+                education=self._education(),
+                experience=self.prompt_builder.truncate(key_experience, self.prompt_builder.max_prompt_tokens // 4)
+            )
+        
+        return self.prompt_builder.build("cover_letter_prefix", (self._profile_version(),), render)
+    
+    def _build_cover_letter_prompt(self, jd_analysis: Dict, matching_skills: List[str],
+                                   relevant_projects: List[Dict], focus_areas: List[str]) -> str:
+        """Cover letter prompt with the project description fitted to the budget"""
+        prefix = self._cover_letter_prompt_prefix()
+        project = (relevant_projects[0]['project']['title'] + ' - ' + relevant_projects[0]['project']['description']
+                   if relevant_projects else 'Various technical projects')
+        fields = {
+            "job_title": jd_analysis.get('title', 'Unknown Role'),
+            "company": jd_analysis.get('company', 'the company'),
+            "required_skills": ', '.join(jd_analysis.get('skills', [])),
+            "matching_skills": ', '.join(matching_skills),
+            "focus_areas": ', '.join(focus_areas)
+        }
+        
+        def render() -> str:
+            builder = self.prompt_builder
+            remaining = builder.max_prompt_tokens - builder.count_tokens(
+                prefix + COVER_LETTER_PROMPT_SUFFIX.format(project="", **fields))
+            return prefix + COVER_LETTER_PROMPT_SUFFIX.format(project=builder.truncate(project, remaining), **fields)
+        
+        return self.prompt_builder.build(
+            "cover_letter", (self._profile_version(), sorted(fields.items()), project), render)
+    
+    def _prompt_prefix(self, prompt: str) -> Optional[str]:
+        """The formatted static prefix of prompt, whose key/values the generator may cache"""
+        for prefix in (self._bullets_prompt_prefix(), self._cover_letter_prompt_prefix()):
+            if prompt.startswith(prefix):
+                return f"Input: {prefix}"
+        return None
+    
+    @staticmethod
+    def _format_prompt(prompt: str) -> str:
+        # Format prompt for the model
+        return f"Input: {prompt}\n\nOutput:"
+    
+    @staticmethod
+    def _speculative_endpoints() -> set:
+        """Endpoints listed in SPECULATIVE_ENDPOINTS (comma-separated, or "all")"""
+        names = {name.strip() for name in os.getenv("SPECULATIVE_ENDPOINTS", "").split(",") if name.strip()}
+        if "all" in names:
+            return set(GENERATION_ENDPOINTS)
+        unknown = names - set(GENERATION_ENDPOINTS)
+        if unknown:
+            print(f"⚠️ Ignoring unknown SPECULATIVE_ENDPOINTS entries: {', '.join(sorted(unknown))}")
+        return names & set(GENERATION_ENDPOINTS)
+    
+    def _generation_params(self, endpoint: str) -> Dict:
+        params = {"max_new_tokens": MAX_NEW_TOKENS, "temperature": 0.2, "top_p": 0.95}
+        # Only sent when enabled, so generators without a draft model never see the flag
+        if endpoint in self.speculative_endpoints:
+            params["speculative"] = True
+        return params
+    
+    def _generate_with_fine_tuned(self, prompt: str) -> List[str]:
+        """Generate content using the fine-tuned model"""
+        # Decoding stops once the bullet JSON is complete (batched with other requests when served by the model server)
+        response = self.generator.generate_batch(
+            [self._format_prompt(prompt)], json_max_items=BULLET_COUNT, prefix=self._prompt_prefix(prompt),
+            **self._generation_params("bullets"))[0]
+        return self._parse_fine_tuned_bullets(prompt, response) or self._unparsed_bullets_fallback()
+    
+    def _parse_fine_tuned_bullets(self, prompt: str, response: Dict) -> Optional[List[str]]:
+        """
+        Pull the bullet list out of the fine-tuned model's output ({"text", "tokens", "stop_reason"});
+        None if there is no usable list
+        """
+        response_text = response["text"]
         # Extract the output part
         output_text = response_text.split("Output:")[1].strip() if "Output:" in response_text else response_text
+        stop_reason = response.get("stop_reason")
         
-        # Try to extract JSON
-        json_match = re.search(r'\{.*\}', output_text, re.DOTALL)
-        if json_match:
+        bullets, outcome = None, "parsed"
+        if stop_reason == INVALID:
+            # Generation was cut off as soon as the output stopped looking like JSON
+            print("⚠️ Fine-tuned model output is not JSON, stopped early")
+            outcome = "rejected"
+        else:
             try:
-                result = json.loads(json_match.group(0))
-                bullets = result.get("bullets", [])
-                
-                # Log the interaction
-                self._log_interaction("resume_bullets_fine_tuned", prompt, output_text, bullets)
-                return bullets
-            except json.JSONDecodeError:
+                # Closes the list if generation stopped after the last bullet or ran out of tokens
+                result = parse_json_prefix(output_text, max_items=BULLET_COUNT)
+                bullets = result.get("bullets", []) if isinstance(result, dict) else []
+                if bullets:
+                    # Log the interaction
+                    self._log_interaction("resume_bullets_fine_tuned", prompt, output_text, bullets)
+                else:
+                    outcome = "failed"
+            except ValueError:
                 print("⚠️ Invalid JSON from fine-tuned model output")
                 # Extract any bullet points using regex as fallback
-                bullet_matches = re.findall(r'"([^"]+)"', output_text)
+                bullet_matches = [match for match in re.findall(r'"([^"]+)"', output_text) if match != "bullets"]
                 if bullet_matches and len(bullet_matches) >= 4:
                     print("✅ Successfully extracted bullet points using regex")
-                    return bullet_matches[:6]  # Take up to 6 bullets
+                    bullets, outcome = bullet_matches[:BULLET_COUNT], "regex"
+                else:
+                    outcome = "failed"
         
+        self._record_bullet_generation(response, stop_reason, outcome)
+        return bullets[:BULLET_COUNT] if bullets else None
+    
+    def _unparsed_bullets_fallback(self) -> List[str]:
         print("⚠️ Could not extract structured output from fine-tuned model, using fallback generation")
         return self._fallback_bullets({"job_title": "LoRA Model Generation", 
                                       "relevant_projects": [], 
                                       "matching_skills": ["python", "machine learning", "data science"]})
     
+    def _record_bullet_generation(self, response: Dict, stop_reason: Optional[str], outcome: str):
+        with self._stats_lock:
+            stats = self._bullet_stats
+            stats["requests"] += 1
+            stats["tokens_generated"] += response.get("tokens", 0)
+            stats["stop_reasons"][stop_reason or "eos_or_length"] += 1
+            stats["outcomes"][outcome] += 1
+    
+    def bullet_generation_stats(self) -> Dict:
+        """Tokens generated per bullets request, how decoding stopped, and how often parsing failed"""
+        with self._stats_lock:
+            stats = {
+                "requests": self._bullet_stats["requests"],
+                "tokens_generated": self._bullet_stats["tokens_generated"],
+                "stop_reasons": dict(self._bullet_stats["stop_reasons"]),
+                "outcomes": dict(self._bullet_stats["outcomes"])
+            }
+        requests = stats["requests"]
+        # Regex recoveries count as failures: the structured output itself was unusable
+        failures = requests - stats["outcomes"].get("parsed", 0)
+        stats["avg_tokens_per_request"] = round(stats["tokens_generated"] / requests, 1) if requests else 0.0
+        stats["parse_failure_rate"] = round(failures / requests, 4) if requests else 0.0
+        return stats
+    
     def _generate_with_openai(self, prompt: str) -> List[str]:
         """Generate content using OpenAI API"""
         response = openai.ChatCompletion.create(
@@ -242,41 +473,11 @@ class ApplicationExecutor:
         """Generate tailored cover letter based on job strategy"""
         
         jd_analysis = strategy.get("jd_analysis", {})
-        matching_skills = strategy.get("matching_skills", [])
-        relevant_projects = strategy.get("suggested_projects", [])
-        focus_areas = strategy.get("recommended_focus", [])
-        
-        prompt = f"""
-        You are a professional cover letter writer specializing in internship applications for computer science students.
-
-        Write a compelling cover letter (maximum 350 words) for this internship application. The cover letter should:
-        - Have a strong opening that mentions the specific role and company
-        - Highlight 2-3 most relevant projects/experiences that match the job requirements
-        - Demonstrate genuine interest in the role and company
-        - Show how the candidate's skills align with the position
-        - End with a professional closing and call to action
-        - Use a confident but humble tone appropriate for a student
-
-        Job Details:
-        - Title: {jd_analysis.get('title', 'Unknown Role')}
-        - Company: {jd_analysis.get('company', 'the company')}
-        - Required Skills: {', '.join(jd_analysis.get('skills', []))}
-        
-        Candidate Information:
-        - Name: {self.profile.get('name', 'Student')}
-        - University: {self.profile.get('university', '')} - {self.profile.get('department', '')}
-        - Matching Skills: {', '.join(matching_skills)}
-        - Top Relevant Project: {relevant_projects[0]['project']['title'] + ' - ' + relevant_projects[0]['project']['description'] if relevant_projects else 'Various technical projects'}
-        - Key Experience: {self.profile.get('experience', [{}])[0].get('role', '') + ' - ' + self.profile.get('experience', [{}])[0].get('description', '') if self.profile.get('experience') else 'Academic projects and coursework'}
-
-        Focus Areas: {', '.join(focus_areas)}
-
-        Write the cover letter in a professional format with proper paragraphs. Do not include a date or address header.
-        """
+        prompt = self._strategy_cover_letter_prompt(strategy)
         
         try:
             # Use fine-tuned model if available
-            if self.use_fine_tuned and self.fine_tuned_model:
+            if self.use_fine_tuned and self.generator:
                 print("✅ Using LoRA fine-tuned model for cover letter generation")
                 cover_letter = self._generate_cover_letter_with_fine_tuned(prompt)
                 return cover_letter
@@ -289,6 +490,92 @@ class ApplicationExecutor:
             print(f"Error generating cover letter: {e}")
             return self._fallback_cover_letter(jd_analysis)
     
+    def stream_cover_letter(self, strategy: Dict) -> Iterator[Dict]:
+        """
+        Generate the cover letter as a stream of {"type": "token", "text"} events,
+        ending with {"type": "done", "cover_letter", "source", "ttft_ms", "total_ms"}.
+        The final cover_letter is authoritative: if the streamed text turns out to be
+        unusable, "done" carries the fallback letter with "replaced": True.
+        """
+        jd_analysis = strategy.get("jd_analysis", {})
+        prompt = self._strategy_cover_letter_prompt(strategy)
+        
+        start = time.perf_counter()
+        first_token_at = None
+        chunks = []
+        cover_letter, source = None, "fallback"
+        
+        if self.use_fine_tuned and self.generator:
+            try:
+                for text in self.generator.stream(self._format_prompt(prompt), prefix=self._prompt_prefix(prompt),
+                                                  **self._generation_params("cover_letter_stream")):
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                    chunks.append(text)
+                    yield {"type": "token", "text": text}
+                cover_letter = self._parse_fine_tuned_cover_letter(prompt, "".join(chunks))
+                source = "fine_tuned"
+            except Exception as e:
+                print(f"Error streaming cover letter: {e}")
+        
+        if cover_letter is None:
+            cover_letter = self._fallback_cover_letter(jd_analysis)
+            if not chunks:
+                # Nothing streamed yet, so the template goes out as a single chunk
+                first_token_at = time.perf_counter()
+                yield {"type": "token", "text": cover_letter}
+        
+        total = time.perf_counter() - start
+        ttft = (first_token_at or time.perf_counter()) - start
+        with self._stream_lock:
+            self._stream_timings.append((ttft, total, source))
+        
+        yield {
+            "type": "done",
+            "cover_letter": cover_letter,
+            "source": source,
+            "replaced": bool(chunks) and source == "fallback",
+            "ttft_ms": round(ttft * 1000, 1),
+            "total_ms": round(total * 1000, 1)
+        }
+    
+    def streaming_stats(self) -> Dict:
+        """Time-to-first-token and total latency percentiles over recent streamed cover letters"""
+        with self._stream_lock:
+            timings = list(self._stream_timings)
+        if not timings:
+            return {"streams": 0}
+        
+        def percentile(values: List[float], q: float) -> float:
+            ordered = sorted(values)
+            return round(ordered[min(int(q * len(ordered)), len(ordered) - 1)] * 1000, 1)
+        
+        ttfts = [timing[0] for timing in timings]
+        totals = [timing[1] for timing in timings]
+        return {
+            "streams": len(timings),
+            "fine_tuned_streams": sum(1 for timing in timings if timing[2] == "fine_tuned"),
+            "ttft_ms_p50": percentile(ttfts, 0.5),
+            "ttft_ms_p95": percentile(ttfts, 0.95),
+            "total_ms_p50": percentile(totals, 0.5),
+            "total_ms_p95": percentile(totals, 0.95)
+        }
+    
+    def _generate_cover_letter_with_fine_tuned(self, prompt: str) -> str:
+        """Generate a cover letter using the fine-tuned model"""
+        response_text = self.generator.generate(self._format_prompt(prompt), prefix=self._prompt_prefix(prompt),
+                                                **self._generation_params("cover_letter"))
+        return self._parse_fine_tuned_cover_letter(prompt, response_text)
+    
+    def _parse_fine_tuned_cover_letter(self, prompt: str, response_text: str) -> str:
+        """Cover letter text from the fine-tuned model's raw output; raises if it is unusable"""
+        cover_letter = response_text.split("Output:")[1].strip() if "Output:" in response_text else response_text.strip()
+        if len(cover_letter.split()) < 50:
+            raise ValueError("fine-tuned model returned a cover letter that is too short")
+        
+        self._log_interaction("cover_letter_fine_tuned", prompt, response_text, cover_letter)
+        return cover_letter
+    
     def _fallback_cover_letter(self, jd_analysis: Dict) -> str:
         """Fallback cover letter when LLM fails"""
         name = self.profile.get('name', 'Student')
@@ -310,20 +597,49 @@ Sincerely,
         
         return cover_letter
     
-    def generate_application_package(self, strategy: Dict) -> Dict:
-        """Generate complete application package (bullets + cover letter)"""
+    def generate_application_package(self, strategy: Dict, use_cache: bool = True) -> Dict:
+        """
+        Generate complete application package (bullets + cover letter).
+        Identical prompt inputs for the same profile and model version are served
+        from the generation cache unless use_cache is False.
+        """
         
-        print("Generating tailored resume bullets...")
-        bullets = self.generate_resume_bullets(strategy)
+        start = time.perf_counter()
+        cache_key = self._package_cache_key(strategy)
+        cached = self.generation_cache.get(cache_key) if use_cache else None
+        if not use_cache:
+            self.generation_cache.record_bypass()
         
-        print("Generating personalized cover letter...")
-        cover_letter = self.generate_cover_letter(strategy)
+        if cached is not None:
+            print("♻️ Serving application package from the generation cache")
+            bullets, cover_letter = list(cached["bullets"]), cached["cover_letter"]
+            cache_status = "hit"
+        else:
+            # The two prompts are independent, so they are generated together
+            if self.use_fine_tuned and self.generator:
+                print("Generating tailored resume bullets and cover letter in one batch...")
+                bullets, cover_letter, cacheable = self._generate_package_batched(strategy)
+            else:
+                print("Generating tailored resume bullets and personalized cover letter concurrently...")
+                with ThreadPoolExecutor(max_workers=2) as pool:
+                    bullets_future = pool.submit(self.generate_resume_bullets, strategy)
+                    cover_letter_future = pool.submit(self.generate_cover_letter, strategy)
+                    bullets, cover_letter = bullets_future.result(), cover_letter_future.result()
+                # Without a model both come from the fallbacks, which are instant anyway
+                cacheable = False
+            
+            # Fallback output should be retried next time, not served for good
+            if cacheable:
+                self.generation_cache.put(cache_key, {"bullets": bullets, "cover_letter": cover_letter})
+            cache_status = "miss" if use_cache else "bypass"
         
         package = {
             "bullets": bullets,
             "cover_letter": cover_letter,
             "strategy_used": strategy,
             "generated_at": datetime.now().isoformat(),
+            "generation_seconds": round(time.perf_counter() - start, 3),
+            "cache": cache_status,
             "job_match_score": strategy.get("match_score", 0)
         }
         
@@ -332,15 +648,57 @@ Sincerely,
         
         return package
     
-    def _save_package(self, package: Dict):
-        """Save the generated application package"""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"logs/application_package_{timestamp}.json"
+    def _package_cache_key(self, strategy: Dict) -> str:
+        """Key over the prompt inputs, profile and model, and the prompts and params they are generated with"""
+        prompts = [self._format_prompt(self._build_bullets_prompt(self._bullets_context(strategy))),
+                   self._format_prompt(self._strategy_cover_letter_prompt(strategy))]
+        return package_key(strategy, self._profile_version(), self.model_version, {
+            "version": PROMPT_VERSION,
+            "prompts": prompts,
+            "params": self._generation_params("application_package")
+        })
+    
+    def _generate_package_batched(self, strategy: Dict):
+        """
+        Bullets and cover letter from a single padded generate() call on the fine-tuned
+        model. The third value is False when either of them came from a fallback
+        (generation failed or its output was unusable).
+        """
+        context = self._bullets_context(strategy)
+        jd_analysis = strategy.get("jd_analysis", {})
+        bullets_prompt = self._build_bullets_prompt(context)
+        cover_letter_prompt = self._strategy_cover_letter_prompt(strategy)
+        
+        try:
+            # Structured stopping applies to the bullets row only; the cover letter is free text
+            responses = self.generator.generate_batch(
+                [self._format_prompt(bullets_prompt), self._format_prompt(cover_letter_prompt)],
+                json_max_items=[BULLET_COUNT, None],
+                prefix=[self._prompt_prefix(bullets_prompt), self._prompt_prefix(cover_letter_prompt)],
+                **self._generation_params("application_package")
+            )
+        except Exception as e:
+            print(f"Error generating application package: {e}")
+            return self._fallback_bullets(context), self._fallback_cover_letter(jd_analysis), False
         
+        cacheable = True
+        bullets = self._parse_fine_tuned_bullets(bullets_prompt, responses[0])
+        if not bullets:
+            bullets, cacheable = self._unparsed_bullets_fallback(), False
         try:
-            with open(filename, 'w') as f:
-                json.dump(package, f, indent=2)
-            print(f"Application package saved to {filename}")
+            cover_letter = self._parse_fine_tuned_cover_letter(cover_letter_prompt, responses[1]["text"])
+        except ValueError as e:
+            print(f"⚠️ {e}, using fallback cover letter")
+            cover_letter, cacheable = self._fallback_cover_letter(jd_analysis), False
+        return bullets, cover_letter, cacheable
+    
+    def _save_package(self, package: Dict):
+        """Append the generated application package to the package store and tag it with its ID"""
+        if self.package_store is None:
+            return
+        try:
+            package["package_id"] = self.package_store.put(package)
+            print(f"Application package saved as {package['package_id']}")
         except Exception as e:
             print(f"Failed to save package: {e}")
     
@@ -356,14 +714,7 @@ Sincerely,
             "model": "gpt-3.5-turbo"
         }
         
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        log_file = f"logs/executor_{generation_type}_{timestamp}.json"
-        
-        try:
-            with open(log_file, 'w') as f:
-                json.dump(log_entry, f, indent=2)
-        except Exception as e:
-            print(f"Failed to log interaction: {e}")
+        self.interaction_logger.log(log_entry, stream="executor_interactions")
 
 if __name__ == "__main__":
     # Test the executor
@@ -0,0 +1,530 @@
+"""
+Local Generator: The LoRA fine-tuned causal LM behind a batched generate() API
+Used in-process by the executor, or once per host by the model server so every
+backend worker shares a single copy of the weights.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+
+from prefix_cache import PrefixKVCache
+from structured_output import OPEN, JsonPrefixScanner
+
+try:
+    import torch
+    from transformers import (AutoModelForCausalLM, AutoTokenizer, DynamicCache, StoppingCriteria,
+                              StoppingCriteriaList, TextIteratorStreamer)
+    from peft import PeftModel
+    GENERATION_AVAILABLE = True
+except ImportError:
+    GENERATION_AVAILABLE = False
+    StoppingCriteria = object
+    print("Warning: Fine-tuning libraries not available, falling back to OpenAI API")
+
+DEFAULT_BASE_MODEL = "microsoft/DialoGPT-medium"
+DEFAULT_MODEL_PATH = "./models/career-copilot-lora"
+DEFAULT_MERGED_MODEL_PATH = "./models/career-copilot-merged"
+MERGE_INFO_FILE = "merge_info.json"
+
+
+def conv1d_to_linear(model):
+    """
+    GPT-2 style models (DialoGPT) use transformers' Conv1D instead of nn.Linear,
+    which dynamic quantization skips. Swap them for equivalent Linear layers.
+    """
+    from transformers.pytorch_utils import Conv1D
+
+    for parent in list(model.modules()):
+        for name, child in list(parent.named_children()):
+            if isinstance(child, Conv1D):
+                in_features, out_features = child.weight.shape
+                linear = torch.nn.Linear(in_features, out_features)
+                linear.weight.data = child.weight.data.t().contiguous()
+                linear.bias.data = child.bias.data
+                setattr(parent, name, linear)
+    return model
+
+
+def quantize_for_cpu(model):
+    """Dynamic int8 quantization of all Linear layers (weights int8, activations quantized on the fly)"""
+    return torch.quantization.quantize_dynamic(conv1d_to_linear(model), {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def model_fingerprint(*paths: Optional[str]) -> str:
+    """
+    Short hash of the model files (name, size, mtime) under the given paths,
+    so retraining or re-merging changes the version even at the same path.
+    Hub model ids are hashed as plain names.
+    """
+    digest = hashlib.sha1()
+    for path in paths:
+        if not path:
+            continue
+        digest.update(path.encode("utf-8"))
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                stat = os.stat(os.path.join(path, name))
+                digest.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class JsonStoppingCriteria(StoppingCriteria):
+    """
+    Per-row structured stopping for batched generate(): a row whose limit is not
+    None stops once its JSON closes, once max_items list items are complete, or
+    as soon as the continuation is not JSON. Rows with a None limit run freely.
+    """
+
+    def __init__(self, tokenizer, prompt_length: int, max_items: Sequence[Optional[int]], max_preamble: int = 32):
+        self.tokenizer = tokenizer
+        self.prompt_length = prompt_length
+        self.scanners = [JsonPrefixScanner(max_items=limit, max_preamble=max_preamble) if limit is not None else None
+                         for limit in max_items]
+        self._decoded = [""] * len(max_items)
+
+    def __call__(self, input_ids, scores, **kwargs):
+        done = []
+        for row, scanner in enumerate(self.scanners):
+            if scanner is None:
+                done.append(False)
+                continue
+            if scanner.status() == OPEN:
+                # Decode the whole continuation so multi-token characters come out whole
+                text = self.tokenizer.decode(input_ids[row, self.prompt_length:], skip_special_tokens=True)
+                scanner.feed(text[len(self._decoded[row]):])
+                self._decoded[row] = text
+            done.append(scanner.status() != OPEN)
+        return torch.tensor(done, dtype=torch.bool, device=input_ids.device)
+
+    def stop_reason(self, row: int) -> Optional[str]:
+        scanner = self.scanners[row]
+        if scanner is None or scanner.status() == OPEN:
+            return None
+        return scanner.status()
+
+    def trim(self, row: int, tokens):
+        """The shortest leading part of a stopped row's new tokens that covers the text its scanner consumed"""
+        consumed = self.scanners[row].consumed
+        end = len(tokens)
+        while end > 1 and len(self.tokenizer.decode(tokens[:end - 1], skip_special_tokens=True)) >= consumed:
+            end -= 1
+        return tokens[:end]
+
+
+class LocalGenerator:
+    """
+    Wraps a causal LM and its tokenizer. generate_batch() left-pads the prompts
+    into a single generate() call, so concurrent requests share one forward pass.
+    Prompts can name a prefix whose key/values are cached and reused, so only
+    the request-specific tail of the prompt is prefilled. With a draft model
+    attached (load_draft), speculative=True requests decode with assisted generation.
+    """
+
+    def __init__(self, model, tokenizer, base_model: str = DEFAULT_BASE_MODEL, model_path: Optional[str] = None,
+                 prefix_cache_mb: Optional[int] = None):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.base_model = base_model
+        self.model_path = model_path
+
+        if prefix_cache_mb is None:
+            prefix_cache_mb = int(os.getenv("PREFIX_CACHE_MB", "256"))
+        self.prefix_cache = PrefixKVCache(prefix_cache_mb * 1024 * 1024)
+
+        # Decoder-only models must be padded on the left to batch generation
+        self.tokenizer.padding_side = "left"
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+        self.model.config.pad_token_id = self.tokenizer.pad_token_id
+        self.model.eval()
+
+        self._lock = threading.Lock()
+        self.model_version = model_fingerprint(base_model, model_path)
+
+        self.draft_model = None
+        self.draft_model_name = None
+        # Forward passes per model, counted by hooks; only read while self._lock is held
+        self._forward_calls = Counter()
+        self._speculative_stats = {"requests": 0, "target_passes": 0, "draft_tokens_proposed": 0,
+                                   "tokens_generated": 0}
+        self._stats_lock = threading.Lock()
+
+    @classmethod
+    def load(cls,
+             model_path: Optional[str] = None,
+             base_model: Optional[str] = None,
+             merged_path: Optional[str] = None,
+             quantize: Optional[bool] = None) -> "LocalGenerator":
+        """
+        Load the fine-tuned generator. A merged checkpoint (scripts/merge_lora.py)
+        is preferred when present; otherwise the base model is loaded and the
+        LoRA adapter from model_path is attached at runtime.
+        """
+        if not GENERATION_AVAILABLE:
+            raise ImportError("torch, transformers and peft are required for local generation")
+
+        merged_path = merged_path or os.getenv("MERGED_MODEL_PATH", DEFAULT_MERGED_MODEL_PATH)
+        if quantize is None:
+            quantize = os.getenv("GENERATOR_QUANTIZE", "none").lower() == "int8"
+
+        if os.path.exists(os.path.join(merged_path, "config.json")):
+            generator = cls.load_merged(merged_path, quantize=quantize)
+        else:
+            generator = cls.load_adapter(model_path, base_model)
+
+        draft_model = os.getenv("DRAFT_MODEL")
+        if draft_model:
+            try:
+                generator.load_draft(draft_model)
+            except Exception as e:
+                print(f"⚠️ Draft model {draft_model} not loaded, speculative decoding disabled: {e}")
+        return generator
+
+    @classmethod
+    def load_merged(cls, merged_path: str, quantize: bool = False) -> "LocalGenerator":
+        """Load a merged safetensors checkpoint; no PEFT wrapper on the forward pass"""
+        print(f"🔄 Loading merged model from {merged_path}...")
+
+        tokenizer = AutoTokenizer.from_pretrained(merged_path)
+        # safetensors are memory-mapped, and low_cpu_mem_usage skips the random init pass
+        model = AutoModelForCausalLM.from_pretrained(
+            merged_path,
+            torch_dtype=torch.float32,
+            low_cpu_mem_usage=True,
+            use_safetensors=True
+        )
+
+        if quantize and not torch.cuda.is_available():
+            model = quantize_for_cpu(model)
+            print("✅ Applied dynamic int8 quantization for CPU inference")
+        elif torch.cuda.is_available():
+            model = model.half().to("cuda")
+
+        print("✅ Merged fine-tuned model loaded successfully!")
+        return cls(model, tokenizer, base_model=cls._merged_base_model(merged_path), model_path=merged_path)
+
+    @classmethod
+    def load_adapter(cls, model_path: Optional[str] = None, base_model: Optional[str] = None) -> "LocalGenerator":
+        """Load the base model and attach the LoRA adapter from model_path"""
+        model_path = model_path or os.getenv("FINE_TUNED_MODEL_PATH", DEFAULT_MODEL_PATH)
+        # This should match what was used in training
+        base_model = base_model or os.getenv("BASE_MODEL", DEFAULT_BASE_MODEL)
+
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"Fine-tuned model not found at {model_path}")
+
+        print(f"🔄 Loading fine-tuned model from {model_path}...")
+
+        # Load tokenizer and model
+        tokenizer = AutoTokenizer.from_pretrained(base_model)
+
+        # 8-bit weights need bitsandbytes on a CUDA device; on CPU load full precision
+        if torch.cuda.is_available():
+            model = AutoModelForCausalLM.from_pretrained(
+                base_model,
+                load_in_8bit=True,
+                device_map="auto",
+                torch_dtype=torch.float16
+            )
+        else:
+            model = AutoModelForCausalLM.from_pretrained(base_model, torch_dtype=torch.float32, low_cpu_mem_usage=True)
+
+        # Load the fine-tuned model
+        model = PeftModel.from_pretrained(model, model_path)
+
+        print("✅ Fine-tuned LoRA model loaded successfully!")
+        return cls(model, tokenizer, base_model=base_model, model_path=model_path)
+
+    def load_draft(self, draft_model: str, num_tokens: Optional[int] = None):
+        """
+        Attach a small draft model (e.g. microsoft/DialoGPT-small) for speculative
+        decoding: it proposes up to num_tokens tokens per round and the fine-tuned
+        model verifies them in a single forward pass. Decoding is greedy, so the
+        output is the same as without the draft. It must share the tokenizer.
+        """
+        if num_tokens is None:
+            num_tokens = int(os.getenv("SPECULATIVE_NUM_TOKENS", "5"))
+
+        print(f"🔄 Loading draft model {draft_model}...")
+        draft = AutoModelForCausalLM.from_pretrained(draft_model, torch_dtype=torch.float32, low_cpu_mem_usage=True)
+        if draft.config.vocab_size != self.model.config.vocab_size:
+            raise ValueError(f"draft vocabulary ({draft.config.vocab_size}) does not match "
+                             f"the generator's ({self.model.config.vocab_size})")
+        if self.device.type == "cuda":
+            draft = draft.half()
+        draft = draft.to(self.device).eval()
+        draft.generation_config.num_assistant_tokens = num_tokens
+        # Drafting stops early once the draft's own next-token probability falls below this
+        draft.generation_config.assistant_confidence_threshold = float(os.getenv("SPECULATIVE_MIN_CONFIDENCE", "0.4"))
+        draft.generation_config.pad_token_id = self.tokenizer.pad_token_id
+
+        # PEFT wrappers hand generate() to the underlying model, so that is where passes are counted
+        target = self.model.get_base_model() if hasattr(self.model, "get_base_model") else self.model
+        target.register_forward_hook(self._count_forward("target"))
+        draft.register_forward_hook(self._count_forward("draft"))
+
+        self.draft_model = draft
+        self.draft_model_name = draft_model
+        print(f"✅ Speculative decoding enabled ({num_tokens} draft tokens per round)")
+
+    def _count_forward(self, name: str):
+        def hook(module, inputs, outputs):
+            self._forward_calls[name] += 1
+        return hook
+
+    def _record_speculative(self, calls_before: Counter, new_tokens: int):
+        with self._stats_lock:
+            self._speculative_stats["requests"] += 1
+            self._speculative_stats["target_passes"] += self._forward_calls["target"] - calls_before["target"]
+            self._speculative_stats["draft_tokens_proposed"] += self._forward_calls["draft"] - calls_before["draft"]
+            self._speculative_stats["tokens_generated"] += new_tokens
+
+    def speculative_stats(self) -> Dict:
+        """
+        Draft acceptance over speculative requests. Each verification pass keeps the
+        accepted draft tokens plus one token of its own, so accepted = generated - passes.
+        """
+        with self._stats_lock:
+            stats = dict(self._speculative_stats)
+        accepted = min(max(stats["tokens_generated"] - stats["target_passes"], 0), stats["draft_tokens_proposed"])
+        stats["draft_model"] = self.draft_model_name
+        stats["draft_tokens_accepted"] = accepted
+        stats["acceptance_rate"] = (round(accepted / stats["draft_tokens_proposed"], 4)
+                                    if stats["draft_tokens_proposed"] else 0.0)
+        stats["tokens_per_target_pass"] = (round(stats["tokens_generated"] / stats["target_passes"], 2)
+                                           if stats["target_passes"] else 0.0)
+        return stats
+
+    @staticmethod
+    def _merged_base_model(merged_path: str) -> str:
+        # Written by scripts/merge_lora.py next to the weights
+        try:
+            with open(os.path.join(merged_path, MERGE_INFO_FILE), 'r', encoding='utf-8') as f:
+                return json.load(f).get("base_model", merged_path)
+        except (OSError, ValueError):
+            return merged_path
+
+    @property
+    def device(self):
+        return next(self.model.parameters()).device
+
+    @property
+    def context_window(self) -> int:
+        return getattr(self.model.config, "n_positions", None) or self.tokenizer.model_max_length
+
+    def info(self) -> Dict:
+        return {"base_model": self.base_model, "model_path": self.model_path,
+                "model_version": self.model_version, "context_window": self.context_window,
+                "draft_model": self.draft_model_name}
+
+    def generate(self, prompt: str, **params) -> str:
+        return self.generate_batch([prompt], **params)[0]["text"]
+
+    def generate_batch(self,
+                       prompts: List[str],
+                       max_new_tokens: int = 600,
+                       temperature: float = 0.2,
+                       top_p: float = 0.95,
+                       json_max_items: Union[None, int, Sequence[Optional[int]]] = None,
+                       prefix: Union[None, str, Sequence[Optional[str]]] = None,
+                       speculative: bool = False) -> List[Dict]:
+        """
+        Generate a continuation for every prompt in one padded batch.
+        json_max_items turns on structured stopping (see JsonStoppingCriteria), for
+        all prompts (an int) or per prompt (a sequence with None for free text).
+        prefix marks the static start of each prompt whose key/values may be cached
+        (one string for all prompts or one per prompt).
+        speculative decodes with the draft model, if one is loaded; assisted
+        generation verifies one sequence at a time, so the prompts then run in turn,
+        and without the cached prefixes (see _prepare_inputs).
+        Returns [{"text": new text only, "tokens": new tokens generated, "stop_reason"}],
+        where stop_reason is json_complete, max_items, invalid or None.
+        """
+        if json_max_items is not None and not isinstance(json_max_items, (list, tuple)):
+            json_max_items = [json_max_items] * len(prompts)
+
+        speculative = speculative and self.draft_model is not None
+        if speculative and len(prompts) > 1:
+            limits = json_max_items or [None] * len(prompts)
+            prefixes = [prefix] * len(prompts) if prefix is None or isinstance(prefix, str) else prefix
+            return [self.generate_batch([prompt], max_new_tokens, temperature, top_p,
+                                        json_max_items=[limit], prefix=[row_prefix], speculative=True)[0]
+                    for prompt, limit, row_prefix in zip(prompts, limits, prefixes)]
+
+        with self._lock, torch.no_grad():
+            inputs, max_new_tokens = self._prepare_inputs(prompts, max_new_tokens, prefix, speculative)
+            prompt_length = inputs["input_ids"].shape[1]
+
+            criteria = None
+            if json_max_items is not None and any(limit is not None for limit in json_max_items):
+                criteria = JsonStoppingCriteria(self.tokenizer, prompt_length, json_max_items)
+
+            calls_before = Counter(self._forward_calls)
+            outputs = self.model.generate(
+                **inputs,
+                max_new_tokens=max_new_tokens,
+                temperature=temperature,
+                top_p=top_p,
+                num_return_sequences=1,
+                pad_token_id=self.tokenizer.pad_token_id,
+                stopping_criteria=StoppingCriteriaList([criteria]) if criteria else None,
+                assistant_model=self.draft_model if speculative else None
+            )
+            if speculative:
+                self._record_speculative(calls_before, outputs.shape[1] - prompt_length)
+
+        results = []
+        for index, row in enumerate(outputs[:, prompt_length:]):
+            if speculative and criteria and criteria.stop_reason(index):
+                # Verification rounds add several tokens at once; cut back to where the JSON stopped
+                row = criteria.trim(index, row)
+            # Finished sequences are padded with pad (= eos) tokens up to the longest one
+            tokens = int((row != self.tokenizer.pad_token_id).sum())
+            results.append({
+                "text": self.tokenizer.decode(row, skip_special_tokens=True),
+                "tokens": tokens,
+                "stop_reason": criteria.stop_reason(index) if criteria else None
+            })
+        return results
+
+    def stream(self,
+               prompt: str,
+               max_new_tokens: int = 600,
+               temperature: float = 0.2,
+               top_p: float = 0.95,
+               prefix: Optional[str] = None,
+               speculative: bool = False) -> Iterator[str]:
+        """
+        Yield the continuation of one prompt as text chunks while it is decoded.
+        generate() runs in a worker thread and pushes words through a TextIteratorStreamer.
+        """
+        streamer = TextIteratorStreamer(self.tokenizer, skip_prompt=True, skip_special_tokens=True)
+        speculative = speculative and self.draft_model is not None
+        errors = []
+
+        def run():
+            try:
+                with self._lock, torch.no_grad():
+                    inputs, new_tokens = self._prepare_inputs([prompt], max_new_tokens, prefix, speculative)
+                    calls_before = Counter(self._forward_calls)
+                    outputs = self.model.generate(
+                        **inputs,
+                        max_new_tokens=new_tokens,
+                        temperature=temperature,
+                        top_p=top_p,
+                        pad_token_id=self.tokenizer.pad_token_id,
+                        streamer=streamer,
+                        assistant_model=self.draft_model if speculative else None
+                    )
+                    if speculative:
+                        self._record_speculative(calls_before, outputs.shape[1] - inputs["input_ids"].shape[1])
+            except Exception as e:
+                errors.append(e)
+                # Unblock the consumer; otherwise it waits on the streamer forever
+                streamer.end()
+
+        worker = threading.Thread(target=run, name="generator-stream", daemon=True)
+        worker.start()
+        for text in streamer:
+            if text:
+                yield text
+        worker.join()
+        if errors:
+            raise errors[0]
+
+    def _prepare_inputs(self, prompts: List[str], max_new_tokens: int,
+                        prefixes: Union[None, str, Sequence[Optional[str]]] = None,
+                        speculative: bool = False) -> tuple:
+        """Model inputs for generate() and the clamped max_new_tokens; call with self._lock held"""
+        if isinstance(prefixes, str):
+            prefixes = [prefixes] * len(prompts)
+        if speculative and prefixes is not None and any(prefixes):
+            # Assisted generation does not continue correctly from a prefilled cache
+            # (greedy outputs diverge from plain decoding), so the full prompt is prefilled
+            self.prefix_cache.record(speculative_bypasses=1)
+            prefixes = None
+        if prefixes is not None and any(prefixes):
+            inputs = self._inputs_with_cached_prefixes(prompts, prefixes)
+        else:
+            inputs = dict(self.tokenizer(prompts, return_tensors="pt", padding=True).to(self.device))
+        prompt_length = inputs["input_ids"].shape[1]
+
+        # Never run past the position embeddings; shorten the completion instead
+        max_new_tokens = min(max_new_tokens, self.context_window - prompt_length)
+        if max_new_tokens <= 0:
+            raise ValueError(f"Prompt of {prompt_length} tokens exceeds the {self.context_window}-token context window")
+        return inputs, max_new_tokens
+
+    def _inputs_with_cached_prefixes(self, prompts: List[str], prefixes: Sequence[Optional[str]]) -> Dict:
+        """
+        Left-padded inputs plus a past_key_values cache covering the leading columns
+        that are cached prefix tokens (or padding) in every row; generate() then only
+        prefills the remaining columns.
+        """
+        rows = [self.tokenizer.encode(prompt) for prompt in prompts]
+        entries = []
+        for ids, prompt, prefix in zip(rows, prompts, prefixes):
+            entry = None
+            if prefix and prompt.startswith(prefix):
+                entry = self._prefix_entry(prefix)
+                # Reuse is only exact if the prompt tokenizes the same way across the boundary
+                if ids[:len(entry["ids"])] != entry["ids"]:
+                    self.prefix_cache.record(boundary_mismatches=1)
+                    entry = None
+            entries.append(entry)
+
+        width = max(len(ids) for ids in rows)
+        pads = [width - len(ids) for ids in rows]
+        pad_id = self.tokenizer.pad_token_id
+        inputs = {
+            "input_ids": torch.tensor([[pad_id] * pad + ids for pad, ids in zip(pads, rows)], device=self.device),
+            "attention_mask": torch.tensor([[0] * pad + [1] * len(ids) for pad, ids in zip(pads, rows)],
+                                           device=self.device)
+        }
+
+        # At least the last prompt token must go through the model to produce logits
+        shared = min(min(pad + (len(entry["ids"]) if entry else 0) for pad, entry in zip(pads, entries)), width - 1)
+        reference = next((entry for entry in entries if entry), None)
+        self.prefix_cache.record(prompt_tokens=sum(len(ids) for ids in rows))
+        if reference is None or shared <= 0:
+            return inputs
+
+        cache = DynamicCache()
+        used = 0
+        for layer, (reference_keys, _) in enumerate(reference["layers"]):
+            keys, values = [], []
+            for pad, entry in zip(pads, entries):
+                cached = max(0, min(shared - pad, len(entry["ids"]) if entry else 0))
+                # Padding columns are masked out, so zeros stand in for their key/values
+                blank = reference_keys.new_zeros(1, reference_keys.shape[1], shared - cached, reference_keys.shape[3])
+                if cached:
+                    layer_keys, layer_values = entry["layers"][layer]
+                    keys.append(torch.cat([blank, layer_keys[:, :, :cached]], dim=2))
+                    values.append(torch.cat([blank, layer_values[:, :, :cached]], dim=2))
+                else:
+                    keys.append(blank)
+                    values.append(blank)
+                if layer == 0:
+                    used += cached
+            cache.update(torch.cat(keys), torch.cat(values), layer)
+
+        self.prefix_cache.record(cached_tokens_used=used)
+        inputs["past_key_values"] = cache
+        return inputs
+
+    def _prefix_entry(self, prefix: str) -> Dict:
+        key = PrefixKVCache.key(prefix)
+        entry = self.prefix_cache.get(key)
+        if entry is None:
+            ids = self.tokenizer.encode(prefix)
+            outputs = self.model(torch.tensor([ids], device=self.device), use_cache=True)
+            past = outputs.past_key_values
+            if hasattr(past, "layers"):
+                layers = [(layer.keys, layer.values) for layer in past.layers]
+            else:
+                layers = [(keys, values) for keys, values in past]
+            entry = self.prefix_cache.put(key, ids, layers)
+        return entry
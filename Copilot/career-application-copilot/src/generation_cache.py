@@ -0,0 +1,190 @@
+"""
+Generation Cache: Content-addressed cache of generated application packages
+Packages are keyed by a canonical hash of the strategy fields that feed the
+prompts, the profile version, the model version and how the executor turns
+them into output (the rendered prompts, generation params and a version for
+its parsing), so a page refresh or a repeated click returns the earlier
+bullets and cover letter instead of running generation again, while a template
+or budget change does not. Hot entries live in an in-memory LRU; every entry is
+also written to a disk tier that survives restarts.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+def prompt_inputs(strategy: Dict) -> Dict:
+    """
+    The parts of a strategy that the bullet and cover letter prompts (and their
+    fallbacks) read. Match scores, timings and dedup info are deliberately left out.
+    """
+    jd_analysis = strategy.get("jd_analysis", {})
+    return {
+        "title": jd_analysis.get("title"),
+        "company": jd_analysis.get("company"),
+        "skills": list(jd_analysis.get("skills", [])),
+        "matching_skills": list(strategy.get("matching_skills", [])),
+        "projects": [
+            [p.get("project", {}).get("title"), p.get("project", {}).get("description")]
+            for p in strategy.get("suggested_projects", [])[:3]
+        ],
+        "focus": list(strategy.get("recommended_focus", []))
+    }
+
+
+def package_key(strategy: Dict, profile_version: str, model_version: str,
+                generation: Optional[Dict] = None) -> str:
+    """
+    generation: whatever else shapes the output for these inputs, e.g.
+    {"version", "prompts" (as rendered), "params"}; part of the key as given
+    """
+    canonical = json.dumps(
+        {"inputs": prompt_inputs(strategy), "profile": profile_version, "model": model_version,
+         "generation": generation},
+        sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class GenerationCache:
+    """
+    max_entries:      packages kept in memory (least recently used evicted first)
+    cache_dir:        disk tier, one JSON file per package; None keeps it memory-only
+    max_disk_entries: files kept on disk; the oldest are pruned past this
+    """
+
+    def __init__(self,
+                 max_entries: int = 256,
+                 cache_dir: Optional[str] = None,
+                 max_disk_entries: int = 10000):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.max_disk_entries = max_disk_entries
+
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_writes_since_prune = 0
+        self._stats = {"lookups": 0, "memory_hits": 0, "disk_hits": 0, "misses": 0, "bypassed": 0,
+                       "stores": 0, "evictions": 0, "disk_errors": 0}
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Cached package fields for key, checking memory first and then disk"""
+        with self._lock:
+            self._stats["lookups"] += 1
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return value
+
+        value = self._read_disk(key)
+        with self._lock:
+            if value is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["disk_hits"] += 1
+            self._remember_locked(key, value)
+        return value
+
+    def put(self, key: str, value: Dict):
+        with self._lock:
+            self._stats["stores"] += 1
+            self._remember_locked(key, value)
+        self._write_disk(key, value)
+
+    def record_bypass(self):
+        with self._lock:
+            self._stats["bypassed"] += 1
+
+    def clear(self):
+        """Drop the memory tier (the disk tier is left for other processes)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._entries)
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        stats["hit_rate"] = round(hits / stats["lookups"], 4) if stats["lookups"] else 0.0
+        stats["disk_tier"] = self.cache_dir or "disabled"
+        return stats
+
+    def _remember_locked(self, key: str, value: Dict):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _path(self, key: str) -> str:
+        # Two-character fan-out keeps directories small
+        return os.path.join(self.cache_dir, key[:2], key + ".json")
+
+    def _read_disk(self, key: str) -> Optional[Dict]:
+        if not self.cache_dir:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+            # Touch on read so pruning drops the least recently used files
+            os.utime(path)
+            return value
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Unreadable generation cache entry {key[:12]}: {e}")
+            with self._lock:
+                self._stats["disk_errors"] += 1
+            return None
+
+    def _write_disk(self, key: str, value: Dict):
+        if not self.cache_dir:
+            return
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(value, f, ensure_ascii=False, default=str)
+            # Readers in other workers never see a half-written file
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"⚠️ Could not write generation cache entry {key[:12]}: {e}")
+            with self._lock:
+                self._stats["disk_errors"] += 1
+            return
+
+        with self._lock:
+            self._disk_writes_since_prune += 1
+            prune = self._disk_writes_since_prune >= max(self.max_disk_entries // 10, 1)
+            if prune:
+                self._disk_writes_since_prune = 0
+        if prune:
+            self._prune_disk()
+
+    def _prune_disk(self):
+        files = []
+        for root, _, names in os.walk(self.cache_dir):
+            for name in names:
+                if name.endswith(".json"):
+                    path = os.path.join(root, name)
+                    try:
+                        files.append((os.path.getmtime(path), path))
+                    except OSError:
+                        continue
+        if len(files) <= self.max_disk_entries:
+            return
+        files.sort()
+        for _, path in files[:len(files) - self.max_disk_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,217 @@
+"""
+Interaction Logger: Buffered, asynchronous JSONL sink for agent interaction logs
+Records are queued in the request path and written in batches by a background
+thread to size-rotated (optionally gzip-compressed) JSONL segments.
+"""
+import atexit
+import gzip
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+
+class InteractionLogger:
+    """
+    Shared logging sink for planner/executor interaction records.
+
+    `log()` never blocks: when the queue is full the record is dropped and
+    counted, so a slow disk can't stall request handling.
+
+    max_segment_bytes caps the size of a segment on disk. Compressed segments
+    rotate once they reach it, so they can run over by one batch.
+    """
+
+    def __init__(self,
+                 log_dir: str = "logs",
+                 max_segment_bytes: int = 16 * 1024 * 1024,
+                 compress: bool = False,
+                 batch_size: int = 256,
+                 flush_interval: float = 0.5,
+                 max_queue: int = 10000,
+                 enabled: bool = True):
+        self.log_dir = log_dir
+        self.max_segment_bytes = max_segment_bytes
+        self.compress = compress
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enabled = enabled
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._segments: Dict[str, Dict] = {}
+        self._stats = {"enqueued": 0, "written": 0, "dropped": 0, "write_errors": 0,
+                       "batches": 0, "bytes_written": 0, "segments_opened": 0}
+        # Callers' threads and the writer thread both update the counters
+        self._stats_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        atexit.register(self.close)
+
+    def log(self, record: Dict, stream: str = "interactions") -> bool:
+        """Queue one record for the given stream; returns False if it was dropped"""
+        if not self.enabled:
+            return False
+
+        # Serialized now, since callers keep using (and mutating) the dicts they log
+        try:
+            line = json.dumps(record, default=str)
+        except (TypeError, ValueError) as e:
+            with self._stats_lock:
+                self._stats["write_errors"] += 1
+            print(f"Failed to log interaction: {e}")
+            return False
+
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((stream, line))
+            with self._stats_lock:
+                self._stats["enqueued"] += 1
+            return True
+        except queue.Full:
+            with self._stats_lock:
+                self._stats["dropped"] += 1
+            return False
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until every queued record has been written (or timeout)"""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() > deadline or not (self._thread and self._thread.is_alive()):
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self):
+        """Flush pending records, stop the writer thread and close open segments"""
+        if self._thread and self._thread.is_alive():
+            self.flush()
+            self._stop.set()
+            self._thread.join(timeout=2.0)
+        for segment in self._segments.values():
+            try:
+                self._close_segment(segment)
+            except Exception:
+                pass
+        self._segments.clear()
+
+    def stats(self) -> Dict:
+        """Queue depth, throughput and drop counters for monitoring"""
+        with self._stats_lock:
+            counters = dict(self._stats)
+        return {
+            **counters,
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "open_segments": {stream: seg["path"] for stream, seg in self._segments.items()},
+            "writer_alive": bool(self._thread and self._thread.is_alive())
+        }
+
+    def _ensure_started(self):
+        if self._thread and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="interaction-logger", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set() or not self._queue.empty():
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            batch = [first]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                with self._stats_lock:
+                    self._stats["write_errors"] += len(batch)
+                print(f"Failed to log interaction: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write_batch(self, batch):
+        by_stream: Dict[str, list] = {}
+        for stream, line in batch:
+            by_stream.setdefault(stream, []).append(line)
+
+        for stream, lines in by_stream.items():
+            payload = ("\n".join(lines) + "\n").encode("utf-8")
+            # A compressed batch's size on disk is only known once it's written
+            segment = self._segment_for(stream, 0 if self.compress else len(payload))
+            segment["file"].write(payload)
+            segment["file"].flush()
+            written = segment["raw"].tell() - segment["bytes"]
+            segment["bytes"] += written
+            with self._stats_lock:
+                self._stats["written"] += len(lines)
+                self._stats["bytes_written"] += written
+        with self._stats_lock:
+            self._stats["batches"] += 1
+
+    def _segment_for(self, stream: str, incoming: int) -> Dict:
+        """Open segment for stream, rotated if `incoming` more bytes would take it past the cap"""
+        segment = self._segments.get(stream)
+        if segment and segment["bytes"] < self.max_segment_bytes and segment["bytes"] + incoming <= self.max_segment_bytes:
+            return segment
+        if segment:
+            self._close_segment(segment)
+
+        os.makedirs(self.log_dir, exist_ok=True)
+        suffix = ".jsonl.gz" if self.compress else ".jsonl"
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        sequence = 0
+        while True:
+            path = os.path.join(self.log_dir, f"{stream}_{stamp}_{sequence:03d}{suffix}")
+            if not os.path.exists(path):
+                break
+            sequence += 1
+
+        # Sizes are taken from the raw file's position, i.e. bytes on disk
+        raw = open(path, 'ab')
+        handle = gzip.GzipFile(fileobj=raw, mode='ab') if self.compress else raw
+        segment = {"file": handle, "raw": raw, "path": path, "bytes": raw.tell()}
+        self._segments[stream] = segment
+        with self._stats_lock:
+            self._stats["segments_opened"] += 1
+        return segment
+
+    @staticmethod
+    def _close_segment(segment: Dict):
+        # GzipFile.close() writes the trailer but leaves the underlying file open
+        segment["file"].close()
+        segment["raw"].close()
+
+
+_default_logger: Optional[InteractionLogger] = None
+_default_lock = threading.Lock()
+
+
+def get_interaction_logger() -> InteractionLogger:
+    """Process-wide logger configured from the environment"""
+    global _default_logger
+    if _default_logger is None:
+        with _default_lock:
+            if _default_logger is None:
+                _default_logger = InteractionLogger(
+                    log_dir=os.getenv("INTERACTION_LOG_DIR", "logs"),
+                    max_segment_bytes=int(float(os.getenv("INTERACTION_LOG_SEGMENT_MB", "16")) * 1024 * 1024),
+                    compress=os.getenv("INTERACTION_LOG_COMPRESS", "false").lower() == "true",
+                    enabled=os.getenv("SAVE_INTERACTION_LOGS", "true").lower() != "false"
+                )
+    return _default_logger
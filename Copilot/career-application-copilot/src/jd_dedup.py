@@ -0,0 +1,215 @@
+"""
+JD Deduplicator: MinHash + LSH near-duplicate detection for job postings
+The same job is reposted across boards with trivial edits; mapping those copies
+to one canonical posting lets the planner reuse a cached analysis instead of
+paying for another LLM call.
+"""
+import copy
+import hashlib
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from jd_parser import parse_header
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+
+
+def optimal_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    Pick (bands, rows) with bands * rows <= num_perm whose LSH S-curve
+    threshold (1/b)^(1/r) is closest to the requested Jaccard threshold.
+    """
+    best, best_error = (num_perm, 1), float("inf")
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if bands == 0:
+            break
+        error = abs((1.0 / bands) ** (1.0 / rows) - threshold)
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+class JDDeduplicator:
+    """
+    MinHash signatures over word shingles, bucketed with banded LSH.
+
+    threshold:    estimated Jaccard similarity at which two postings count as duplicates
+    num_perm:     signature length (accuracy vs. speed)
+    shingle_size: words per shingle
+    max_entries:  canonical postings remembered (oldest evicted first)
+    """
+
+    def __init__(self,
+                 threshold: float = 0.8,
+                 num_perm: int = 128,
+                 shingle_size: int = 3,
+                 bands: Optional[int] = None,
+                 max_entries: int = 10000,
+                 seed: int = 1):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.max_entries = max_entries
+
+        if bands is None:
+            self.bands, self.rows = optimal_bands(threshold, num_perm)
+        else:
+            self.bands, self.rows = bands, num_perm // bands
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 31, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, 1 << 31, size=num_perm).astype(np.uint64)
+
+        self._signatures: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._buckets: List[Dict[bytes, set]] = [dict() for _ in range(self.bands)]
+        self._lock = threading.Lock()
+
+    def signature(self, text: str) -> np.ndarray:
+        words = _WORD_RE.findall(text.lower())
+        if len(words) < self.shingle_size:
+            shingles = {" ".join(words)}
+        else:
+            shingles = {" ".join(words[i:i + self.shingle_size]) for i in range(len(words) - self.shingle_size + 1)}
+
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0)
+
+    def query(self, text: str = None, signature: Optional[np.ndarray] = None) -> Optional[Tuple[str, float]]:
+        """Best canonical match above the threshold as (key, estimated_jaccard), or None"""
+        if signature is None:
+            signature = self.signature(text)
+
+        candidates = set()
+        for band, bucket in enumerate(self._buckets):
+            members = bucket.get(self._band_key(signature, band))
+            if members:
+                candidates.update(members)
+
+        best = None
+        for key in candidates:
+            stored = self._signatures.get(key)
+            if stored is None:
+                continue
+            similarity = float(np.mean(stored == signature))
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (key, similarity)
+        return best
+
+    def add(self, key: str, text: str = None, signature: Optional[np.ndarray] = None):
+        """Register a canonical posting"""
+        if signature is None:
+            signature = self.signature(text)
+
+        with self._lock:
+            if key in self._signatures:
+                self._signatures.move_to_end(key)
+                return
+            self._signatures[key] = signature
+            for band in range(self.bands):
+                self._buckets[band].setdefault(self._band_key(signature, band), set()).add(key)
+
+            while len(self._signatures) > self.max_entries:
+                self._remove_locked(next(iter(self._signatures)))
+
+    def remove(self, key: str):
+        with self._lock:
+            self._remove_locked(key)
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    @staticmethod
+    def content_key(text: str) -> str:
+        """Stable key for a posting, insensitive to case and whitespace"""
+        normalized = " ".join(text.lower().split())
+        return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+
+    def _band_key(self, signature: np.ndarray, band: int) -> bytes:
+        return signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def _remove_locked(self, key: str):
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for band in range(self.bands):
+            band_key = self._band_key(signature, band)
+            members = self._buckets[band].get(band_key)
+            if members:
+                members.discard(key)
+                if not members:
+                    del self._buckets[band][band_key]
+
+
+class DedupAnalysisCache:
+    """
+    Front of the planner: maps near-duplicate JDs to one canonical cached analysis
+    and keeps the dedup rate and the analysis time it saved.
+    """
+
+    def __init__(self, deduplicator: Optional[JDDeduplicator] = None):
+        self.deduplicator = deduplicator or JDDeduplicator()
+        self._analyses: "OrderedDict[str, Dict]" = OrderedDict()
+        self._stats = {"lookups": 0, "duplicates": 0, "analysis_seconds": 0.0,
+                       "analyses_computed": 0, "seconds_saved": 0.0}
+
+    def lookup(self, jd_text: str, count: bool = True) -> Tuple[Optional[Dict], Dict]:
+        """
+        Return (cached_analysis_or_None, dedup_info). dedup_info carries the
+        signature and key so a miss can be stored without re-hashing.
+        count=False leaves the dedup stats alone (lookups that are not analyses).
+        """
+        if count:
+            self._stats["lookups"] += 1
+        signature = self.deduplicator.signature(jd_text)
+        info = {"key": JDDeduplicator.content_key(jd_text), "signature": signature}
+
+        match = self.deduplicator.query(signature=signature)
+        if match and match[0] in self._analyses:
+            key, similarity = match
+            if count:
+                self._stats["duplicates"] += 1
+                self._stats["seconds_saved"] += self._average_analysis_seconds()
+            info.update({"duplicate_of": key, "similarity": round(similarity, 3)})
+            # Callers add fields to the analysis they get back; keep the cached one untouched
+            analysis = copy.deepcopy(self._analyses[key])
+            # The same posting text is often reused by another employer or for another
+            # location, so who and where always come from this posting's own header
+            analysis.update(parse_header(jd_text))
+            return analysis, info
+        return None, info
+
+    def store(self, info: Dict, jd_analysis: Dict, analysis_seconds: float):
+        key = info["key"]
+        self._analyses[key] = copy.deepcopy(jd_analysis)
+        self.deduplicator.add(key, signature=info["signature"])
+        self._stats["analyses_computed"] += 1
+        self._stats["analysis_seconds"] += analysis_seconds
+
+        # Evict alongside the LSH index (both drop their oldest postings first)
+        while len(self._analyses) > self.deduplicator.max_entries:
+            self._analyses.popitem(last=False)
+
+    def stats(self) -> Dict:
+        lookups = self._stats["lookups"]
+        return {
+            **self._stats,
+            "dedup_rate": round(self._stats["duplicates"] / lookups, 4) if lookups else 0.0,
+            "canonical_postings": len(self.deduplicator),
+            "threshold": self.deduplicator.threshold,
+            "num_perm": self.deduplicator.num_perm,
+            "bands": self.deduplicator.bands,
+            "rows": self.deduplicator.rows
+        }
+
+    def _average_analysis_seconds(self) -> float:
+        computed = self._stats["analyses_computed"]
+        return self._stats["analysis_seconds"] / computed if computed else 0.0
@@ -0,0 +1,210 @@
+"""
+Job Feed Ranker: Score one or more profiles against a large stream of job descriptions
+JDs are read lazily, parsed by the regex tier in a process pool, scored in
+vectorized batches and kept in a bounded top-K heap per profile, so memory
+stays flat no matter how large the feed is.
+"""
+import heapq
+import itertools
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from jd_parser import parse_job_description
+from skill_index import SKILL_ALIASES, canonical_skill_id
+
+JD_TEXT_FIELDS = ("text", "job_description", "description", "jd")
+JD_FILE_EXTENSIONS = (".txt", ".md")
+
+
+def iter_job_descriptions(source: str) -> Iterator[Dict]:
+    """
+    Yield {"id", "text", ...} records from a JSONL file or a directory of .txt/.md files.
+    JSONL lines may carry any of the JD_TEXT_FIELDS plus extra metadata (id, url, company).
+    """
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            if name.endswith(JD_FILE_EXTENSIONS):
+                with open(os.path.join(source, name), 'r', encoding='utf-8') as f:
+                    yield {"id": name, "text": f.read()}
+        return
+
+    with open(source, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            text = next((record[field] for field in JD_TEXT_FIELDS if record.get(field)), None)
+            if not text:
+                continue
+            yield {**{k: v for k, v in record.items() if k not in JD_TEXT_FIELDS},
+                   "id": record.get("id", line_number), "text": text}
+
+
+def _chunked(iterable: Iterable, size: int) -> Iterator[List]:
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _analyze_chunk(records: List[Dict]) -> List[Dict]:
+    """Worker: regex-parse JDs and reduce them to canonical skill IDs (drops the raw text)"""
+    analyzed = []
+    for record in records:
+        analysis = parse_job_description(record["text"])
+        skill_ids = sorted({canonical_skill_id(skill) for skill in analysis["skills"]})
+        analyzed.append({
+            **{k: v for k, v in record.items() if k != "text"},
+            "title": analysis["title"],
+            "seniority": analysis["seniority"],
+            "job_type": analysis["job_type"],
+            "skills": analysis["skills"],
+            "skill_ids": skill_ids
+        })
+    return analyzed
+
+
+class JobFeedRanker:
+    """
+    Ranks a JD stream against several profiles at once.
+
+    profiles: {profile_name: [skill, ...]}
+    """
+
+    def __init__(self,
+                 profiles: Dict[str, List[str]],
+                 top_k: int = 50,
+                 batch_size: int = 2048,
+                 chunk_size: int = 256,
+                 workers: Optional[int] = None):
+        self.profile_names = list(profiles)
+        self.top_k = top_k
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+
+        # Only skills some profile has can contribute to a score, so the
+        # vocabulary is the union of profile skills (plus known aliases)
+        vocabulary = set(SKILL_ALIASES)
+        self.profile_skill_ids = {}
+        for name, skills in profiles.items():
+            ids = {canonical_skill_id(skill) for skill in skills}
+            self.profile_skill_ids[name] = ids
+            vocabulary |= ids
+        self.vocabulary = {skill_id: column for column, skill_id in enumerate(sorted(vocabulary))}
+
+        self.profile_matrix = np.zeros((len(self.profile_names), len(self.vocabulary)), dtype=np.float32)
+        for row, name in enumerate(self.profile_names):
+            for skill_id in self.profile_skill_ids[name]:
+                self.profile_matrix[row, self.vocabulary[skill_id]] = 1.0
+
+    def rank(self, source, limit: Optional[int] = None) -> Dict:
+        """
+        Rank every JD from `source` (path or iterable of records).
+        Returns {"rankings": {profile: [...]}, "stats": {...}}.
+        """
+        records = iter_job_descriptions(source) if isinstance(source, str) else iter(source)
+        if limit is not None:
+            records = itertools.islice(records, limit)
+
+        heaps: Dict[str, list] = {name: [] for name in self.profile_names}
+        counter = itertools.count()
+        processed = 0
+        start = time.perf_counter()
+
+        pending_batch: List[Dict] = []
+        for analyzed_chunk in self._analyzed_chunks(records):
+            pending_batch.extend(analyzed_chunk)
+            if len(pending_batch) >= self.batch_size:
+                self._score_batch(pending_batch, heaps, counter)
+                processed += len(pending_batch)
+                pending_batch = []
+        if pending_batch:
+            self._score_batch(pending_batch, heaps, counter)
+            processed += len(pending_batch)
+
+        elapsed = time.perf_counter() - start
+        rankings = {
+            name: [entry for _, _, entry in sorted(heap, key=lambda item: (-item[0], item[1]))]
+            for name, heap in heaps.items()
+        }
+        return {
+            "rankings": rankings,
+            "stats": {
+                "jds_processed": processed,
+                "elapsed_seconds": round(elapsed, 3),
+                "jds_per_second": round(processed / elapsed, 1) if elapsed > 0 else None,
+                "workers": self.workers,
+                "top_k": self.top_k
+            }
+        }
+
+    def _analyzed_chunks(self, records: Iterator[Dict]) -> Iterator[List[Dict]]:
+        chunks = _chunked(records, self.chunk_size)
+
+        if self.workers <= 1:
+            for chunk in chunks:
+                yield _analyze_chunk(chunk)
+            return
+
+        # Keep a bounded number of chunks in flight so the feed is never materialized
+        max_in_flight = self.workers * 2
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            in_flight = set()
+            for chunk in chunks:
+                in_flight.add(pool.submit(_analyze_chunk, chunk))
+                if len(in_flight) >= max_in_flight:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            for future in in_flight:
+                yield future.result()
+
+    def _score_batch(self, batch: List[Dict], heaps: Dict[str, list], counter):
+        jd_matrix = np.zeros((len(batch), len(self.vocabulary)), dtype=np.float32)
+        required_counts = np.zeros(len(batch), dtype=np.float32)
+        for row, record in enumerate(batch):
+            required_counts[row] = len(record["skill_ids"])
+            for skill_id in record["skill_ids"]:
+                column = self.vocabulary.get(skill_id)
+                if column is not None:
+                    jd_matrix[row, column] = 1.0
+
+        matched = jd_matrix @ self.profile_matrix.T
+        scores = np.divide(matched, required_counts[:, None],
+                           out=np.zeros_like(matched), where=required_counts[:, None] > 0)
+
+        candidates = min(self.top_k, len(batch))
+        for column, name in enumerate(self.profile_names):
+            profile_scores = scores[:, column]
+            if candidates < len(batch):
+                top_rows = np.argpartition(-profile_scores, candidates - 1)[:candidates]
+            else:
+                top_rows = np.arange(len(batch))
+
+            heap = heaps[name]
+            for row in top_rows.tolist():
+                score = float(profile_scores[row])
+                if len(heap) >= self.top_k and score <= heap[0][0]:
+                    continue
+                profile_ids = self.profile_skill_ids[name]
+                entry = {
+                    **batch[row],
+                    "match_score": round(score, 4),
+                    "matching_skill_ids": [s for s in batch[row]["skill_ids"] if s in profile_ids]
+                }
+                item = (score, next(counter), entry)
+                if len(heap) < self.top_k:
+                    heapq.heappush(heap, item)
+                else:
+                    heapq.heapreplace(heap, item)
@@ -0,0 +1,243 @@
+"""
+Job Index: Persistent FAISS vector index of analyzed job descriptions
+Lets the planner answer "which past postings look like this one?" together with
+their cached analyses and application outcomes.
+"""
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+    print("Warning: faiss not available. Install with: pip install faiss-cpu")
+
+
+class JobIndex:
+    """
+    HNSW inner-product index over unit-norm MiniLM embeddings, wrapped in an
+    ID map so vector IDs line up with the JSONL metadata sidecar.
+
+    Layout of `index_dir`:
+        jobs.faiss      - FAISS index (written by save())
+        metadata.jsonl  - one record per added posting, plus outcome updates
+    """
+
+    INDEX_FILE = "jobs.faiss"
+    METADATA_FILE = "metadata.jsonl"
+    # Posting text embedded (and kept in the metadata, so lost vectors can be re-embedded)
+    DOCUMENT_CHARS = 2000
+
+    def __init__(self,
+                 index_dir: str = "data/job_index",
+                 embedding_model=None,
+                 dim: Optional[int] = None,
+                 hnsw_m: int = 32,
+                 ef_search: int = 64,
+                 autosave_every: int = 50):
+        if not FAISS_AVAILABLE:
+            raise ImportError("faiss is required for JobIndex")
+
+        self.index_dir = index_dir
+        self.embedding_model = embedding_model
+        self.autosave_every = autosave_every
+        self.read_only = False
+
+        if dim is None:
+            dim = embedding_model.get_sentence_embedding_dimension() if embedding_model is not None else 384
+        self.dim = dim
+        self.ef_search = ef_search
+
+        hnsw = faiss.IndexHNSWFlat(dim, hnsw_m, faiss.METRIC_INNER_PRODUCT)
+        hnsw.hnsw.efSearch = ef_search
+        self.index = faiss.IndexIDMap2(hnsw)
+
+        self.metadata: Dict[int, Dict] = {}
+        self._next_id = 0
+        self._unsaved = 0
+        self._lock = threading.RLock()
+
+    @classmethod
+    def load(cls, index_dir: str = "data/job_index", embedding_model=None, mmap: bool = False, **kwargs) -> "JobIndex":
+        """
+        Load a saved index, or return an empty one if none exists yet.
+        With mmap=True the vectors stay on disk and the index is read-only.
+        Postings whose metadata was appended after the last save (e.g. before a
+        crash) are re-embedded and added back.
+        """
+        job_index = cls(index_dir, embedding_model, **kwargs)
+        index_path = os.path.join(index_dir, cls.INDEX_FILE)
+
+        if os.path.exists(index_path):
+            flags = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY if mmap else 0
+            job_index.index = faiss.read_index(index_path, flags)
+            job_index.dim = job_index.index.d
+            job_index._set_ef_search(job_index.ef_search)
+            job_index.read_only = mmap
+
+        job_index._load_metadata()
+        job_index._restore_unsaved()
+        return job_index
+
+    def __len__(self) -> int:
+        return self.index.ntotal
+
+    def embed(self, jd_texts: List[str], jd_analyses: List[Dict]) -> np.ndarray:
+        """Embed posting text together with the planner's structured analysis"""
+        documents = [self._document_text(text, analysis) for text, analysis in zip(jd_texts, jd_analyses)]
+        vectors = np.asarray(self.embedding_model.encode(documents), dtype=np.float32)
+        faiss.normalize_L2(vectors)
+        return vectors
+
+    def add(self, jd_text: str, jd_analysis: Dict, outcome: Optional[str] = None,
+            vector: Optional[np.ndarray] = None) -> int:
+        """Add one analyzed posting; returns its job ID"""
+        vectors = None if vector is None else np.asarray(vector, dtype=np.float32).reshape(1, -1)
+        return self.add_batch([jd_text], [jd_analysis], [outcome], vectors)[0]
+
+    def add_batch(self, jd_texts: List[str], jd_analyses: List[Dict],
+                  outcomes: Optional[List[Optional[str]]] = None,
+                  vectors: Optional[np.ndarray] = None) -> List[int]:
+        """Incrementally add analyzed postings without rebuilding the index"""
+        if self.read_only:
+            raise RuntimeError("Index was loaded memory-mapped (read-only); load with mmap=False to add postings")
+
+        outcomes = outcomes or [None] * len(jd_texts)
+        if vectors is None:
+            vectors = self.embed(jd_texts, jd_analyses)
+        else:
+            vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+            faiss.normalize_L2(vectors)
+
+        with self._lock:
+            ids = np.arange(self._next_id, self._next_id + len(jd_texts), dtype=np.int64)
+            self.index.add_with_ids(vectors, ids)
+            self._next_id += len(jd_texts)
+
+            records = []
+            for job_id, text, analysis, outcome in zip(ids.tolist(), jd_texts, jd_analyses, outcomes):
+                record = {
+                    "id": job_id,
+                    "added_at": datetime.now().isoformat(),
+                    "jd_snippet": text[:self.DOCUMENT_CHARS],
+                    "jd_analysis": analysis,
+                    "outcome": outcome
+                }
+                self.metadata[job_id] = record
+                records.append(record)
+            self._append_metadata(records)
+
+            self._unsaved += len(records)
+            if self.autosave_every and self._unsaved >= self.autosave_every:
+                self.save()
+
+        return ids.tolist()
+
+    def search(self, jd_text: Optional[str] = None, k: int = 5, jd_analysis: Optional[Dict] = None,
+               vector: Optional[np.ndarray] = None) -> List[Dict]:
+        """Return the k most similar past postings with their cached analyses and outcomes"""
+        if len(self) == 0:
+            return []
+
+        if vector is None:
+            query = self.embed([jd_text or ""], [jd_analysis or {}])
+        else:
+            query = np.ascontiguousarray(np.asarray(vector, dtype=np.float32).reshape(1, -1))
+            faiss.normalize_L2(query)
+
+        with self._lock:
+            scores, ids = self.index.search(query, k)
+
+        results = []
+        for score, job_id in zip(scores[0].tolist(), ids[0].tolist()):
+            if job_id < 0:
+                continue
+            record = self.metadata.get(job_id, {"id": job_id})
+            results.append({**record, "similarity": round(score, 4)})
+        return results
+
+    def record_outcome(self, job_id: int, outcome: str) -> bool:
+        """Attach an application outcome (e.g. interview/offer/rejected) to a posting"""
+        with self._lock:
+            if job_id not in self.metadata:
+                return False
+            self.metadata[job_id]["outcome"] = outcome
+            self._append_metadata([{"id": job_id, "outcome": outcome, "updated_at": datetime.now().isoformat()}])
+        return True
+
+    def save(self):
+        """Write the FAISS index atomically; metadata is already appended incrementally"""
+        if self.read_only:
+            return
+        with self._lock:
+            os.makedirs(self.index_dir, exist_ok=True)
+            index_path = os.path.join(self.index_dir, self.INDEX_FILE)
+            tmp_path = index_path + ".tmp"
+            faiss.write_index(self.index, tmp_path)
+            os.replace(tmp_path, index_path)
+            self._unsaved = 0
+
+    def _document_text(self, jd_text: str, jd_analysis: Dict) -> str:
+        # MiniLM truncates long inputs, so the structured summary goes first
+        summary = "; ".join([
+            f"Title: {jd_analysis.get('title', '')}",
+            f"Skills: {', '.join(jd_analysis.get('skills', []))}",
+            f"Seniority: {jd_analysis.get('seniority', '')}",
+            f"Job type: {jd_analysis.get('job_type', '')}"
+        ])
+        return f"{summary}\n{jd_text[:self.DOCUMENT_CHARS]}"
+
+    def _set_ef_search(self, ef_search: int):
+        inner = faiss.downcast_index(self.index.index) if hasattr(self.index, "index") else self.index
+        if hasattr(inner, "hnsw"):
+            inner.hnsw.efSearch = ef_search
+
+    def _append_metadata(self, records: List[Dict]):
+        os.makedirs(self.index_dir, exist_ok=True)
+        with open(os.path.join(self.index_dir, self.METADATA_FILE), 'a', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, default=str) + "\n")
+
+    def _load_metadata(self):
+        path = os.path.join(self.index_dir, self.METADATA_FILE)
+        if not os.path.exists(path):
+            return
+
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                job_id = record["id"]
+                if "jd_analysis" in record:
+                    self.metadata[job_id] = record
+                elif job_id in self.metadata:
+                    self.metadata[job_id]["outcome"] = record.get("outcome")
+
+        if self.metadata:
+            self._next_id = max(self.metadata) + 1
+
+    def _restore_unsaved(self):
+        """Add back postings that are in the metadata but not in the saved index"""
+        indexed = set(faiss.vector_to_array(self.index.id_map).tolist()) if len(self) else set()
+        missing = [record for job_id, record in sorted(self.metadata.items()) if job_id not in indexed]
+        if not missing:
+            return
+        if self.read_only or self.embedding_model is None:
+            reason = "the index is read-only (mmap)" if self.read_only else "no embedding model was given"
+            print(f"Warning: {len(missing)} postings are missing from {self.INDEX_FILE} "
+                  f"and cannot be re-embedded because {reason}")
+            return
+
+        vectors = self.embed([record["jd_snippet"] for record in missing],
+                             [record["jd_analysis"] for record in missing])
+        with self._lock:
+            self.index.add_with_ids(vectors, np.array([record["id"] for record in missing], dtype=np.int64))
+            self.save()
+        print(f"Re-indexed {len(missing)} postings that were not saved before the last shutdown")
@@ -0,0 +1,150 @@
+"""
+Keyword Extractor: Corpus-level TF-IDF keywords for job descriptions
+IDF statistics are fitted once over a JD corpus and persisted as compact arrays;
+scoring a new JD is a single sparse transform.
+"""
+import os
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, TfidfVectorizer
+
+# Words that appear in almost every posting but say nothing about the role
+JD_STOP_WORDS = frozenset(ENGLISH_STOP_WORDS | {
+    "experience", "strong", "knowledge", "skills", "skill", "ability", "work", "working",
+    "team", "teams", "looking", "join", "role", "candidate", "candidates", "including",
+    "requirements", "preferred", "qualifications", "responsibilities", "familiarity",
+    "understanding", "good", "excellent", "plus", "opportunity", "years", "year", "using"
+})
+
+TOKEN_PATTERN = r"(?u)\b[A-Za-z][A-Za-z0-9+#.]*[A-Za-z0-9+#]\b|\b[A-Za-z]\b"
+
+# Relative data paths are resolved against the project root, not the working
+# directory (the backend runs from backend/, scripts from anywhere)
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_JDS_DIR = os.path.join(PROJECT_DIR, "data", "sample_jds")
+
+
+def default_idf_path() -> str:
+    """KEYWORD_IDF_PATH (default data/keyword_idf.npz), relative to the project root"""
+    return os.path.join(PROJECT_DIR, os.getenv("KEYWORD_IDF_PATH", "data/keyword_idf.npz"))
+
+
+class KeywordExtractor:
+    """Thin wrapper around a fitted TfidfVectorizer with npz persistence"""
+
+    def __init__(self, vectorizer: TfidfVectorizer, top_n: int = 6):
+        self.vectorizer = vectorizer
+        self.top_n = top_n
+        self._terms = np.asarray(vectorizer.get_feature_names_out())
+
+    @classmethod
+    def fit(cls, corpus: Iterable[str], ngram_range=(1, 2), min_df: int = 1,
+            max_features: Optional[int] = 50000, top_n: int = 6) -> "KeywordExtractor":
+        vectorizer = cls._make_vectorizer(ngram_range=ngram_range, min_df=min_df, max_features=max_features)
+        vectorizer.fit(corpus)
+        return cls(vectorizer, top_n=top_n)
+
+    @classmethod
+    def load(cls, path: str, top_n: int = 6) -> "KeywordExtractor":
+        """Rebuild the vectorizer from a vocabulary/IDF array file written by save()"""
+        data = np.load(path, allow_pickle=False)
+        terms = data["terms"].tolist()
+        vectorizer = cls._make_vectorizer(ngram_range=tuple(int(n) for n in data["ngram_range"]),
+                                          vocabulary={term: i for i, term in enumerate(terms)})
+        vectorizer.idf_ = data["idf"].astype(np.float64)
+        return cls(vectorizer, top_n=top_n)
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez_compressed(
+            path,
+            terms=self._terms.astype(str),
+            idf=self.vectorizer.idf_.astype(np.float32),
+            ngram_range=np.asarray(self.vectorizer.ngram_range, dtype=np.int32)
+        )
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self._terms)
+
+    def transform(self, texts: List[str]):
+        return self.vectorizer.transform(texts)
+
+    def extract(self, text: str, top_n: Optional[int] = None) -> List[str]:
+        return self.extract_batch([text], top_n)[0]
+
+    def extract_batch(self, texts: List[str], top_n: Optional[int] = None) -> List[List[str]]:
+        """Top TF-IDF terms per text, computed from one sparse transform"""
+        top_n = top_n or self.top_n
+        matrix = self.transform(texts).tocsr()
+        results = []
+        for row in range(matrix.shape[0]):
+            start, end = matrix.indptr[row], matrix.indptr[row + 1]
+            columns, scores = matrix.indices[start:end], matrix.data[start:end]
+            if len(scores) > top_n:
+                top = np.argpartition(-scores, top_n - 1)[:top_n]
+            else:
+                top = np.arange(len(scores))
+            top = top[np.argsort(-scores[top], kind="stable")]
+            results.append(self._terms[columns[top]].tolist())
+        return results
+
+    def match_keywords(self, job_description: str, generated_text: str, top_n: int = 15) -> Dict:
+        """Which of the JD's top keywords appear in the generated text"""
+        matrix = self.transform([job_description, generated_text]).tocsr()
+        job_row = matrix.getrow(0)
+        order = np.argsort(-job_row.data, kind="stable")[:top_n]
+        job_keywords = self._terms[job_row.indices[order]].tolist()
+        generated_terms = set(self._terms[matrix.getrow(1).indices].tolist())
+
+        matched = [keyword for keyword in job_keywords if keyword in generated_terms]
+        missing = [keyword for keyword in job_keywords if keyword not in generated_terms]
+        return {"job_keywords": job_keywords, "matched": matched, "missing": missing}
+
+    @staticmethod
+    def _make_vectorizer(**kwargs) -> TfidfVectorizer:
+        return TfidfVectorizer(
+            lowercase=True,
+            stop_words=list(JD_STOP_WORDS),
+            token_pattern=TOKEN_PATTERN,
+            sublinear_tf=True,
+            dtype=np.float32,
+            **kwargs
+        )
+
+
+_default_extractor: Optional[KeywordExtractor] = None
+_default_loaded = False
+_default_lock = threading.Lock()
+
+
+def get_keyword_extractor() -> Optional[KeywordExtractor]:
+    """
+    Shared extractor loaded from KEYWORD_IDF_PATH. If no fitted table exists yet,
+    fall back to fitting on the bundled sample JDs so keywords still work out of
+    the box (with IDF weights from a handful of postings); None if neither exists.
+    """
+    global _default_extractor, _default_loaded
+    if not _default_loaded:
+        with _default_lock:
+            if not _default_loaded:
+                path = default_idf_path()
+                try:
+                    if os.path.exists(path):
+                        _default_extractor = KeywordExtractor.load(path)
+                    elif os.path.isdir(SAMPLE_JDS_DIR):
+                        from job_feed import iter_job_descriptions
+                        records = list(iter_job_descriptions(SAMPLE_JDS_DIR))
+                        print(f"⚠️ No IDF table at {path}; keyword weights come from the "
+                              f"{len(records)} sample JDs in {SAMPLE_JDS_DIR} until you build one "
+                              f"with scripts/build_keyword_index.py")
+                        _default_extractor = KeywordExtractor.fit(record["text"] for record in records)
+                    else:
+                        print(f"⚠️ No IDF table at {path} and no sample JDs to fit on; "
+                              f"keyword extraction is disabled (build one with scripts/build_keyword_index.py)")
+                except Exception as e:
+                    print(f"⚠️ Keyword extractor not available: {e}")
+                _default_loaded = True
+    return _default_extractor
@@ -7,6 +7,7 @@ import argparse
 import json
 import os
 import sys
+import time
 from datetime import datetime
 from typing import Optional
 
@@ -28,7 +29,8 @@ class CareerCopilot:
                           company: str = "Unknown Company",
                           role: str = "Unknown Role",
                           application_url: str = "",
-                          auto_apply: bool = False) -> dict:
+                          auto_apply: bool = False,
+                          use_cache: bool = True) -> dict:
         """
         Complete end-to-end application processing pipeline
         """
@@ -45,7 +47,7 @@ class CareerCopilot:
         
         # Step 2: Execution  
         print("\n✍️  Step 2: Generating application materials...")
-        application_package = self.executor.generate_application_package(strategy)
+        application_package = self.executor.generate_application_package(strategy, use_cache=use_cache)
         
         print(f"   ✅ {len(application_package['bullets'])} resume bullets generated")
         print(f"   ✅ Cover letter generated ({len(application_package['cover_letter'])} chars)")
@@ -73,6 +75,43 @@ class CareerCopilot:
             "role": role
         }
     
+    def analyze_batch(self, source: str, workers: Optional[int] = None,
+                      timeout: Optional[float] = None, output: Optional[str] = None):
+        """Analyze a directory of JD files or a JSONL feed concurrently, printing results as they finish"""
+        from job_feed import iter_job_descriptions
+        
+        records = list(iter_job_descriptions(source))
+        if not records:
+            print(f"❌ No job descriptions found in {source}")
+            return
+        
+        print(f"\n📋 Analyzing {len(records)} job descriptions...")
+        print("="*60)
+        
+        start = time.perf_counter()
+        results = []
+        for result in self.planner.plan_applications([record["text"] for record in records],
+                                                     max_workers=workers, timeout=timeout):
+            record_id = records[result["index"]]["id"]
+            result["id"] = record_id
+            results.append(result)
+            if result["status"] == "ok":
+                strategy = result["strategy"]
+                print(f"   ✅ {record_id}: {strategy['jd_analysis'].get('title', 'Unknown Role')} "
+                      f"- match {strategy['match_score']:.1%} "
+                      f"({result['tier']}, {result['timing']['total_seconds']:.2f}s)")
+            else:
+                print(f"   ❌ {record_id}: {result['error']}")
+        
+        failed = sum(1 for result in results if result["status"] != "ok")
+        print(f"\n🎉 {len(results) - failed}/{len(results)} analyzed in {time.perf_counter() - start:.2f}s")
+        
+        if output:
+            with open(output, 'w', encoding='utf-8') as f:
+                for result in sorted(results, key=lambda r: r["index"]):
+                    f.write(json.dumps(result, default=str) + "\n")
+            print(f"💾 Results saved to: {output}")
+    
     def _auto_fill_demo(self, package: dict):
         """Demonstrate auto-fill capability with mock form"""
         try:
@@ -253,6 +292,20 @@ class CareerCopilot:
             print(f"   Successful apps avg: {match_analysis.get('avg_match_score_successful', 0):.1%}")
             print(f"   Unsuccessful apps avg: {match_analysis.get('avg_match_score_unsuccessful', 0):.1%}")
         
+        # Response times and funnel
+        timeline = analytics.get('application_timeline', {})
+        if timeline:
+            print(f"\n⏱️ Response Times:")
+            print(f"   Fastest: {timeline.get('fastest_response')}")
+            print(f"   Average: {timeline.get('average_response_time')}")
+            print(f"   Response rate: {timeline.get('response_rate', 0)}%")
+        
+        funnel = analytics.get('funnel', {})
+        if funnel:
+            print(f"\n🔻 Funnel:")
+            for stage, count in funnel.items():
+                print(f"   {stage.title()}: {count}")
+        
         # Top skills
         top_skills = analytics.get('top_skills_in_successful_apps', [])
         if top_skills:
@@ -268,6 +321,7 @@ def main():
 Examples:
   python main.py --interactive                    # Interactive mode
   python main.py --jd job.txt --company "Google"  # Process specific job
+  python main.py --jd-batch jobs/ --workers 8     # Analyze many JDs (directory or JSONL)
   python main.py --dashboard                      # View dashboard
   
 Author: Aditya Tayal | IIT Mandi CSE
@@ -275,10 +329,15 @@ Author: Aditya Tayal | IIT Mandi CSE
     )
     
     parser.add_argument("--jd", help="Path to job description file")
+    parser.add_argument("--jd-batch", help="Directory of JD files or JSONL feed to analyze concurrently")
+    parser.add_argument("--workers", type=int, help="Concurrent LLM calls for --jd-batch")
+    parser.add_argument("--timeout", type=float, help="Seconds before pending LLM calls fall back to regex (--jd-batch)")
+    parser.add_argument("--output", help="Write --jd-batch results to this JSONL file")
     parser.add_argument("--company", default="Unknown Company", help="Company name")
     parser.add_argument("--role", default="Unknown Role", help="Job role/position")
     parser.add_argument("--url", default="", help="Application URL")
     parser.add_argument("--auto-apply", action="store_true", help="Enable auto-fill demo")
+    parser.add_argument("--no-cache", action="store_true", help="Regenerate even if a cached package exists")
     parser.add_argument("--interactive", action="store_true", help="Start interactive mode")
     parser.add_argument("--dashboard", action="store_true", help="Show application dashboard")
     parser.add_argument("--analytics", action="store_true", help="Show analytics")
@@ -294,6 +353,8 @@ Author: Aditya Tayal | IIT Mandi CSE
         copilot.tracker.display_dashboard()
     elif args.analytics:
         copilot._display_analytics()
+    elif args.jd_batch:
+        copilot.analyze_batch(args.jd_batch, workers=args.workers, timeout=args.timeout, output=args.output)
     elif args.jd:
         # File-based processing
         try:
@@ -305,7 +366,8 @@ Author: Aditya Tayal | IIT Mandi CSE
                 company=args.company,
                 role=args.role,
                 application_url=args.url,
-                auto_apply=args.auto_apply
+                auto_apply=args.auto_apply,
+                use_cache=not args.no_cache
             )
             
             copilot.display_results(result)
@@ -0,0 +1,413 @@
+"""
+Model Server: One process that owns the LoRA generator and batches requests
+Backend workers send prompts over a local socket; requests that arrive within a
+short window are padded into a single generate() call. Streamed requests bypass
+the batcher and get their text back chunk by chunk.
+
+Run with:
+    python src/model_server.py --address 127.0.0.1:6100
+and point the backend at it with MODEL_SERVER_ADDRESS=127.0.0.1:6100.
+
+Messages are pickled, so the server only listens on loopback or a Unix socket
+unless started with --allow-remote, and both sides authenticate with
+MODEL_SERVER_AUTHKEY or, when that is unset, a per-user secret generated in
+MODEL_SERVER_AUTHKEY_FILE (readable by its owner only).
+"""
+import argparse
+import ipaddress
+import os
+import queue
+import secrets
+import threading
+import time
+from collections import defaultdict
+from multiprocessing.connection import Client, Listener
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+DEFAULT_ADDRESS = "127.0.0.1:6100"
+DEFAULT_AUTHKEY_FILE = os.path.join(os.path.expanduser("~"), ".career-copilot", "model_server.key")
+
+# Generation params that may differ between prompts of one generate() call
+PER_PROMPT_PARAMS = ("json_max_items", "prefix")
+
+
+def parse_address(address: str) -> Union[str, Tuple[str, int]]:
+    """'host:port' for TCP on localhost, anything else is a Unix socket path"""
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit():
+        return host or "127.0.0.1", int(port)
+    return address
+
+
+def is_local_address(address: Union[str, Tuple[str, int]]) -> bool:
+    """Unix socket paths and loopback hosts are only reachable from this machine"""
+    if isinstance(address, str):
+        return True
+    host = address[0]
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _authkey_from_file(path: str) -> bytes:
+    """Read the shared secret, creating it (mode 0600) on first use"""
+    os.makedirs(os.path.dirname(path) or ".", mode=0o700, exist_ok=True)
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        pass
+    else:
+        with os.fdopen(fd, "w") as f:
+            f.write(secrets.token_hex(32))
+
+    if os.name == "posix" and os.stat(path).st_mode & 0o077:
+        raise PermissionError(f"Model server key {path} is readable by other users; run: chmod 600 {path}")
+    with open(path, "r", encoding="utf-8") as f:
+        key = f.read().strip()
+    if not key:
+        raise ValueError(f"Model server key {path} is empty; delete it to generate a new one")
+    return key.encode("utf-8")
+
+
+def _authkey() -> bytes:
+    key = os.getenv("MODEL_SERVER_AUTHKEY")
+    if key:
+        return key.encode("utf-8")
+    return _authkey_from_file(os.getenv("MODEL_SERVER_AUTHKEY_FILE") or DEFAULT_AUTHKEY_FILE)
+
+
+class _PendingRequest:
+    __slots__ = ("prompt", "params", "done", "result", "error", "enqueued_at")
+
+    def __init__(self, prompt: str, params: Dict):
+        self.prompt = prompt
+        self.params = params
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.enqueued_at = time.perf_counter()
+
+
+class ModelServer:
+    """
+    generator:       a LocalGenerator or OnnxGenerator (anything with generate_batch(prompts, **params) and info())
+    max_batch_size:  prompts per generate() call
+    batch_window_ms: how long the first request of a batch waits for company
+    allow_remote:    listen on non-loopback interfaces (any authenticated peer can send pickles)
+    """
+
+    def __init__(self,
+                 generator,
+                 address: str = DEFAULT_ADDRESS,
+                 max_batch_size: int = 8,
+                 batch_window_ms: float = 10.0,
+                 allow_remote: bool = False):
+        self.generator = generator
+        self.address = address
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window_ms / 1000.0
+        self.allow_remote = allow_remote
+
+        self._queue: "queue.Queue[_PendingRequest]" = queue.Queue()
+        self._listener: Optional[Listener] = None
+        self._closed = threading.Event()
+        self._stats_lock = threading.Lock()
+        self._stats = {"requests": 0, "errors": 0, "batches": 0, "tokens_generated": 0,
+                       "generate_seconds": 0.0, "queue_wait_seconds": 0.0, "max_batch_seen": 0,
+                       "streams": 0, "stream_errors": 0}
+
+    def serve_forever(self):
+        address = parse_address(self.address)
+        if not self.allow_remote and not is_local_address(address):
+            raise ValueError(f"Refusing to listen on non-loopback address {self.address}; "
+                             f"pass --allow-remote (MODEL_SERVER_ALLOW_REMOTE=true) to expose the model server")
+        self._listener = Listener(address, authkey=_authkey())
+        threading.Thread(target=self._batch_loop, name="model-server-batcher", daemon=True).start()
+        print(f"✅ Model server listening on {self.address} "
+              f"(batch size {self.max_batch_size}, window {self.batch_window * 1000:.0f}ms)")
+
+        while not self._closed.is_set():
+            try:
+                connection = self._listener.accept()
+            except OSError:
+                break
+            except Exception as e:
+                # Failed handshakes (wrong authkey) should not take the server down
+                print(f"⚠️ Rejected model server connection: {e}")
+                continue
+            threading.Thread(target=self._handle_connection, args=(connection,), daemon=True).start()
+
+    def start(self) -> threading.Thread:
+        """Serve from a background thread (used by benchmarks and tests)"""
+        thread = threading.Thread(target=self.serve_forever, name="model-server", daemon=True)
+        thread.start()
+        while self._listener is None:
+            if not thread.is_alive():
+                raise RuntimeError(f"Model server failed to start on {self.address}")
+            time.sleep(0.01)
+        return thread
+
+    def close(self):
+        self._closed.set()
+        if self._listener is not None:
+            self._listener.close()
+
+    def stats(self) -> Dict:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        batches, requests = stats["batches"], stats["requests"]
+        stats["avg_batch_size"] = round(requests / batches, 2) if batches else 0.0
+        stats["tokens_per_second"] = (round(stats["tokens_generated"] / stats["generate_seconds"], 1)
+                                      if stats["generate_seconds"] else 0.0)
+        stats["avg_queue_wait_ms"] = round(stats["queue_wait_seconds"] / requests * 1000, 2) if requests else 0.0
+        stats["generate_seconds"] = round(stats["generate_seconds"], 3)
+        stats["queue_wait_seconds"] = round(stats["queue_wait_seconds"], 3)
+        stats["queued"] = self._queue.qsize()
+        prefix_cache = getattr(self.generator, "prefix_cache", None)
+        if prefix_cache is not None:
+            stats["prefix_cache"] = prefix_cache.stats()
+        if getattr(self.generator, "draft_model", None) is not None:
+            stats["speculative_decoding"] = self.generator.speculative_stats()
+        return stats
+
+    def _handle_connection(self, connection):
+        with connection:
+            while not self._closed.is_set():
+                try:
+                    message = connection.recv()
+                except (EOFError, OSError):
+                    return
+
+                op = message.get("op")
+                if op == "generate":
+                    requests = [_PendingRequest(prompt, params)
+                                for prompt, params in zip(message["prompts"], self._split_params(message))]
+                    for request in requests:
+                        self._queue.put(request)
+                    for request in requests:
+                        request.done.wait()
+                    errors = [request.error for request in requests if request.error]
+                    if errors:
+                        response = {"ok": False, "error": errors[0]}
+                    else:
+                        response = {"ok": True, "results": [request.result for request in requests]}
+                elif op == "stream":
+                    if not self._stream(connection, message["prompt"], message.get("params", {})):
+                        return
+                    continue
+                elif op == "info":
+                    response = {"ok": True, "info": self.generator.info()}
+                elif op == "stats":
+                    response = {"ok": True, "stats": self.stats()}
+                else:
+                    response = {"ok": False, "error": f"Unknown op: {op}"}
+
+                try:
+                    connection.send(response)
+                except (EOFError, OSError):
+                    return
+
+    @staticmethod
+    def _split_params(message: Dict) -> List[Dict]:
+        """Per-prompt params for a generate message; sequence values of PER_PROMPT_PARAMS are spread over prompts"""
+        params = message.get("params", {})
+        split = [dict(params) for _ in message["prompts"]]
+        for name in PER_PROMPT_PARAMS:
+            values = params.get(name)
+            if isinstance(values, (list, tuple)):
+                for prompt_params, value in zip(split, values):
+                    prompt_params[name] = value
+        return split
+
+    def _stream(self, connection, prompt: str, params: Dict) -> bool:
+        """Send {"chunk"} messages, then {"done"}; False if the client went away"""
+        with self._stats_lock:
+            self._stats["streams"] += 1
+        try:
+            for text in self.generator.stream(prompt, **params):
+                connection.send({"ok": True, "chunk": text})
+            response = {"ok": True, "done": True}
+        except (EOFError, OSError):
+            return False
+        except Exception as e:
+            print(f"❌ Streamed generation failed: {e}")
+            with self._stats_lock:
+                self._stats["stream_errors"] += 1
+            response = {"ok": False, "error": str(e)}
+
+        try:
+            connection.send(response)
+        except (EOFError, OSError):
+            return False
+        return True
+
+    def _next_batch(self) -> List[_PendingRequest]:
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.batch_window
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _batch_loop(self):
+        while not self._closed.is_set():
+            batch = self._next_batch()
+            try:
+                self._run_batch(batch)
+            except Exception as e:
+                # Anything that escapes (stats, dispatch) must not strand callers or stop the loop
+                print(f"❌ Batch loop error: {e}")
+                failed = [request for request in batch if not request.done.is_set()]
+                with self._stats_lock:
+                    self._stats["errors"] += len(failed)
+                for request in failed:
+                    request.result, request.error = None, f"Model server error: {e}"
+                    request.done.set()
+
+    def _run_batch(self, batch: List[_PendingRequest]):
+        # Only prompts with identical generation settings can share a generate() call
+        groups: Dict[tuple, List[_PendingRequest]] = defaultdict(list)
+        for request in batch:
+            shared = tuple(sorted((name, value) for name, value in request.params.items()
+                                  if name not in PER_PROMPT_PARAMS))
+            groups[shared].append(request)
+
+        for params, requests in groups.items():
+            params = dict(params)
+            for name in PER_PROMPT_PARAMS:
+                if any(name in request.params for request in requests):
+                    params[name] = [request.params.get(name) for request in requests]
+            started = time.perf_counter()
+            try:
+                results = self.generator.generate_batch([request.prompt for request in requests], **params)
+                if len(results) != len(requests):
+                    raise RuntimeError(f"generate_batch returned {len(results)} results for {len(requests)} prompts")
+                error = None
+            except Exception as e:
+                print(f"❌ Batched generation failed: {e}")
+                results, error = [None] * len(requests), str(e)
+            elapsed = time.perf_counter() - started
+            tokens = sum(result["tokens"] for result in results if result)
+
+            with self._stats_lock:
+                self._stats["batches"] += 1
+                self._stats["requests"] += len(requests)
+                self._stats["errors"] += len(requests) if error else 0
+                self._stats["generate_seconds"] += elapsed
+                self._stats["tokens_generated"] += tokens
+                self._stats["queue_wait_seconds"] += sum(started - request.enqueued_at for request in requests)
+                self._stats["max_batch_seen"] = max(self._stats["max_batch_seen"], len(requests))
+
+            for request, result in zip(requests, results):
+                request.result, request.error = result, error
+                request.done.set()
+
+
+class ModelClient:
+    """
+    Talks to a ModelServer. Thread-safe: each thread keeps its own connection,
+    so concurrent callers land in the same server-side batch.
+    """
+
+    def __init__(self, address: str = DEFAULT_ADDRESS):
+        self.address = address
+        self._local = threading.local()
+
+    def generate(self, prompt: str, **params) -> str:
+        return self.generate_batch([prompt], **params)[0]["text"]
+
+    def generate_batch(self, prompts: List[str], **params) -> List[Dict]:
+        return self._request({"op": "generate", "prompts": list(prompts), "params": params})["results"]
+
+    def stream(self, prompt: str, **params) -> Iterator[str]:
+        """Yield text chunks as the server decodes them"""
+        response = self._request({"op": "stream", "prompt": prompt, "params": params})
+        connection = self._local.connection
+        finished = False
+        try:
+            while not response.get("done"):
+                yield response["chunk"]
+                response = connection.recv()
+                if not response.get("ok"):
+                    finished = True
+                    raise RuntimeError(f"Model server error: {response.get('error')}")
+            finished = True
+        finally:
+            # An abandoned stream leaves chunks in flight on this connection; drop it
+            if not finished:
+                self.close()
+
+    def info(self) -> Dict:
+        return self._request({"op": "info"})["info"]
+
+    def stats(self) -> Dict:
+        return self._request({"op": "stats"})["stats"]
+
+    def close(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def _request(self, message: Dict) -> Dict:
+        # One reconnect covers a restarted server
+        for attempt in range(2):
+            connection = getattr(self._local, "connection", None)
+            try:
+                if connection is None:
+                    connection = Client(parse_address(self.address), authkey=_authkey())
+                    self._local.connection = connection
+                connection.send(message)
+                response = connection.recv()
+                break
+            except (EOFError, OSError):
+                self.close()
+                if attempt:
+                    raise
+        if not response.get("ok"):
+            raise RuntimeError(f"Model server error: {response.get('error')}")
+        return response
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the fine-tuned LoRA generator to backend workers")
+    parser.add_argument("--address", default=os.getenv("MODEL_SERVER_ADDRESS", DEFAULT_ADDRESS),
+                        help="host:port or Unix socket path")
+    parser.add_argument("--model-path", default=None, help="LoRA adapter (default: FINE_TUNED_MODEL_PATH)")
+    parser.add_argument("--base-model", default=None, help="Base model (default: BASE_MODEL)")
+    parser.add_argument("--max-batch-size", type=int, default=int(os.getenv("MODEL_SERVER_MAX_BATCH", "8")))
+    parser.add_argument("--batch-window-ms", type=float, default=float(os.getenv("MODEL_SERVER_BATCH_WINDOW_MS", "10")))
+    parser.add_argument("--backend", choices=["torch", "onnx"], default=os.getenv("GENERATOR_BACKEND", "torch").lower(),
+                        help="PyTorch model or its ONNX export (scripts/export_onnx.py)")
+    parser.add_argument("--onnx-path", default=None, help="ONNX export directory (default: ONNX_MODEL_PATH)")
+    parser.add_argument("--allow-remote", action="store_true",
+                        default=os.getenv("MODEL_SERVER_ALLOW_REMOTE", "false").lower() == "true",
+                        help="Listen on a non-loopback address (share MODEL_SERVER_AUTHKEY with the clients)")
+    args = parser.parse_args()
+
+    if args.backend == "onnx":
+        from onnx_generator import OnnxGenerator
+        generator = OnnxGenerator.load(args.onnx_path)
+    else:
+        from generation import LocalGenerator
+        generator = LocalGenerator.load(args.model_path, args.base_model)
+
+    server = ModelServer(generator, args.address, args.max_batch_size, args.batch_window_ms, args.allow_remote)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("👋 Model server stopped")
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""
+ONNX Generator: The merged fine-tuned model exported to ONNX, run with ONNX Runtime on CPU
+Same interface as LocalGenerator (generate, generate_batch, stream, info), so the
+executor and the model server can use either. Select it with GENERATOR_BACKEND=onnx
+after exporting the merged checkpoint with scripts/export_onnx.py; it needs
+onnxruntime, numpy and tokenizers, but neither torch nor transformers.
+"""
+import json
+import os
+import threading
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+
+from prefix_cache import PrefixKVCache
+from structured_output import OPEN, JsonPrefixScanner
+
+try:
+    import numpy as np
+    import onnxruntime as ort
+    from tokenizers import Tokenizer
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+    print("Warning: onnxruntime not available, the ONNX generator backend is disabled")
+
+DEFAULT_ONNX_MODEL_PATH = "./models/career-copilot-onnx"
+ONNX_MODEL_FILE = "model.onnx"
+ONNX_CONFIG_FILE = "generator_config.json"
+TOKENIZER_FILE = "tokenizer.json"
+
+
+class OnnxTokenizer:
+    """
+    The exported tokenizer.json read with the tokenizers library; covers what the
+    generator and the prompt builder use of a HF tokenizer (encode, decode, eos/pad ids).
+    """
+
+    def __init__(self, tokenizer, eos_token_id: int, pad_token_id: Optional[int] = None,
+                 model_max_length: int = 1024):
+        self._tokenizer = tokenizer
+        self.eos_token_id = eos_token_id
+        # Decoder-only models are padded with eos, as in LocalGenerator
+        self.pad_token_id = eos_token_id if pad_token_id is None else pad_token_id
+        self.model_max_length = model_max_length
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "OnnxTokenizer":
+        return cls(Tokenizer.from_file(path), **kwargs)
+
+    def encode(self, text: str) -> List[int]:
+        return self._tokenizer.encode(text).ids
+
+    def decode(self, ids: Sequence[int], skip_special_tokens: bool = True) -> str:
+        return self._tokenizer.decode([int(token) for token in ids], skip_special_tokens=skip_special_tokens)
+
+
+class OnnxGenerator:
+    """
+    Greedy decoding over an exported decoder with explicit key/value inputs:
+    the prompt is prefilled once, then every step feeds only the new token and
+    the key/values returned by the previous step. Decoding is greedy, like the
+    PyTorch backend's generate() (which never enables sampling), so both
+    backends produce the same text; temperature, top_p and speculative (there is
+    no draft model here) are accepted for interface compatibility.
+    """
+
+    def __init__(self, session, tokenizer, config: Dict, model_path: Optional[str] = None,
+                 prefix_cache_mb: Optional[int] = None):
+        self.session = session
+        self.tokenizer = tokenizer
+        self.config = config
+        self.base_model = config.get("base_model", model_path)
+        self.model_path = model_path
+
+        if prefix_cache_mb is None:
+            prefix_cache_mb = int(os.getenv("PREFIX_CACHE_MB", "256"))
+        self.prefix_cache = PrefixKVCache(prefix_cache_mb * 1024 * 1024)
+
+        self.eos_token_id = tokenizer.eos_token_id
+        self.pad_token_id = tokenizer.pad_token_id
+
+        self._lock = threading.Lock()
+        # Exported weights are the merged checkpoint's; the suffix keeps cached outputs per backend
+        self.model_version = f"{config.get('model_version', 'unknown')}-onnx"
+
+    @classmethod
+    def load(cls, model_path: Optional[str] = None, num_threads: Optional[int] = None) -> "OnnxGenerator":
+        """Load model.onnx, its tokenizer and generator_config.json from the export directory"""
+        if not ONNX_AVAILABLE:
+            raise ImportError("onnxruntime, numpy and tokenizers are required for the ONNX generator")
+
+        model_path = model_path or os.getenv("ONNX_MODEL_PATH", DEFAULT_ONNX_MODEL_PATH)
+        model_file = os.path.join(model_path, ONNX_MODEL_FILE)
+        if not os.path.exists(model_file):
+            raise FileNotFoundError(f"ONNX model not found at {model_file} (run scripts/export_onnx.py)")
+
+        print(f"🔄 Loading ONNX model from {model_path}...")
+        with open(os.path.join(model_path, ONNX_CONFIG_FILE), 'r', encoding='utf-8') as f:
+            config = json.load(f)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads is None:
+            num_threads = int(os.getenv("ONNX_NUM_THREADS", "0"))
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        session = ort.InferenceSession(model_file, sess_options=options, providers=["CPUExecutionProvider"])
+        tokenizer = OnnxTokenizer.from_file(os.path.join(model_path, TOKENIZER_FILE),
+                                            eos_token_id=config["eos_token_id"],
+                                            pad_token_id=config.get("pad_token_id"),
+                                            model_max_length=config["n_positions"])
+
+        print("✅ ONNX model loaded successfully!")
+        return cls(session, tokenizer, config, model_path=model_path)
+
+    @property
+    def context_window(self) -> int:
+        return self.config.get("n_positions") or self.tokenizer.model_max_length
+
+    def info(self) -> Dict:
+        return {"base_model": self.base_model, "model_path": self.model_path, "backend": "onnx",
+                "model_version": self.model_version, "context_window": self.context_window}
+
+    def generate(self, prompt: str, **params) -> str:
+        return self.generate_batch([prompt], **params)[0]["text"]
+
+    def generate_batch(self,
+                       prompts: List[str],
+                       max_new_tokens: int = 600,
+                       temperature: float = 0.2,
+                       top_p: float = 0.95,
+                       json_max_items: Union[None, int, Sequence[Optional[int]]] = None,
+                       prefix: Union[None, str, Sequence[Optional[str]]] = None,
+                       speculative: bool = False) -> List[Dict]:
+        """
+        Generate a continuation for every prompt in one padded batch; parameters
+        and results are the same as LocalGenerator.generate_batch().
+        """
+        if json_max_items is None or not isinstance(json_max_items, (list, tuple)):
+            json_max_items = [json_max_items] * len(prompts)
+        scanners = [JsonPrefixScanner(max_items=limit, max_preamble=32) if limit is not None else None
+                    for limit in json_max_items]
+
+        generated = [[] for _ in prompts]
+        decoded = [""] * len(prompts)
+        with self._lock:
+            for step_tokens in self._decode(prompts, max_new_tokens, prefix):
+                for row, token in step_tokens:
+                    generated[row].append(token)
+                    scanner = scanners[row]
+                    if scanner is not None and scanner.status() == OPEN:
+                        # Decode the whole continuation so multi-token characters come out whole
+                        text = self.tokenizer.decode(generated[row], skip_special_tokens=True)
+                        scanner.feed(text[len(decoded[row]):])
+                        decoded[row] = text
+                        if scanner.status() != OPEN:
+                            step_tokens.finish(row)
+
+        results = []
+        for row, tokens in enumerate(generated):
+            scanner = scanners[row]
+            results.append({
+                "text": self.tokenizer.decode(tokens, skip_special_tokens=True),
+                "tokens": sum(1 for token in tokens if token != self.pad_token_id),
+                "stop_reason": scanner.status() if scanner is not None and scanner.status() != OPEN else None
+            })
+        return results
+
+    def stream(self,
+               prompt: str,
+               max_new_tokens: int = 600,
+               temperature: float = 0.2,
+               top_p: float = 0.95,
+               prefix: Optional[str] = None,
+               speculative: bool = False) -> Iterator[str]:
+        """Yield the continuation of one prompt as text chunks while it is decoded"""
+        tokens = []
+        emitted = ""
+        with self._lock:
+            for step_tokens in self._decode([prompt], max_new_tokens, prefix):
+                for _, token in step_tokens:
+                    tokens.append(token)
+                text = self.tokenizer.decode(tokens, skip_special_tokens=True)
+                # Hold back a character that is still missing its remaining bytes
+                if text.endswith("�"):
+                    continue
+                if len(text) > len(emitted):
+                    yield text[len(emitted):]
+                    emitted = text
+
+    def _decode(self, prompts: List[str], max_new_tokens: int,
+                prefixes: Union[None, str, Sequence[Optional[str]]] = None) -> Iterator["_StepTokens"]:
+        """
+        Greedy decoding loop; yields the (row, token) pairs of every step for rows
+        still running. Callers may finish() a row to stop it early. Call with self._lock held.
+        """
+        feeds, prompt_length = self._prepare_inputs(prompts, prefixes)
+        max_new_tokens = min(max_new_tokens, self.context_window - prompt_length)
+        if max_new_tokens <= 0:
+            raise ValueError(f"Prompt of {prompt_length} tokens exceeds the {self.context_window}-token context window")
+
+        batch_size = len(prompts)
+        running = np.ones(batch_size, dtype=bool)
+        for _ in range(max_new_tokens):
+            logits, keys, values = self.session.run(None, feeds)
+            next_tokens = logits[:, -1].argmax(axis=-1)
+
+            step = _StepTokens([(row, int(next_tokens[row])) for row in range(batch_size) if running[row]])
+            yield step
+            for row, token in step:
+                if token == self.eos_token_id or row in step.finished:
+                    running[row] = False
+            if not running.any():
+                break
+
+            # Finished rows keep decoding in the batch but their tokens are ignored
+            next_tokens = np.where(running, next_tokens, self.pad_token_id)
+            feeds = {
+                "input_ids": next_tokens[:, None].astype(np.int64),
+                "attention_mask": np.concatenate([feeds["attention_mask"], np.ones((batch_size, 1), np.int64)], axis=1),
+                "position_ids": feeds["position_ids"][:, -1:] + 1,
+                "past_keys": keys,
+                "past_values": values
+            }
+
+    def _prepare_inputs(self, prompts: List[str], prefixes: Union[None, str, Sequence[Optional[str]]]) -> tuple:
+        """
+        Feeds for the prefill step: left-padded prompts, with the leading columns
+        that are cached prefix tokens (or padding) in every row passed as past key/values.
+        """
+        if prefixes is None or isinstance(prefixes, str):
+            prefixes = [prefixes] * len(prompts)
+        rows = [self.tokenizer.encode(prompt) for prompt in prompts]
+        entries = []
+        for ids, prompt, prefix in zip(rows, prompts, prefixes):
+            entry = None
+            if prefix and prompt.startswith(prefix):
+                entry = self._prefix_entry(prefix)
+                # Reuse is only exact if the prompt tokenizes the same way across the boundary
+                if ids[:len(entry["ids"])] != entry["ids"]:
+                    self.prefix_cache.record(boundary_mismatches=1)
+                    entry = None
+            entries.append(entry)
+
+        width = max(len(ids) for ids in rows)
+        pads = [width - len(ids) for ids in rows]
+        input_ids = np.array([[self.pad_token_id] * pad + ids for pad, ids in zip(pads, rows)], dtype=np.int64)
+        attention_mask = np.array([[0] * pad + [1] * len(ids) for pad, ids in zip(pads, rows)], dtype=np.int64)
+        position_ids = np.clip(attention_mask.cumsum(axis=1) - 1, 0, None)
+        self.prefix_cache.record(prompt_tokens=sum(len(ids) for ids in rows))
+
+        # At least the last prompt token must go through the model to produce logits
+        shared = 0
+        if any(entries):
+            shared = max(min(min(pad + (len(entry["ids"]) if entry else 0) for pad, entry in zip(pads, entries)),
+                             width - 1), 0)
+
+        past_keys = self._empty_past(len(rows), shared)
+        past_values = self._empty_past(len(rows), shared)
+        used = 0
+        for row, (pad, entry) in enumerate(zip(pads, entries)):
+            cached = max(0, min(shared - pad, len(entry["ids"]) if entry else 0))
+            if cached:
+                # Padding columns are masked out, so zeros stand in for their key/values
+                for layer, (keys, values) in enumerate(entry["layers"]):
+                    past_keys[layer, row, :, shared - cached:shared] = keys[0, :, :cached]
+                    past_values[layer, row, :, shared - cached:shared] = values[0, :, :cached]
+                used += cached
+        self.prefix_cache.record(cached_tokens_used=used)
+
+        feeds = {
+            "input_ids": input_ids[:, shared:],
+            "attention_mask": attention_mask,
+            "position_ids": position_ids[:, shared:],
+            "past_keys": past_keys,
+            "past_values": past_values
+        }
+        return feeds, width
+
+    def _empty_past(self, batch_size: int, length: int):
+        shape = (self.config["n_layer"], batch_size, self.config["n_head"], length, self.config["head_dim"])
+        return np.zeros(shape, dtype=np.float32)
+
+    def _prefix_entry(self, prefix: str) -> Dict:
+        key = PrefixKVCache.key(prefix)
+        entry = self.prefix_cache.get(key)
+        if entry is None:
+            ids = self.tokenizer.encode(prefix)
+            _, keys, values = self.session.run(None, {
+                "input_ids": np.array([ids], dtype=np.int64),
+                "attention_mask": np.ones((1, len(ids)), dtype=np.int64),
+                "position_ids": np.arange(len(ids), dtype=np.int64)[None],
+                "past_keys": self._empty_past(1, 0),
+                "past_values": self._empty_past(1, 0)
+            })
+            layers = [(keys[layer], values[layer]) for layer in range(keys.shape[0])]
+            entry = self.prefix_cache.put(key, ids, layers)
+        return entry
+
+
+class _StepTokens(list):
+    """The (row, token) pairs of one decoding step, plus the rows a caller stopped"""
+
+    def __init__(self, pairs):
+        super().__init__(pairs)
+        self.finished = set()
+
+    def finish(self, row: int):
+        self.finished.add(row)
@@ -0,0 +1,297 @@
+"""
+Package Store: Append-only, compressed storage for generated application packages
+Each package is compressed on its own and appended to a segment file, so it can
+be read back with a single positioned read. A SQLite index maps package IDs to
+(segment, offset, length) and answers company / role / time-range queries
+without touching the segments. Every writer process appends to segments it
+allocated itself, so several backend workers can share one store.
+"""
+import json
+import os
+import sqlite3
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+
+INDEX_FILE = "index.sqlite"
+# Each record is <length:uint32><crc32:uint32> followed by the zlib-compressed JSON
+_HEADER = struct.Struct("<II")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+    segment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT NOT NULL,
+    pid INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS packages (
+    package_id TEXT PRIMARY KEY,
+    company TEXT,
+    role TEXT,
+    created_at TEXT NOT NULL,
+    segment_id INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS packages_created ON packages (created_at);
+CREATE INDEX IF NOT EXISTS packages_company ON packages (company COLLATE NOCASE, created_at);
+CREATE INDEX IF NOT EXISTS packages_role ON packages (role COLLATE NOCASE, created_at);
+"""
+
+Timestamp = Union[str, datetime, None]
+
+
+def new_package_id() -> str:
+    """Time-ordered ID (milliseconds, then random bits), so index inserts land at the end"""
+    return f"{int(time.time() * 1000):012x}{os.urandom(5).hex()}"
+
+
+def package_metadata(package: Dict) -> Dict:
+    """The indexed fields of a package: company, role and creation time"""
+    jd_analysis = package.get("strategy_used", {}).get("jd_analysis", {})
+    return {
+        "company": jd_analysis.get("company"),
+        "role": jd_analysis.get("title"),
+        "created_at": package.get("generated_at") or datetime.now().isoformat()
+    }
+
+
+class PackageStore:
+    """
+    store_dir:         segment files plus index.sqlite
+    max_segment_bytes: a segment is closed and a new one started past this size
+    compression_level: zlib level for each package (1 = fastest, 9 = smallest)
+    """
+
+    def __init__(self,
+                 store_dir: str = "data/packages",
+                 max_segment_bytes: int = 64 * 1024 * 1024,
+                 compression_level: int = 6,
+                 max_open_segments: int = 64):
+        self.store_dir = store_dir
+        self.max_segment_bytes = max_segment_bytes
+        self.compression_level = compression_level
+        self.max_open_segments = max_open_segments
+
+        os.makedirs(store_dir, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(store_dir, INDEX_FILE), check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+        self._lock = threading.Lock()
+        self._segment_id: Optional[int] = None
+        self._segment_fd: Optional[int] = None
+        self._segment_bytes = 0
+        self._read_fds: "OrderedDict[int, int]" = OrderedDict()
+        self._stats = {"writes": 0, "reads": 0, "read_errors": 0, "raw_bytes_written": 0,
+                       "stored_bytes_written": 0, "segments_opened": 0}
+
+    def put(self, package: Dict, package_id: Optional[str] = None) -> str:
+        """Append one package and index it; returns its ID"""
+        return self.put_many([package], [package_id] if package_id else None)[0]
+
+    def put_many(self, packages: Sequence[Dict], package_ids: Optional[Sequence[str]] = None) -> List[str]:
+        """Append packages in one write and one index transaction"""
+        package_ids = list(package_ids) if package_ids else [package.get("package_id") or new_package_id()
+                                                             for package in packages]
+        records, rows = [], []
+        raw_bytes = 0
+        for package_id, package in zip(package_ids, packages):
+            raw = json.dumps({**package, "package_id": package_id}, default=str, separators=(",", ":")).encode("utf-8")
+            blob = zlib.compress(raw, self.compression_level)
+            records.append(_HEADER.pack(len(blob), zlib.crc32(blob)) + blob)
+            metadata = package_metadata(package)
+            rows.append([package_id, metadata["company"], metadata["role"], metadata["created_at"]])
+            raw_bytes += len(raw)
+
+        with self._lock:
+            offset = self._writable_segment(sum(len(record) for record in records))
+            os.write(self._segment_fd, b"".join(records))
+            self._segment_bytes += sum(len(record) for record in records)
+            for row, record in zip(rows, records):
+                row.extend([self._segment_id, offset, len(record)])
+                offset += len(record)
+            with self._db:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO packages (package_id, company, role, created_at, segment_id, offset, "
+                    "length) VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self._stats["writes"] += len(records)
+            self._stats["raw_bytes_written"] += raw_bytes
+            self._stats["stored_bytes_written"] += sum(len(record) for record in records)
+        return package_ids
+
+    def get(self, package_id: str) -> Optional[Dict]:
+        """The package with this ID, or None"""
+        with self._lock:
+            row = self._db.execute("SELECT segment_id, offset, length FROM packages WHERE package_id = ?",
+                                   (package_id,)).fetchone()
+        if row is None:
+            return None
+        return self._read(*row)
+
+    def get_many(self, package_ids: Sequence[str]) -> Dict[str, Dict]:
+        """Packages by ID (missing IDs are left out), read in on-disk order"""
+        locations = []
+        with self._lock:
+            for package_id in package_ids:
+                row = self._db.execute("SELECT segment_id, offset, length FROM packages WHERE package_id = ?",
+                                       (package_id,)).fetchone()
+                if row is not None:
+                    locations.append((row, package_id))
+        locations.sort()
+        packages = {}
+        for row, package_id in locations:
+            package = self._read(*row)
+            if package is not None:
+                packages[package_id] = package
+        return packages
+
+    def query(self,
+              company: Optional[str] = None,
+              role: Optional[str] = None,
+              since: Timestamp = None,
+              until: Timestamp = None,
+              limit: Optional[int] = 100,
+              newest_first: bool = True) -> List[Dict]:
+        """
+        Index entries ({package_id, company, role, created_at}) matching every given
+        filter; company and role match case-insensitively, since/until bound created_at.
+        """
+        clauses, params = [], []
+        if company is not None:
+            clauses.append("company = ? COLLATE NOCASE")
+            params.append(company)
+        if role is not None:
+            clauses.append("role = ? COLLATE NOCASE")
+            params.append(role)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(_timestamp(since))
+        if until is not None:
+            clauses.append("created_at < ?")
+            params.append(_timestamp(until))
+
+        sql = "SELECT package_id, company, role, created_at FROM packages"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY created_at " + ("DESC" if newest_first else "ASC")
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [{"package_id": row[0], "company": row[1], "role": row[2], "created_at": row[3]} for row in rows]
+
+    def iter_packages(self, **filters) -> Iterator[Dict]:
+        """Full packages for query(**filters), in the same order"""
+        for entry in self.query(**filters):
+            package = self.get(entry["package_id"])
+            if package is not None:
+                yield package
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM packages").fetchone()[0]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["packages"] = self._db.execute("SELECT COUNT(*) FROM packages").fetchone()[0]
+            stats["segments"] = self._db.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+        # Over packages written by this process
+        stats["compression_ratio"] = (round(stats["raw_bytes_written"] / stats["stored_bytes_written"], 2)
+                                      if stats["stored_bytes_written"] else 0.0)
+        stats["store_dir"] = self.store_dir
+        return stats
+
+    def close(self):
+        with self._lock:
+            if self._segment_fd is not None:
+                os.close(self._segment_fd)
+                self._segment_fd = None
+            for fd in self._read_fds.values():
+                os.close(fd)
+            self._read_fds.clear()
+            self._db.close()
+
+    def _segment_path(self, segment_id: int) -> str:
+        return os.path.join(self.store_dir, f"segment_{segment_id:06d}.pkz")
+
+    def _writable_segment(self, incoming: int) -> int:
+        """Offset for the next append, starting a new segment if needed; call with self._lock held"""
+        if self._segment_fd is not None and (self._segment_bytes + incoming <= self.max_segment_bytes
+                                             or self._segment_bytes == 0):
+            return self._segment_bytes
+        if self._segment_fd is not None:
+            os.close(self._segment_fd)
+
+        # The index hands out segment IDs, so concurrent writer processes never share a file
+        with self._db:
+            cursor = self._db.execute("INSERT INTO segments (created_at, pid) VALUES (?, ?)",
+                                      (datetime.now().isoformat(), os.getpid()))
+        self._segment_id = cursor.lastrowid
+        self._segment_fd = os.open(self._segment_path(self._segment_id), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self._segment_bytes = 0
+        self._stats["segments_opened"] += 1
+        return 0
+
+    def _read(self, segment_id: int, offset: int, length: int) -> Optional[Dict]:
+        try:
+            # Held across the read so an evicted descriptor is never closed underneath it
+            with self._lock:
+                data = os.pread(self._read_fd(segment_id), length, offset)
+            blob_length, checksum = _HEADER.unpack_from(data)
+            blob = data[_HEADER.size:_HEADER.size + blob_length]
+            if len(blob) != blob_length or zlib.crc32(blob) != checksum:
+                raise ValueError("checksum mismatch")
+            package = json.loads(zlib.decompress(blob))
+        except (OSError, ValueError, struct.error, zlib.error) as e:
+            print(f"⚠️ Unreadable package in segment {segment_id} at {offset}: {e}")
+            with self._lock:
+                self._stats["read_errors"] += 1
+            return None
+        with self._lock:
+            self._stats["reads"] += 1
+        return package
+
+    def _read_fd(self, segment_id: int) -> int:
+        """Cached read-only descriptor for a segment; call with self._lock held"""
+        fd = self._read_fds.get(segment_id)
+        if fd is not None:
+            self._read_fds.move_to_end(segment_id)
+            return fd
+        fd = os.open(self._segment_path(segment_id), os.O_RDONLY)
+        self._read_fds[segment_id] = fd
+        while len(self._read_fds) > self.max_open_segments:
+            _, evicted = self._read_fds.popitem(last=False)
+            os.close(evicted)
+        return fd
+
+
+def _timestamp(value: Union[str, datetime]) -> str:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+_default_store: Optional[PackageStore] = None
+_default_lock = threading.Lock()
+
+
+def get_package_store() -> Optional[PackageStore]:
+    """Process-wide store configured from the environment; None when PACKAGE_STORE_DIR is empty"""
+    global _default_store
+    store_dir = os.getenv("PACKAGE_STORE_DIR", "data/packages")
+    if not store_dir:
+        return None
+    if _default_store is None:
+        with _default_lock:
+            if _default_store is None:
+                _default_store = PackageStore(
+                    store_dir=store_dir,
+                    max_segment_bytes=int(float(os.getenv("PACKAGE_STORE_SEGMENT_MB", "64")) * 1024 * 1024)
+                )
+    return _default_store
@@ -4,76 +4,92 @@ Planner Agent: Parses job descriptions and extracts relevant requirements
 import re
 import json
 import os
-from typing import List, Dict, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from typing import Iterable, Iterator, List, Dict, Optional
 from datetime import datetime
 from sentence_transformers import SentenceTransformer
 import openai
 from dotenv import load_dotenv
 
+from profile_provider import ProfileSnapshot, get_profile_provider
+from skill_index import canonical_ids
+from semantic_matcher import SemanticSkillMatcher
+from interaction_logger import get_interaction_logger
+from job_index import FAISS_AVAILABLE, JobIndex
+from jd_parser import JD_ANALYSIS_PROMPT, SKILL_PATTERNS, extract_skills_regex, parse_job_description
+from jd_dedup import DedupAnalysisCache, JDDeduplicator
+from keyword_extractor import get_keyword_extractor
+from prompt_builder import PromptBuilder
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
 load_dotenv()
 openai.api_key = os.getenv("OPENAI_API_KEY")
 
+JD_ANALYSIS_MODEL = "gpt-3.5-turbo"
+
 class JobDescriptionPlanner:
-    def __init__(self):
-        self.skill_patterns = [
-            r"\b(Python|python)\b",
-            r"\b(Flask|Django|FastAPI)\b", 
-            r"\b(TensorFlow|PyTorch|Keras)\b",
-            r"\b(React|Next\.js|Vue|Angular)\b",
-            r"\b(Machine Learning|ML|Deep Learning|AI|Artificial Intelligence)\b",
-            r"\b(Computer Vision|CV|Image Processing)\b",
-            r"\b(Natural Language Processing|NLP)\b",
-            r"\b(Docker|Kubernetes|AWS|Azure|GCP)\b",
-            r"\b(Git|GitHub|GitLab)\b",
-            r"\b(SQL|MySQL|PostgreSQL|MongoDB)\b",
-            r"\b(Node\.js|JavaScript|TypeScript)\b",
-            r"\b(Java|C\+\+|C#|Go|Rust)\b",
-            r"\b(Linux|Unix|Ubuntu)\b",
-            r"\b(API|REST|GraphQL)\b",
-            r"\b(Data Science|Analytics|Statistics)\b"
-        ]
+    def __init__(self, profile_provider=None):
+        self.profile_provider = profile_provider or get_profile_provider()
+        self.interaction_logger = get_interaction_logger()
+        self.skill_patterns = SKILL_PATTERNS
         
         self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+        self.semantic_matcher = SemanticSkillMatcher(
+            self.embedding_model,
+            threshold=float(os.getenv("SKILL_MATCH_THRESHOLD", "0.7")),
+            cache_size=int(os.getenv("SKILL_EMBEDDING_CACHE_SIZE", "4096"))
+        )
+        self.job_index = self._load_job_index()
+        self.keyword_extractor = get_keyword_extractor()
+        self.dedup_cache = DedupAnalysisCache(JDDeduplicator(
+            threshold=float(os.getenv("JD_DEDUP_THRESHOLD", "0.8")),
+            num_perm=int(os.getenv("JD_DEDUP_NUM_PERM", "128"))
+        ))
+        self.prompt_builder = PromptBuilder(
+            tokenizer=self._load_prompt_tokenizer(),
+            max_prompt_tokens=int(os.getenv("PROMPT_MAX_TOKENS", "1024")),
+            jd_token_budget=int(os.getenv("PROMPT_JD_TOKEN_BUDGET", "600"))
+        )
+    
+    def _load_job_index(self) -> Optional[JobIndex]:
+        """Open the persistent similar-job index if FAISS is installed"""
+        if not FAISS_AVAILABLE:
+            return None
+        try:
+            return JobIndex.load(os.getenv("JOB_INDEX_DIR", "data/job_index"), self.embedding_model)
+        except Exception as e:
+            print(f"⚠️ Job index not available: {e}")
+            return None
+        
+    def _load_prompt_tokenizer(self):
+        """Tokenizer of the JD analysis model, so prompt budgets are measured in real tokens"""
+        if not TIKTOKEN_AVAILABLE:
+            return None
+        try:
+            return tiktoken.encoding_for_model(JD_ANALYSIS_MODEL)
+        except Exception as e:
+            print(f"⚠️ tiktoken encoding not available, approximating prompt tokens: {e}")
+            return None
         
     def extract_skills_regex(self, text: str) -> List[str]:
         """Extract skills using regex patterns"""
-        found_skills = set()
-        for pattern in self.skill_patterns:
-            matches = re.findall(pattern, text, flags=re.IGNORECASE)
-            if matches:
-                for match in matches:
-                    if isinstance(match, str):
-                        found_skills.add(match.strip())
-                    else:
-                        found_skills.add(match[0].strip())
-        return list(found_skills)
+        return extract_skills_regex(text)
     
     def extract_with_llm(self, jd_text: str) -> Dict:
         """Use LLM to extract structured information from job description"""
-        prompt = f"""
-        You are a job description parser. Extract the following information from the job description and return it as a JSON object:
-        
-        {{
-            "title": "job title",
-            "company": "company name (if mentioned)",
-            "skills": ["list of technical skills required"],
-            "keywords": ["6 most important keywords for this role"],
-            "seniority": "intern/entry/mid/senior",
-            "experience_required": "years of experience or 'none' for internships",
-            "education": "education requirements",
-            "location": "job location (if mentioned)",
-            "job_type": "internship/full-time/part-time/contract"
-        }}
-        
-        Job Description:
-        {jd_text}
-        
-        Return only the JSON object, no additional text.
-        """
+        # Boilerplate sections are pruned and the JD is fitted to the token budget
+        prompt = self.prompt_builder.build_with_jd("jd_analysis", JD_ANALYSIS_PROMPT, jd_text)
         
         try:
             response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
+                model=JD_ANALYSIS_MODEL,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.1,
                 max_tokens=500
@@ -95,73 +111,137 @@ class JobDescriptionPlanner:
     
     def _fallback_parse(self, jd_text: str) -> Dict:
         """Fallback parsing using regex when LLM fails"""
-        skills = self.extract_skills_regex(jd_text)
+        analysis = parse_job_description(jd_text)
+        if self.keyword_extractor is not None:
+            analysis["keywords"] = self.keyword_extractor.extract(jd_text)
+        return analysis
+    
+    def plan_application(self, jd_text: str, profile_path: str = "data/profile.json") -> Dict:
+        """Main planning function that analyzes JD and creates application strategy"""
         
-        # Extract title (usually in first few lines)
-        lines = jd_text.split('\n')[:5]
-        title = "Unknown Role"
-        for line in lines:
-            if any(word in line.lower() for word in ['intern', 'engineer', 'developer', 'analyst', 'scientist']):
-                title = line.strip()
-                break
+        snapshot = self._load_snapshot(profile_path)
         
-        # Determine seniority
-        seniority = "intern"
-        if any(word in jd_text.lower() for word in ['intern', 'internship']):
-            seniority = "intern"
-        elif any(word in jd_text.lower() for word in ['entry', 'junior', 'graduate']):
-            seniority = "entry"
-        elif any(word in jd_text.lower() for word in ['senior', 'lead', 'principal']):
-            seniority = "senior"
-        else:
-            seniority = "mid"
+        # Extract JD information, reusing the analysis of a near-duplicate posting if we have one
+        jd_analysis, dedup_info = self.dedup_cache.lookup(jd_text)
+        if jd_analysis is None:
+            analysis_start = time.perf_counter()
+            jd_analysis = self.extract_with_llm(jd_text)
+            self.dedup_cache.store(dedup_info, jd_analysis, time.perf_counter() - analysis_start)
         
-        return {
-            "title": title,
-            "company": "Unknown Company", 
-            "skills": skills,
-            "keywords": skills[:6] if len(skills) >= 6 else skills,
-            "seniority": seniority,
-            "experience_required": "none" if seniority == "intern" else "1-3 years",
-            "education": "Bachelor's degree",
-            "location": "Unknown",
-            "job_type": "internship" if seniority == "intern" else "full-time"
-        }
+        return self._build_strategy(jd_text, jd_analysis, dedup_info, snapshot)
     
-    def plan_application(self, jd_text: str, profile_path: str = "data/profile.json") -> Dict:
-        """Main planning function that analyzes JD and creates application strategy"""
+    def plan_applications(self,
+                          jd_texts: Iterable[str],
+                          profile_path: str = "data/profile.json",
+                          max_workers: Optional[int] = None,
+                          timeout: Optional[float] = None) -> Iterator[Dict]:
+        """
+        Plan many JDs at once, yielding results in completion order:
+            {"index", "status": "ok"|"error", "tier": "dedup"|"regex"|"llm",
+             "strategy" | "error", "timing": {...}}
+        Near-duplicates and the regex tier are answered inline; LLM calls run in a
+        bounded thread pool. A failed item never aborts the batch, and LLM calls
+        still running after `timeout` seconds fall back to the regex tier.
+        """
+        max_workers = max_workers or int(os.getenv("PLANNER_BATCH_WORKERS", "4"))
+        snapshot = self._load_snapshot(profile_path)
+        use_llm = bool(openai.api_key)
         
-        # Load user profile
+        pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="planner-llm")
+        pending = {}
         try:
-            with open(profile_path, 'r') as f:
-                profile = json.load(f)
-        except:
+            for index, jd_text in enumerate(jd_texts):
+                item_start = time.perf_counter()
+                try:
+                    jd_analysis, dedup_info = self.dedup_cache.lookup(jd_text)
+                    if jd_analysis is not None:
+                        yield self._batch_result(index, "dedup", jd_text, jd_analysis, dedup_info, snapshot, item_start, 0.0)
+                    elif use_llm:
+                        pending[pool.submit(self._timed_extract, self.extract_with_llm, jd_text)] = (
+                            index, jd_text, dedup_info, item_start)
+                    else:
+                        jd_analysis, analysis_seconds = self._timed_extract(self._fallback_parse, jd_text)
+                        self.dedup_cache.store(dedup_info, jd_analysis, analysis_seconds)
+                        yield self._batch_result(index, "regex", jd_text, jd_analysis, dedup_info, snapshot,
+                                                 item_start, analysis_seconds)
+                except Exception as e:
+                    yield self._batch_error(index, e, item_start)
+            
+            # Cache writes, skill matching and indexing stay on this thread
+            try:
+                for future in as_completed(list(pending), timeout=timeout):
+                    index, jd_text, dedup_info, item_start = pending.pop(future)
+                    try:
+                        jd_analysis, analysis_seconds = future.result()
+                        self.dedup_cache.store(dedup_info, jd_analysis, analysis_seconds)
+                        yield self._batch_result(index, "llm", jd_text, jd_analysis, dedup_info, snapshot,
+                                                 item_start, analysis_seconds)
+                    except Exception as e:
+                        yield self._batch_error(index, e, item_start)
+            except FuturesTimeoutError:
+                for future, (index, jd_text, dedup_info, item_start) in list(pending.items()):
+                    future.cancel()
+                    del pending[future]
+                    try:
+                        jd_analysis, analysis_seconds = self._timed_extract(self._fallback_parse, jd_text)
+                        result = self._batch_result(index, "regex", jd_text, jd_analysis, dedup_info, snapshot,
+                                                    item_start, analysis_seconds)
+                        result["fallback_reason"] = f"LLM analysis exceeded {timeout}s"
+                        yield result
+                    except Exception as e:
+                        yield self._batch_error(index, e, item_start)
+        finally:
+            # Don't block on LLM calls nobody is waiting for anymore
+            pool.shutdown(wait=False, cancel_futures=True)
+    
+    def _load_snapshot(self, profile_path: str) -> ProfileSnapshot:
+        # Load user profile (cached and pre-indexed by the shared provider)
+        snapshot = self.profile_provider.get(profile_path)
+        if snapshot.is_empty:
             print("Warning: Could not load profile, using basic analysis")
-            profile = {}
-        
-        # Extract JD information
-        jd_analysis = self.extract_with_llm(jd_text)
-        
-        # Match profile skills with JD requirements
+        return snapshot
+    
+    @staticmethod
+    def _timed_extract(extract, jd_text: str):
+        start = time.perf_counter()
+        jd_analysis = extract(jd_text)
+        return jd_analysis, time.perf_counter() - start
+    
+    def _batch_result(self, index: int, tier: str, jd_text: str, jd_analysis: Dict, dedup_info: Dict,
+                      snapshot: ProfileSnapshot, item_start: float, analysis_seconds: float) -> Dict:
+        strategy = self._build_strategy(jd_text, jd_analysis, dedup_info, snapshot)
+        return {
+            "index": index,
+            "status": "ok",
+            "tier": tier,
+            "strategy": strategy,
+            "timing": {
+                "analysis_seconds": round(analysis_seconds, 4),
+                "total_seconds": round(time.perf_counter() - item_start, 4)
+            }
+        }
+    
+    @staticmethod
+    def _batch_error(index: int, error: Exception, item_start: float) -> Dict:
+        print(f"❌ Batch planning failed for JD #{index}: {error}")
+        return {
+            "index": index,
+            "status": "error",
+            "error": str(error),
+            "timing": {"total_seconds": round(time.perf_counter() - item_start, 4)}
+        }
+    
+    def _build_strategy(self, jd_text: str, jd_analysis: Dict, dedup_info: Dict, snapshot: ProfileSnapshot) -> Dict:
+        """Match the analyzed JD against the profile and assemble the application strategy"""
+        # Match profile skills with JD requirements: canonical IDs first, then embeddings
         required_skills = jd_analysis.get("skills", [])
-        user_skills = profile.get("skills", [])
-        
-        # Find matching skills
-        matching_skills = []
-        missing_skills = []
-        
-        for req_skill in required_skills:
-            found_match = False
-            for user_skill in user_skills:
-                if req_skill.lower() in user_skill.lower() or user_skill.lower() in req_skill.lower():
-                    matching_skills.append(req_skill)
-                    found_match = True
-                    break
-            if not found_match:
-                missing_skills.append(req_skill)
+        skill_match = self.semantic_matcher.match(required_skills, snapshot.skill_index, snapshot.version)
+        matching_skills = skill_match["matching_skills"]
+        missing_skills = skill_match["missing_skills"]
         
         # Calculate match score
-        match_score = len(matching_skills) / len(required_skills) if required_skills else 0
+        total_required = len(matching_skills) + len(missing_skills)
+        match_score = len(matching_skills) / total_required if total_required else 0
         
         # Generate application strategy
         strategy = {
@@ -169,51 +249,73 @@ class JobDescriptionPlanner:
             "matching_skills": matching_skills,
             "missing_skills": missing_skills,
             "match_score": match_score,
-            "recommended_focus": self._get_focus_areas(matching_skills, profile),
-            "suggested_projects": self._suggest_relevant_projects(jd_analysis, profile),
+            "keywords": jd_analysis.get("keywords", []),
+            "semantic_matches": skill_match["semantic_matches"],
+            "recommended_focus": self._get_focus_areas(matching_skills, snapshot),
+            "suggested_projects": self._suggest_relevant_projects(jd_analysis, snapshot),
             "timestamp": datetime.now().isoformat()
         }
         
+        if "duplicate_of" in dedup_info:
+            strategy["duplicate_of"] = dedup_info["duplicate_of"]
+            strategy["duplicate_similarity"] = dedup_info["similarity"]
+        
+        # Remember the analyzed posting for similar-job retrieval (reposts are already indexed)
+        if self.job_index is not None and "duplicate_of" not in dedup_info:
+            try:
+                strategy["job_id"] = self.job_index.add(jd_text, jd_analysis)
+            except Exception as e:
+                print(f"Failed to index job description: {e}")
+        
         # Log the planning interaction
         self._log_interaction(jd_text, strategy)
         
         return strategy
     
-    def _get_focus_areas(self, matching_skills: List[str], profile: Dict) -> List[str]:
+    def find_similar_jobs(self, jd_text: str, k: int = 5, jd_analysis: Optional[Dict] = None) -> List[Dict]:
+        """Return the k most similar previously analyzed postings"""
+        if self.job_index is None:
+            return []
+        if jd_analysis is None:
+            # Postings are indexed with their analysis summary, so queries need one too:
+            # the cached analysis of a planned (or near-duplicate) posting, else the regex tier
+            jd_analysis, _ = self.dedup_cache.lookup(jd_text, count=False)
+            if jd_analysis is None:
+                jd_analysis = self._fallback_parse(jd_text)
+        return self.job_index.search(jd_text, k=k, jd_analysis=jd_analysis)
+    
+    def _get_focus_areas(self, matching_skills: List[str], snapshot: ProfileSnapshot) -> List[str]:
         """Determine which aspects of profile to emphasize"""
         focus_areas = []
+        matching_ids = canonical_ids(matching_skills)
         
         # Check projects that match skills
-        projects = profile.get("projects", [])
-        for project in projects:
-            project_techs = project.get("technologies", [])
-            if any(skill.lower() in tech.lower() for skill in matching_skills for tech in project_techs):
+        for project, tech_ids in zip(snapshot.projects, snapshot.project_technology_ids):
+            if not matching_ids.isdisjoint(tech_ids):
                 focus_areas.append(f"Highlight {project['title']} project")
         
         # Check experience
-        experience = profile.get("experience", [])
-        for exp in experience:
-            if any(skill.lower() in exp.get("description", "").lower() for skill in matching_skills):
+        for exp, exp_skill_ids in zip(snapshot.experience, snapshot.experience_skill_ids):
+            if not matching_ids.isdisjoint(exp_skill_ids):
                 focus_areas.append(f"Emphasize {exp['role']} experience")
         
         return focus_areas
     
-    def _suggest_relevant_projects(self, jd_analysis: Dict, profile: Dict) -> List[Dict]:
+    def _suggest_relevant_projects(self, jd_analysis: Dict, snapshot: ProfileSnapshot) -> List[Dict]:
         """Suggest which projects to highlight based on JD"""
-        projects = profile.get("projects", [])
         relevant_projects = []
         
-        jd_skills = [skill.lower() for skill in jd_analysis.get("skills", [])]
+        jd_skill_ids = canonical_ids(jd_analysis.get("skills", []))
         
-        for project in projects:
-            project_techs = [tech.lower() for tech in project.get("technologies", [])]
-            relevance_score = sum(1 for tech in project_techs if any(skill in tech for skill in jd_skills))
+        for project, project_techs, tech_ids in zip(snapshot.projects, snapshot.project_technologies,
+                                                    snapshot.project_technology_ids):
+            matching_techs = [tech for tech, tech_id in zip(project_techs, tech_ids) if tech_id in jd_skill_ids]
             
-            if relevance_score > 0:
+            if matching_techs:
                 relevant_projects.append({
                     "project": project,
-                    "relevance_score": relevance_score,
-                    "matching_techs": [tech for tech in project_techs if any(skill in tech for skill in jd_skills)]
+                    "relevance_score": len(matching_techs),
+                    "matching_techs": matching_techs
                 })
         
         # Sort by relevance
@@ -230,12 +332,8 @@ class JobDescriptionPlanner:
             "prompt_used": "JD analysis and skill matching prompt"
         }
         
-        log_file = f"logs/planner_interaction_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        try:
-            with open(log_file, 'w') as f:
-                json.dump(log_entry, f, indent=2)
-        except Exception as e:
-            print(f"Failed to log interaction: {e}")
+        # Queued for the background JSONL writer, never blocks the request
+        self.interaction_logger.log(log_entry, stream="planner_interactions")
 
 if __name__ == "__main__":
     # Test the planner
@@ -0,0 +1,73 @@
+"""
+Prefix KV Cache: Past key/values of static prompt prefixes, shared by the generator backends
+Holds torch tensors for the PyTorch generator and numpy arrays for the ONNX one;
+it never touches either library itself, so ONNX workers don't import torch.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+
+class PrefixKVCache:
+    """
+    LRU of past key/values for prompt prefixes (the instruction preamble plus the
+    candidate profile), bounded by the memory the tensors occupy. Entries are
+    keyed by a hash of the prefix text, so a new template or profile version is
+    simply a new entry.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "boundary_mismatches": 0,
+                       "speculative_bypasses": 0, "prompt_tokens": 0, "cached_tokens_used": 0}
+
+    @staticmethod
+    def key(prefix: str) -> str:
+        return hashlib.sha1(prefix.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry
+
+    def put(self, key: str, ids: List[int], layers: List[tuple]) -> Dict:
+        size = sum(tensor.nbytes for layer in layers for tensor in layer)
+        entry = {"ids": ids, "layers": layers, "bytes": size}
+        with self._lock:
+            if size > self.max_bytes:
+                return entry
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)["bytes"]
+            self._entries[key] = entry
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted["bytes"]
+                self._stats["evictions"] += 1
+        return entry
+
+    def record(self, **counts: int):
+        with self._lock:
+            for name, count in counts.items():
+                self._stats[name] += count
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = self._bytes
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["prefill_reduction"] = (round(stats["cached_tokens_used"] / stats["prompt_tokens"], 4)
+                                      if stats["prompt_tokens"] else 0.0)
+        stats["max_bytes"] = self.max_bytes
+        return stats
@@ -0,0 +1,134 @@
+"""
+Profile Provider: Shared, cached access to the user profile for all agents
+Parses profile.json once per file version and precomputes lookup structures
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from skill_index import SkillIndex, canonical_skill_id, skill_ids_in_text
+
+
+class ProfileSnapshot:
+    """
+    Immutable view of one version of a profile file.
+    Derived structures are built once here so agents never re-scan the raw dict.
+    """
+
+    def __init__(self, data: Dict, version: str, path: str):
+        self.data = data
+        self.version = version
+        self.path = path
+        self.loaded_at = time.time()
+
+        self.skills: List[str] = list(data.get("skills", []))
+        self.skills_lower = frozenset(skill.lower() for skill in self.skills)
+        self.skill_index = SkillIndex(self.skills)
+
+        self.projects: List[Dict] = list(data.get("projects", []))
+        self.project_technologies: List[tuple] = [
+            tuple(tech.lower() for tech in project.get("technologies", []))
+            for project in self.projects
+        ]
+        self.project_technology_ids: List[tuple] = [
+            tuple(canonical_skill_id(tech) for tech in techs)
+            for techs in self.project_technologies
+        ]
+        self.all_technologies = frozenset().union(*self.project_technologies) if self.project_technologies else frozenset()
+
+        self.experience: List[Dict] = list(data.get("experience", []))
+        self.experience_descriptions: List[str] = [
+            exp.get("description", "").lower() for exp in self.experience
+        ]
+        # Scanned in original case, which tells "Go" the language from "go live"
+        self.experience_skill_ids: List[frozenset] = [
+            frozenset(skill_ids_in_text(exp.get("description", ""))) for exp in self.experience
+        ]
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.data
+
+
+class ProfileProvider:
+    """
+    Process-wide cache of parsed profiles keyed by absolute path.
+
+    A cached snapshot is revalidated against the file's mtime/size at most once
+    every `revalidate_interval` seconds, so hot paths only pay for a dict lookup.
+    The snapshot version is a content hash, which makes it usable in cache keys.
+    """
+
+    def __init__(self, revalidate_interval: float = 1.0):
+        self.revalidate_interval = revalidate_interval
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def get(self, profile_path: str = "data/profile.json") -> ProfileSnapshot:
+        """Return the current snapshot for a profile file, reloading it if it changed"""
+        key = os.path.abspath(profile_path)
+        now = time.monotonic()
+
+        entry = self._entries.get(key)
+        if entry and now - entry["checked_at"] < self.revalidate_interval:
+            return entry["snapshot"]
+
+        with self._lock:
+            entry = self._entries.get(key)
+            stat_key = self._stat_key(key)
+
+            if entry and entry["stat_key"] == stat_key:
+                entry["checked_at"] = now
+                return entry["snapshot"]
+
+            snapshot = self._load(key, stat_key)
+            self._entries[key] = {
+                "snapshot": snapshot,
+                "stat_key": stat_key,
+                "checked_at": now
+            }
+            return snapshot
+
+    def get_profile(self, profile_path: str = "data/profile.json") -> Dict:
+        """Return the parsed profile dict (shared, treat as read-only)"""
+        return self.get(profile_path).data
+
+    def invalidate(self, profile_path: Optional[str] = None):
+        """Drop one cached profile, or all of them, forcing a reload on next access"""
+        with self._lock:
+            if profile_path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(profile_path), None)
+
+    def _stat_key(self, path: str) -> Optional[tuple]:
+        try:
+            stat = os.stat(path)
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+
+    def _load(self, path: str, stat_key: Optional[tuple]) -> ProfileSnapshot:
+        if stat_key is None:
+            return ProfileSnapshot({}, "empty", path)
+
+        try:
+            with open(path, 'rb') as f:
+                raw = f.read()
+            data = json.loads(raw)
+            version = hashlib.sha1(raw).hexdigest()[:16]
+            return ProfileSnapshot(data, version, path)
+        except Exception as e:
+            print(f"Error loading profile: {e}")
+            return ProfileSnapshot({}, "empty", path)
+
+
+_default_provider = ProfileProvider()
+
+
+def get_profile_provider() -> ProfileProvider:
+    """Shared provider used by the planner, executor and auto-fill agents"""
+    return _default_provider
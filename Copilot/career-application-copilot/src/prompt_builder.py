@@ -0,0 +1,234 @@
+"""
+Prompt Builder: Token-budgeted prompt assembly for the LLM calls
+Job descriptions are split into sections, boilerplate (EEO statements, benefits,
+application instructions) is dropped, and what remains is trimmed to a token
+budget measured with the target model's tokenizer. Assembled prompts are cached.
+"""
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence
+
+# Section headings, matched against the lowercased heading text (first match wins)
+SECTION_HEADINGS = [
+    ("boilerplate", re.compile(r"equal (employment )?opportunit|\beeo\b|diversity|inclusion|accommodation|"
+                               r"\bto apply\b|application (process|requirement)|disclaimer|privacy")),
+    ("benefits", re.compile(r"benefit|perks|what we offer|we offer|compensation|salary|why join|"
+                            r"learning opportunit|what you.?ll (get|gain|learn)")),
+    ("preferred", re.compile(r"prefer|nice to have|bonus|good to have|plus")),
+    ("requirements", re.compile(r"requirement|qualification|must have|skills|what you.?ll (need|bring)|"
+                                r"what we.?re looking|who you are|you have|eligibility")),
+    ("responsibilities", re.compile(r"responsibilit|what you.?ll do|role overview|duties|day to day|"
+                                    r"you will|the role|your role")),
+    ("stack", re.compile(r"tech(nical|nology)? stack|tools|technologies")),
+    ("about", re.compile(r"about|who we are|company overview|our (mission|story)|position summary|overview")),
+]
+
+# Sentences that are boilerplate wherever they appear
+BOILERPLATE_LINE = re.compile(
+    r"equal opportunity employer|without regard to|race, colou?r|sexual orientation|gender identity|"
+    r"reasonable accommodation|e-verify|protected veteran|applicants will receive consideration",
+    re.IGNORECASE
+)
+
+DROPPED_SECTIONS = frozenset({"boilerplate", "benefits"})
+
+# When a JD is still over budget, whole sections are dropped in this order
+SECTION_DROP_ORDER = ("about", "other", "stack", "preferred", "responsibilities")
+
+_HEADING_RE = re.compile(r"^\s*(?:#+\s*)?([A-Za-z][^:\n]{0,60}?)\s*:?\s*$")
+_BULLET_RE = re.compile(r"^\s*(?:[-*•·]|\d+[.)])\s+")
+
+
+def classify_heading(heading: str) -> str:
+    lowered = heading.lower()
+    for kind, pattern in SECTION_HEADINGS:
+        if pattern.search(lowered):
+            return kind
+    return "other"
+
+
+def _is_heading(line: str) -> bool:
+    stripped = line.strip()
+    if not stripped or _BULLET_RE.match(line) or len(stripped) > 60:
+        return False
+    if stripped.endswith(":"):
+        return True
+    # Bare headings ("Requirements", "## Benefits") only count if they name a known section
+    return bool(_HEADING_RE.match(stripped)) and classify_heading(stripped) != "other" and len(stripped.split()) <= 5
+
+
+def segment_job_description(jd_text: str) -> List[Dict]:
+    """
+    Split a JD into [{"kind", "heading", "lines"}]. Text before the first heading
+    (title, company, location) becomes the "header" section.
+    """
+    sections = [{"kind": "header", "heading": "", "lines": []}]
+    for raw_line in jd_text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        if _is_heading(line):
+            heading = line.rstrip(":").strip("# ").strip()
+            sections.append({"kind": classify_heading(heading), "heading": heading, "lines": []})
+        else:
+            sections[-1]["lines"].append(line)
+    return [section for section in sections if section["lines"] or section["heading"]]
+
+
+def _render_sections(sections: Sequence[Dict]) -> str:
+    blocks = []
+    for section in sections:
+        lines = ([f"{section['heading']}:"] if section["heading"] else []) + section["lines"]
+        blocks.append("\n".join(lines))
+    return "\n\n".join(block for block in blocks if block)
+
+
+class PromptBuilder:
+    """
+    tokenizer:         anything with .encode(text) (a HF tokenizer or a tiktoken encoding);
+                       without one, tokens are approximated as characters / 4
+    max_prompt_tokens: budget for a whole assembled prompt
+    jd_token_budget:   budget for the job description inside a prompt
+    """
+
+    def __init__(self,
+                 tokenizer=None,
+                 max_prompt_tokens: int = 1024,
+                 jd_token_budget: int = 600,
+                 cache_size: int = 256):
+        self.tokenizer = tokenizer
+        self.max_prompt_tokens = max_prompt_tokens
+        self.jd_token_budget = jd_token_budget
+        self.cache_size = cache_size
+
+        self._cache: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"prompts_built": 0, "cache_hits": 0, "jd_tokens_in": 0, "jd_tokens_out": 0,
+                       "prompt_tokens": 0, "sections_dropped": 0}
+
+    def count_tokens(self, text: str) -> int:
+        if not text:
+            return 0
+        if self.tokenizer is not None:
+            return len(self.tokenizer.encode(text))
+        return (len(text) + 3) // 4
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Cut text to at most max_tokens, on a word boundary when approximating"""
+        if max_tokens <= 0:
+            return ""
+        if self.count_tokens(text) <= max_tokens:
+            return text
+        if self.tokenizer is not None and hasattr(self.tokenizer, "decode"):
+            ids = self.tokenizer.encode(text)
+            return self.tokenizer.decode(ids[:max_tokens - 1]).rstrip() + "…"
+        cut = text[:max_tokens * 4 - 1]
+        if " " in cut:
+            cut = cut.rsplit(" ", 1)[0]
+        return cut.rstrip() + "…"
+
+    def prune_job_description(self, jd_text: str, token_budget: Optional[int] = None) -> Dict:
+        """
+        Drop boilerplate sections and lines, then low-priority sections, until the
+        JD fits the budget. Returns {"text", "tokens_in", "tokens_out", "dropped_sections"}.
+        """
+        budget = token_budget or self.jd_token_budget
+        sections = []
+        dropped = []
+        for section in segment_job_description(jd_text):
+            if section["kind"] in DROPPED_SECTIONS:
+                dropped.append(section["heading"])
+                continue
+            lines = [line for line in section["lines"] if not BOILERPLATE_LINE.search(line)]
+            if lines or section["kind"] == "header":
+                sections.append({**section, "lines": lines})
+
+        text = _render_sections(sections)
+        for kind in SECTION_DROP_ORDER:
+            if self.count_tokens(text) <= budget:
+                break
+            dropped.extend(section["heading"] for section in sections if section["kind"] == kind)
+            sections = [section for section in sections if section["kind"] != kind]
+            text = _render_sections(sections)
+
+        # Requirements and header are never dropped, only cut line by line
+        if self.count_tokens(text) > budget:
+            kept, used = [], 0
+            for line in text.splitlines():
+                cost = self.count_tokens(line) + 1
+                if used + cost > budget:
+                    break
+                kept.append(line)
+                used += cost
+            text = "\n".join(kept)
+
+        return {
+            "text": text,
+            "tokens_in": self.count_tokens(jd_text),
+            "tokens_out": self.count_tokens(text),
+            "dropped_sections": dropped
+        }
+
+    def fit_lines(self, lines: List[str], budget: int) -> List[str]:
+        """Keep lines in order within budget, first shortening each to an equal share"""
+        if not lines or budget <= 0:
+            return []
+        share = max(budget // len(lines), 16)
+        fitted, used = [], 0
+        for line in lines:
+            line = self.truncate(line, share)
+            cost = self.count_tokens(line) + 1
+            if used + cost > budget:
+                break
+            fitted.append(line)
+            used += cost
+        return fitted
+
+    def build(self, kind: str, key_parts: Sequence, render: Callable[[], str]) -> str:
+        """Return the cached prompt for (kind, key_parts), assembling it with render() on a miss"""
+        key = kind + ":" + hashlib.sha1(repr(tuple(key_parts)).encode("utf-8")).hexdigest()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self._stats["cache_hits"] += 1
+                return cached["prompt"]
+
+        prompt = render()
+        tokens = self.count_tokens(prompt)
+        with self._lock:
+            self._cache[key] = {"prompt": prompt, "tokens": tokens}
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            self._stats["prompts_built"] += 1
+            self._stats["prompt_tokens"] += tokens
+        return prompt
+
+    def build_with_jd(self, kind: str, template: str, jd_text: str, jd_placeholder: str = "jd_text",
+                      **fields) -> str:
+        """Render a str.format template with a pruned JD; the JD keeps whatever budget the template leaves"""
+        def render() -> str:
+            fixed = self.count_tokens(template.format(**{jd_placeholder: "", **fields}))
+            budget = min(self.jd_token_budget, max(self.max_prompt_tokens - fixed, 0))
+            pruned = self.prune_job_description(jd_text, budget)
+            with self._lock:
+                self._stats["jd_tokens_in"] += pruned["tokens_in"]
+                self._stats["jd_tokens_out"] += pruned["tokens_out"]
+                self._stats["sections_dropped"] += len(pruned["dropped_sections"])
+            return template.format(**{jd_placeholder: pruned["text"], **fields})
+
+        return self.build(kind, (template, jd_text, sorted(fields.items())), render)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["cached_prompts"] = len(self._cache)
+        requests = stats["prompts_built"] + stats["cache_hits"]
+        stats["cache_hit_rate"] = round(stats["cache_hits"] / requests, 4) if requests else 0.0
+        stats["avg_prompt_tokens"] = round(stats["prompt_tokens"] / stats["prompts_built"], 1) if stats["prompts_built"] else 0.0
+        stats["jd_token_reduction"] = (round(1 - stats["jd_tokens_out"] / stats["jd_tokens_in"], 4)
+                                       if stats["jd_tokens_in"] else 0.0)
+        stats["tokenizer"] = type(self.tokenizer).__name__ if self.tokenizer is not None else "approx_chars_per_4"
+        return stats
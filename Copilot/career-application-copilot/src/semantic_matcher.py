@@ -0,0 +1,173 @@
+"""
+Semantic Skill Matcher: Embedding-based matching for near-synonym skills
+Exact canonical matches are resolved first; remaining JD skills are compared
+against the profile with one normalized-embedding matrix product.
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from skill_index import SKILL_ALIASES, SkillIndex, canonical_skill_id
+
+
+class SemanticSkillMatcher:
+    """
+    Caches unit-norm skill embeddings by canonical skill ID.
+
+    The alias vocabulary is embedded once up front and kept for the life of the
+    matcher. Any other skill is encoded the first time it is seen and held in an
+    LRU of at most cache_size entries, since free-text JD skills are unbounded.
+    """
+
+    def __init__(self, embedding_model=None, threshold: float = 0.7, precompute_vocabulary: bool = True,
+                 cache_size: int = 4096):
+        self.embedding_model = embedding_model
+        self.threshold = threshold
+        self.cache_size = cache_size
+        self._vectors: Dict[str, np.ndarray] = {}
+        self._recent: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._profile_matrices: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        if embedding_model is not None and precompute_vocabulary:
+            vocabulary = [max(aliases, key=len) for aliases in SKILL_ALIASES.values()]
+            self.embed(vocabulary)
+
+    @property
+    def available(self) -> bool:
+        return self.embedding_model is not None
+
+    @property
+    def cached_skills(self) -> int:
+        return len(self._vectors) + len(self._recent)
+
+    def embed(self, skills: Iterable[str]) -> np.ndarray:
+        """Return an (n, dim) matrix of unit-norm embeddings, encoding only unseen skills"""
+        skills = list(skills)
+        ids = [canonical_skill_id(skill) for skill in skills]
+
+        # Vectors for this call are collected here, so LRU evictions can't drop them mid-request
+        found: Dict[str, np.ndarray] = {}
+        unseen = {}
+        with self._lock:
+            for skill, skill_id in zip(skills, ids):
+                if skill_id in found or skill_id in unseen:
+                    continue
+                vector = self._cached_vector(skill_id)
+                if vector is None:
+                    unseen[skill_id] = self._embedding_text(skill, skill_id)
+                else:
+                    found[skill_id] = vector
+
+            if unseen:
+                encoded = np.asarray(
+                    self.embedding_model.encode(list(unseen.values())),
+                    dtype=np.float32
+                )
+                norms = np.linalg.norm(encoded, axis=1, keepdims=True)
+                encoded /= np.maximum(norms, 1e-12)
+                for skill_id, vector in zip(unseen, encoded):
+                    found[skill_id] = vector
+                    self._cache_vector(skill_id, vector)
+
+        if not ids:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack([found[skill_id] for skill_id in ids])
+
+    def _cached_vector(self, skill_id: str) -> Optional[np.ndarray]:
+        vector = self._vectors.get(skill_id)
+        if vector is None:
+            vector = self._recent.get(skill_id)
+            if vector is not None:
+                self._recent.move_to_end(skill_id)
+        return vector
+
+    def _cache_vector(self, skill_id: str, vector: np.ndarray):
+        # Only the canonical vocabulary is pinned; everything else competes for cache_size slots
+        if skill_id in SKILL_ALIASES:
+            self._vectors[skill_id] = vector
+            return
+        self._recent[skill_id] = vector
+        self._recent.move_to_end(skill_id)
+        while len(self._recent) > self.cache_size:
+            self._recent.popitem(last=False)
+
+    def match(self,
+              required_skills: List[str],
+              skill_index: SkillIndex,
+              profile_version: Optional[str] = None) -> Dict:
+        """
+        Split required skills into matching/missing using exact IDs, then embeddings.
+        Returns the two lists plus the semantic pairs that were accepted.
+        """
+        matching, missing = skill_index.match(required_skills)
+        semantic_matches = []
+
+        if not self.available or not missing or not skill_index.skills:
+            return {"matching_skills": matching, "missing_skills": missing, "semantic_matches": semantic_matches}
+
+        try:
+            profile_skills = list(skill_index.by_id.values())
+            profile_matrix = self._profile_matrix(profile_skills, profile_version)
+            required_matrix = self.embed(missing)
+
+            similarities = required_matrix @ profile_matrix.T
+            best = similarities.argmax(axis=1)
+            best_scores = similarities[np.arange(len(missing)), best]
+        except Exception as e:
+            print(f"Semantic skill matching failed: {e}")
+            return {"matching_skills": matching, "missing_skills": missing, "semantic_matches": semantic_matches}
+
+        still_missing = []
+        for skill, column, score in zip(missing, best, best_scores):
+            if score >= self.threshold:
+                matching.append(skill)
+                semantic_matches.append({
+                    "required": skill,
+                    "matched_with": profile_skills[column],
+                    "similarity": round(float(score), 3)
+                })
+            else:
+                still_missing.append(skill)
+
+        return {"matching_skills": matching, "missing_skills": still_missing, "semantic_matches": semantic_matches}
+
+    def _profile_matrix(self, profile_skills: List[str], profile_version: Optional[str]) -> np.ndarray:
+        if profile_version is None:
+            return self.embed(profile_skills)
+
+        key = (profile_version, "|".join(profile_skills))
+        with self._lock:
+            matrix = self._profile_matrices.get(key)
+            if matrix is not None:
+                self._profile_matrices.move_to_end(key)
+                return matrix
+
+        matrix = self.embed(profile_skills)
+        with self._lock:
+            self._profile_matrices[key] = matrix
+            while len(self._profile_matrices) > 8:
+                self._profile_matrices.popitem(last=False)
+        return matrix
+
+    def _embedding_text(self, skill: str, skill_id: str) -> str:
+        aliases = SKILL_ALIASES.get(skill_id)
+        return max(aliases, key=len) if aliases else skill
+
+    def save(self, path: str):
+        """Persist the embedding cache as a compressed .npz file"""
+        with self._lock:
+            cached = {**self._recent, **self._vectors}
+        ids = list(cached)
+        matrix = np.stack([cached[skill_id] for skill_id in ids]) if ids else np.zeros((0, 0), dtype=np.float32)
+        np.savez_compressed(path, ids=np.array(ids), vectors=matrix)
+
+    def load(self, path: str):
+        """Warm the embedding cache from a file written by save()"""
+        data = np.load(path, allow_pickle=False)
+        with self._lock:
+            for skill_id, vector in zip(data["ids"].tolist(), data["vectors"]):
+                if self._cached_vector(skill_id) is None:
+                    self._cache_vector(skill_id, vector.astype(np.float32))
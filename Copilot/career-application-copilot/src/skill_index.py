@@ -0,0 +1,188 @@
+"""
+Skill Index: Canonical skill IDs, alias normalization and hashed skill matching
+Replaces substring containment (which made "Go" match "Google Cloud") with exact
+lookups on canonical IDs, so matching is linear in the number of skills.
+"""
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# canonical id -> known surface forms (all compared lowercased)
+SKILL_ALIASES: Dict[str, List[str]] = {
+    "python": ["python", "python3"],
+    "java": ["java"],
+    "javascript": ["javascript", "js", "ecmascript"],
+    "typescript": ["typescript", "ts"],
+    "go": ["go", "golang"],
+    "rust": ["rust"],
+    "cpp": ["c++", "cpp"],
+    "csharp": ["c#", "csharp"],
+    "sql": ["sql"],
+    "mysql": ["mysql"],
+    "postgresql": ["postgresql", "postgres"],
+    "mongodb": ["mongodb", "mongo"],
+    "react": ["react", "react.js", "reactjs"],
+    "nextjs": ["next.js", "nextjs"],
+    "vue": ["vue", "vue.js", "vuejs"],
+    "angular": ["angular", "angularjs"],
+    "nodejs": ["node.js", "nodejs", "node"],
+    "flask": ["flask"],
+    "django": ["django"],
+    "fastapi": ["fastapi"],
+    "tensorflow": ["tensorflow", "tf"],
+    "pytorch": ["pytorch", "torch"],
+    "keras": ["keras"],
+    "scikit_learn": ["scikit-learn", "sklearn", "scikit learn"],
+    "pandas": ["pandas"],
+    "numpy": ["numpy"],
+    "machine_learning": ["machine learning", "ml"],
+    "deep_learning": ["deep learning", "dl"],
+    "artificial_intelligence": ["artificial intelligence", "ai"],
+    "computer_vision": ["computer vision", "cv"],
+    "image_processing": ["image processing"],
+    "nlp": ["natural language processing", "nlp"],
+    "data_science": ["data science"],
+    "analytics": ["analytics", "data analytics"],
+    "statistics": ["statistics", "stats"],
+    "docker": ["docker"],
+    "kubernetes": ["kubernetes", "k8s"],
+    "aws": ["aws", "amazon web services"],
+    "azure": ["azure", "microsoft azure"],
+    "gcp": ["gcp", "google cloud", "google cloud platform"],
+    "git": ["git"],
+    "github": ["github"],
+    "gitlab": ["gitlab"],
+    "linux": ["linux"],
+    "unix": ["unix"],
+    "ubuntu": ["ubuntu"],
+    "api": ["api", "apis"],
+    "rest": ["rest", "rest api", "rest apis", "restful"],
+    "graphql": ["graphql"],
+    "android": ["android", "android sdk"],
+}
+
+MAX_ALIAS_WORDS = 4
+
+# Short aliases that are also ordinary words or abbreviations ("go live", "CV screening").
+# In free text they only count in the listed spelling and next to a list delimiter,
+# e.g. "Go, Python and Docker" or "ML/AI".
+AMBIGUOUS_ALIASES: Dict[str, Set[str]] = {
+    "go": {"Go", "GO"},
+    "ts": {"TS"},
+    "tf": {"TF"},
+    "cv": {"CV"},
+    "ai": {"AI"},
+    "ml": {"ML"},
+    "dl": {"DL"},
+    "node": {"Node"},
+    "stats": {"stats", "Stats"},
+}
+_LIST_DELIMITERS = set(",/;&|+()")
+
+_TOKEN_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9+#.\-]*")
+
+
+def _normalize(name: str) -> str:
+    return " ".join(name.lower().split()).strip(" .,;:")
+
+
+def _compact(key: str) -> str:
+    return re.sub(r"[\s.\-_]", "", key)
+
+
+_ALIAS_TO_ID: Dict[str, str] = {}
+_COMPACT_TO_ID: Dict[str, str] = {}
+for _skill_id, _aliases in SKILL_ALIASES.items():
+    for _alias in _aliases:
+        _ALIAS_TO_ID[_normalize(_alias)] = _skill_id
+        _COMPACT_TO_ID.setdefault(_compact(_normalize(_alias)), _skill_id)
+
+
+def canonical_skill_id(name: str) -> str:
+    """Map a skill name to its canonical ID; unknown skills map to their normalized form"""
+    key = _normalize(name)
+    skill_id = _ALIAS_TO_ID.get(key)
+    if skill_id:
+        return skill_id
+    return _COMPACT_TO_ID.get(_compact(key), key)
+
+
+def canonical_ids(names: Iterable[str]) -> Set[str]:
+    return {canonical_skill_id(name) for name in names}
+
+
+def _known_skill_id(phrase: str) -> Optional[str]:
+    """Canonical ID of a phrase that is a known alias, else None"""
+    skill_id = _ALIAS_TO_ID.get(phrase)
+    if skill_id:
+        return skill_id
+    compact = _compact(phrase)
+    # "m l" must not reach the "ml" alias through its compact form
+    return None if compact in AMBIGUOUS_ALIASES else _COMPACT_TO_ID.get(compact)
+
+
+def _in_skill_list(text: str, start: int, end: int) -> bool:
+    """Whether text[start:end] sits directly next to a list delimiter"""
+    before = text[:start].rstrip()
+    after = text[end:].lstrip()
+    return bool(before and before[-1] in _LIST_DELIMITERS) or bool(after and after[0] in _LIST_DELIMITERS)
+
+
+def skill_ids_in_text(text: str, max_words: int = MAX_ALIAS_WORDS) -> Set[str]:
+    """
+    Canonical IDs of the known skills (SKILL_ALIASES) mentioned in free text,
+    matching phrases of 1..max_words words. Short ambiguous aliases only count in
+    a skill-like spelling and context (see AMBIGUOUS_ALIASES).
+    """
+    tokens = []
+    for match in _TOKEN_RE.finditer(text):
+        surface = match.group().rstrip(".-")
+        tokens.append((surface, surface.lower(), match.start(), match.start() + len(surface)))
+
+    found = set()
+    for start in range(len(tokens)):
+        for length in range(1, max_words + 1):
+            if start + length > len(tokens):
+                break
+            phrase = " ".join(token[1] for token in tokens[start:start + length])
+            if length == 1 and phrase in AMBIGUOUS_ALIASES:
+                surface, _, begin, end = tokens[start]
+                if surface not in AMBIGUOUS_ALIASES[phrase] or not _in_skill_list(text, begin, end):
+                    continue
+            skill_id = _known_skill_id(phrase)
+            if skill_id:
+                found.add(skill_id)
+    return found
+
+
+class SkillIndex:
+    """Hashed index of one skill list (usually the user's profile skills)"""
+
+    def __init__(self, skills: Iterable[str]):
+        self.skills = list(skills)
+        self.by_id: Dict[str, str] = {}
+        for skill in self.skills:
+            self.by_id.setdefault(canonical_skill_id(skill), skill)
+
+    def __contains__(self, skill: str) -> bool:
+        return canonical_skill_id(skill) in self.by_id
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def match(self, required_skills: Iterable[str]) -> Tuple[List[str], List[str]]:
+        """
+        Split required skills into (matching, missing), preserving JD order.
+        Requirements that normalize to the same canonical ID are counted once.
+        """
+        matching, missing = [], []
+        seen = set()
+        for skill in required_skills:
+            skill_id = canonical_skill_id(skill)
+            if skill_id in seen:
+                continue
+            seen.add(skill_id)
+            if skill_id in self.by_id:
+                matching.append(skill)
+            else:
+                missing.append(skill)
+        return matching, missing
@@ -0,0 +1,148 @@
+"""
+Structured Output: Incremental validation of JSON being generated token by token
+The scanner follows a JSON prefix as it grows, so generation can stop as soon as
+the object closes or enough list items are complete, and can be cut off the
+moment the continuation stops looking like JSON.
+"""
+import json
+from typing import List, Optional
+
+# Characters that may appear outside strings in a JSON document
+_BARE_CHARS = frozenset("0123456789-+.eEtrufalsn:,")
+_CLOSERS = {"{": "}", "[": "]"}
+
+OPEN = "open"
+COMPLETE = "json_complete"
+MAX_ITEMS = "max_items"
+INVALID = "invalid"
+
+
+class JsonPrefixScanner:
+    """
+    Feed text as it is decoded; status() is one of OPEN, COMPLETE (root value
+    closed), MAX_ITEMS (max_items strings finished inside arrays) or INVALID.
+
+    max_items:    stop once this many array string items are complete (None = no limit)
+    max_preamble: non-whitespace characters tolerated before the opening brace
+    """
+
+    def __init__(self, max_items: Optional[int] = None, max_preamble: int = 0, max_depth: int = 4):
+        self.max_items = max_items
+        self.max_preamble = max_preamble
+        self.max_depth = max_depth
+
+        self.stack: List[str] = []
+        self.items = 0
+        self.consumed = 0
+        self._status = OPEN
+        self._started = False
+        self._preamble = 0
+        self._in_string = False
+        self._escape = False
+        # Offset just past the last "{", "[" or ",": where the current member starts
+        self.member_start = 0
+
+    def status(self) -> str:
+        return self._status
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    def feed(self, text: str) -> str:
+        for char in text:
+            if self._status != OPEN:
+                break
+            self.consumed += 1
+            self._step(char)
+        return self._status
+
+    @property
+    def in_string(self) -> bool:
+        return self._in_string
+
+    def closing_suffix(self) -> str:
+        """Characters that close every open string, array and object"""
+        suffix = '"' if self._in_string else ""
+        return suffix + self.closing_brackets()
+
+    def closing_brackets(self) -> str:
+        """Characters that close every open array and object"""
+        return "".join(_CLOSERS[opener] for opener in reversed(self.stack))
+
+    def _step(self, char: str):
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif char == "\\":
+                self._escape = True
+            elif char == '"':
+                self._in_string = False
+                if self.stack and self.stack[-1] == "[":
+                    self.items += 1
+                    if self.max_items is not None and self.items >= self.max_items:
+                        self._status = MAX_ITEMS
+            return
+
+        if char.isspace():
+            return
+        if not self._started:
+            if char in "{[":
+                self._started = True
+            else:
+                # Chatter before the JSON ("Here are your bullets:") is allowed up to a point
+                self._preamble += 1
+                if self._preamble > self.max_preamble:
+                    self._status = INVALID
+                return
+
+        if char in "{[":
+            self.stack.append(char)
+            self.member_start = self.consumed
+            if len(self.stack) > self.max_depth:
+                self._status = INVALID
+        elif char == ",":
+            self.member_start = self.consumed
+        elif char in "}]":
+            if not self.stack or _CLOSERS[self.stack.pop()] != char:
+                self._status = INVALID
+            elif not self.stack:
+                self._status = COMPLETE
+        elif char == '"':
+            self._in_string = True
+        elif char not in _BARE_CHARS:
+            self._status = INVALID
+
+
+def complete_json(text: str, max_items: Optional[int] = None) -> Optional[str]:
+    """
+    The JSON value at the start of text, closed off if generation stopped early
+    (after max_items) or ran out of tokens mid-value. A string cut off by the token
+    limit is dropped along with its key rather than closed, so a half-written
+    bullet never reaches the caller. None if the text is not JSON.
+    """
+    scanner = JsonPrefixScanner(max_items=max_items, max_preamble=len(text))
+    status = scanner.feed(text)
+    if status == INVALID or not scanner.started:
+        return None
+
+    start = next(i for i, char in enumerate(text) if char in "{[")
+    if scanner.in_string:
+        # Ran out mid-string: cut back to where that array item or object member began
+        body = text[start:scanner.member_start].rstrip().rstrip(",").rstrip()
+        return body + scanner.closing_brackets()
+
+    body = text[start:scanner.consumed].rstrip()
+    if status == COMPLETE:
+        return body
+    # A dangling comma or key separator can't be closed directly
+    body = body.rstrip(",:").rstrip()
+    return body + scanner.closing_suffix()
+
+
+def parse_json_prefix(text: str, max_items: Optional[int] = None):
+    """json.loads() of complete_json(text); raises ValueError when it can't be parsed"""
+    completed = complete_json(text, max_items=max_items)
+    if completed is None:
+        raise ValueError("output is not JSON")
+    return json.loads(completed)
@@ -1,32 +1,19 @@
 """
 Tracker Agent: Logs applications and manages application status
 """
-import csv
 import json
-import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
-import pandas as pd
+
+from tracker_analytics import analyze, match_score_summary
+from tracker_history import history_metrics
+from tracker_storage import open_tracker_storage
 
 class ApplicationTracker:
-    def __init__(self, log_file: str = "logs/applications.csv"):
+    def __init__(self, log_file: str = "logs/applications.csv", backend: Optional[str] = None):
+        """backend: "sqlite" or "csv" (default: TRACKER_BACKEND, else sqlite)"""
         self.log_file = log_file
-        self.ensure_log_file_exists()
-    
-    def ensure_log_file_exists(self):
-        """Create log file with headers if it doesn't exist"""
-        if not os.path.exists(self.log_file):
-            os.makedirs(os.path.dirname(self.log_file), exist_ok=True)
-            
-            headers = [
-                "timestamp", "company", "role", "job_type", "location", 
-                "jd_snippet", "bullets", "cover_letter_snippet", "status",
-                "match_score", "skills_matched", "application_url", "notes"
-            ]
-            
-            with open(self.log_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(headers)
+        self.storage = open_tracker_storage(log_file, backend)
     
     def log_application(self, 
                        company: str, 
@@ -56,11 +43,8 @@ class ApplicationTracker:
             "notes": notes
         }
         
-        # Append to CSV
         try:
-            with open(self.log_file, 'a', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=row_data.keys())
-                writer.writerow(row_data)
+            self.storage.append(row_data)
             
             application_id = f"{company}_{role}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
             print(f"✅ Application logged: {application_id}")
@@ -73,27 +57,11 @@ class ApplicationTracker:
     def update_status(self, company: str, role: str, new_status: str, notes: str = ""):
         """Update application status"""
         try:
-            # Read current data
-            df = pd.read_csv(self.log_file)
-            
-            # Find matching application (most recent if multiple)
-            mask = (df['company'] == company) & (df['role'] == role)
-            matching_rows = df[mask]
-            
-            if matching_rows.empty:
+            # Updates the most recent application if there are several
+            if not self.storage.update_latest(company, role, new_status, notes):
                 print(f"❌ No application found for {company} - {role}")
                 return False
             
-            # Update the most recent application
-            latest_idx = matching_rows.index[-1]
-            df.loc[latest_idx, 'status'] = new_status
-            
-            if notes:
-                existing_notes = df.loc[latest_idx, 'notes']
-                df.loc[latest_idx, 'notes'] = f"{existing_notes} | {datetime.now().strftime('%Y-%m-%d')}: {notes}"
-            
-            # Save back to CSV
-            df.to_csv(self.log_file, index=False)
             print(f"✅ Status updated: {company} - {role} -> {new_status}")
             return True
             
@@ -101,51 +69,38 @@ class ApplicationTracker:
             print(f"❌ Failed to update status: {e}")
             return False
     
+    def get_application_history(self, company: str, role: str) -> List[Dict]:
+        """Status changes of the most recent company/role application, oldest first"""
+        try:
+            return self.storage.history(company, role)
+        except Exception as e:
+            print(f"❌ Failed to get application history: {e}")
+            return []
+    
     def get_applications_summary(self) -> Dict:
         """Get summary statistics of applications"""
         try:
-            df = pd.read_csv(self.log_file)
-            
-            if df.empty:
-                return {"total": 0, "by_status": {}, "by_company": {}, "avg_match_score": 0}
-            
-            summary = {
-                "total": len(df),
-                "by_status": df['status'].value_counts().to_dict(),
-                "by_company": df['company'].value_counts().head(10).to_dict(),
-                "by_role": df['role'].value_counts().head(10).to_dict(),
-                "avg_match_score": df['match_score'].mean(),
-                "recent_applications": df.tail(5)[['timestamp', 'company', 'role', 'status']].to_dict('records')
-            }
-            
-            return summary
+            return self.storage.summary()
             
         except Exception as e:
             print(f"❌ Failed to generate summary: {e}")
             return {"error": str(e)}
     
+    def verify_aggregates(self) -> Dict:
+        """Compare the running aggregates and history counters with a full recompute over every application and status event"""
+        try:
+            mismatches = self.storage.verify_aggregates()
+            return {"consistent": not mismatches, "mismatches": mismatches}
+        except Exception as e:
+            print(f"❌ Failed to verify aggregates: {e}")
+            return {"error": str(e)}
+    
     def get_pending_followups(self, days_threshold: int = 7) -> List[Dict]:
         """Get applications that need follow-up"""
         try:
-            df = pd.read_csv(self.log_file)
-            
-            if df.empty:
-                return []
-            
-            # Convert timestamp to datetime
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            
-            # Find applications older than threshold with no response
+            # Applications older than threshold with no response
             cutoff_date = datetime.now() - timedelta(days=days_threshold)
-            
-            pending_mask = (
-                (df['status'] == 'applied') & 
-                (df['timestamp'] < cutoff_date)
-            )
-            
-            pending_apps = df[pending_mask]
-            
-            return pending_apps[['company', 'role', 'timestamp', 'application_url']].to_dict('records')
+            return self.storage.pending(cutoff_date)
             
         except Exception as e:
             print(f"❌ Failed to get pending follow-ups: {e}")
@@ -154,10 +109,7 @@ class ApplicationTracker:
     def export_applications(self, format: str = "json", filter_status: str = None) -> str:
         """Export applications to different formats"""
         try:
-            df = pd.read_csv(self.log_file)
-            
-            if filter_status:
-                df = df[df['status'] == filter_status]
+            df = self.storage.dataframe(filter_status)
             
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             
@@ -178,29 +130,41 @@ class ApplicationTracker:
             print(f"❌ Failed to export: {e}")
             return ""
     
-    def get_application_analytics(self) -> Dict:
-        """Advanced analytics on application data"""
+    def get_application_analytics(self, recompute: bool = False) -> Dict:
+        """Advanced analytics on application data, read from the running aggregates and history
+        counters (recompute=True rebuilds them from every application and status event instead)"""
         try:
-            df = pd.read_csv(self.log_file)
-            
-            if df.empty:
-                return {"message": "No data available"}
-            
-            # Convert timestamp to datetime
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            df['date'] = df['timestamp'].dt.date
+            if recompute:
+                df = self.storage.dataframe()
+                
+                if df.empty:
+                    return {"message": "No data available"}
+                
+                analytics = analyze(df)
+            else:
+                aggregates = self.storage.aggregates()
+                
+                if not aggregates.total():
+                    return {"message": "No data available"}
+                
+                analytics = {
+                    "applications_over_time": aggregates.per_day(30),
+                    "success_rate_by_company": aggregates.success_rates('company'),
+                    "success_rate_by_role": aggregates.success_rates('role'),
+                    "match_score_vs_success": match_score_summary(*aggregates.match_score_by_success()),
+                    "top_skills_in_successful_apps": aggregates.top_successful('skill')
+                }
             
-            analytics = {
-                "applications_over_time": df.groupby('date').size().tail(30).to_dict(),
-                "success_rate_by_company": self._calculate_success_rates(df, 'company'),
-                "success_rate_by_role": self._calculate_success_rates(df, 'role'),
-                "match_score_vs_success": self._analyze_match_score_correlation(df),
-                "top_skills_in_successful_apps": self._analyze_successful_skills(df),
+            history = history_metrics(self.storage.events()) if recompute else self.storage.history_metrics()
+            analytics.update({
                 "application_timeline": {
-                    "fastest_response": self._get_fastest_response(df),
-                    "average_response_time": self._get_average_response_time(df)
-                }
-            }
+                    "fastest_response": self._get_fastest_response(history),
+                    "average_response_time": self._get_average_response_time(history),
+                    "response_rate": history["response_rate"]
+                },
+                "funnel": history["funnel"],
+                "funnel_conversion": history["conversion"]
+            })
             
             return analytics
             
@@ -208,54 +172,18 @@ class ApplicationTracker:
             print(f"❌ Failed to generate analytics: {e}")
             return {"error": str(e)}
     
-    def _calculate_success_rates(self, df: pd.DataFrame, group_by: str) -> Dict:
-        """Calculate success rates grouped by specified column"""
-        success_statuses = ['interview', 'offer', 'accepted']
-        
-        grouped = df.groupby(group_by)['status'].apply(
-            lambda x: (x.isin(success_statuses).sum() / len(x)) * 100
-        ).round(2)
-        
-        return grouped.to_dict()
-    
-    def _analyze_match_score_correlation(self, df: pd.DataFrame) -> Dict:
-        """Analyze correlation between match score and success"""
-        success_statuses = ['interview', 'offer', 'accepted']
-        
-        successful = df[df['status'].isin(success_statuses)]['match_score'].mean()
-        unsuccessful = df[~df['status'].isin(success_statuses)]['match_score'].mean()
-        
-        return {
-            "avg_match_score_successful": round(successful, 3) if not pd.isna(successful) else 0,
-            "avg_match_score_unsuccessful": round(unsuccessful, 3) if not pd.isna(unsuccessful) else 0,
-            "correlation": "positive" if successful > unsuccessful else "negative"
-        }
-    
-    def _analyze_successful_skills(self, df: pd.DataFrame) -> List[str]:
-        """Find most common skills in successful applications"""
-        success_statuses = ['interview', 'offer', 'accepted']
-        successful_apps = df[df['status'].isin(success_statuses)]
-        
-        all_skills = []
-        for skills_str in successful_apps['skills_matched'].dropna():
-            skills = [skill.strip() for skill in skills_str.split(',')]
-            all_skills.extend(skills)
-        
-        if not all_skills:
-            return []
-        
-        skill_counts = pd.Series(all_skills).value_counts().head(10)
-        return skill_counts.index.tolist()
+    def _get_fastest_response(self, history: Dict) -> str:
+        """Get fastest response time (applied to first status change)"""
+        return self._format_hours(history["fastest_response_hours"])
     
-    def _get_fastest_response(self, df: pd.DataFrame) -> str:
-        """Get fastest response time"""
-        # This would require parsing response dates - simplified for now
-        return "Feature coming soon"
+    def _get_average_response_time(self, history: Dict) -> str:
+        """Get average response time (applied to first status change)"""
+        return self._format_hours(history["average_response_hours"])
     
-    def _get_average_response_time(self, df: pd.DataFrame) -> str:
-        """Get average response time"""
-        # This would require parsing response dates - simplified for now
-        return "Feature coming soon"
+    def _format_hours(self, hours: Optional[float]) -> str:
+        if hours is None:
+            return "No responses yet"
+        return f"{hours:.1f} hours" if hours < 48 else f"{hours / 24:.1f} days"
     
     def display_dashboard(self):
         """Display a simple text dashboard"""
@@ -0,0 +1,142 @@
+"""
+Tracker Aggregates: Running counters behind the tracker summary, dashboard and analytics
+Each application contributes to one counter row per dimension it belongs to:
+all, status, company, role, day (of its timestamp) and each matched skill. A row
+holds the application count, how many of those are successful, and match-score
+sums split by success. Logging an application adds its contribution; a status
+change removes the old contribution and adds the new one. Summaries then read
+the counters instead of rescanning every application, and from_rows() rebuilds
+them from scratch to check they have not drifted.
+"""
+import heapq
+import math
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SUCCESS_STATUSES = ("interview", "offer", "accepted")
+FIELDS = ("count", "success", "score_count", "score_sum", "success_score_count", "success_score_sum")
+# Integer fields compare exactly; score sums are floats added in different orders
+_SCORE_FIELDS = {3, 5}
+
+AggregateKey = Tuple[str, str]
+
+
+def _score(value) -> Optional[float]:
+    try:
+        score = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(score) else score
+
+
+def _text(value) -> Optional[str]:
+    # Empty CSV cells come back as "" from csv and NaN from pandas
+    if value is None or value == "" or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return str(value)
+
+
+def application_keys(row: Dict) -> List[AggregateKey]:
+    """The counter rows an application contributes to"""
+    keys = [("all", "")]
+    for dimension, column in (("status", "status"), ("company", "company"), ("role", "role")):
+        value = _text(row.get(column))
+        if value is not None:
+            keys.append((dimension, value))
+    timestamp = _text(row.get("timestamp"))
+    if timestamp:
+        keys.append(("day", timestamp[:10]))
+    skills = _text(row.get("skills_matched"))
+    if skills:
+        keys.extend(("skill", skill.strip()) for skill in skills.split(",") if skill.strip())
+    return keys
+
+
+def application_vector(row: Dict, sign: int = 1) -> List[float]:
+    """One application's contribution to each of its counter rows (negated with sign=-1)"""
+    success = _text(row.get("status")) in SUCCESS_STATUSES
+    score = _score(row.get("match_score"))
+    scored = score is not None
+    return [sign, sign * success, sign * scored, sign * (score or 0.0),
+            sign * (success and scored), sign * (score or 0.0) * success]
+
+
+class TrackerAggregates:
+    """Counter rows keyed by (dimension, key), kept in order of first appearance"""
+
+    def __init__(self, counters: Optional[Dict[AggregateKey, List[float]]] = None):
+        self.counters: Dict[AggregateKey, List[float]] = counters if counters is not None else {}
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict]) -> "TrackerAggregates":
+        """Full recompute over every application"""
+        aggregates = cls()
+        for row in rows:
+            aggregates.add_application(row)
+        return aggregates
+
+    def add_application(self, row: Dict, sign: int = 1):
+        vector = application_vector(row, sign)
+        for key in application_keys(row):
+            counter = self.counters.get(key)
+            if counter is None:
+                self.counters[key] = list(vector)
+            else:
+                for index, value in enumerate(vector):
+                    counter[index] += value
+
+    def change_status(self, row: Dict, new_status: str):
+        """row as it was before the change"""
+        self.add_application(row, -1)
+        self.add_application({**row, "status": new_status})
+
+    def diff(self, other: "TrackerAggregates") -> Dict[str, Dict]:
+        """Counter rows that differ from other ({"dimension:key": {"stored": ..., "recomputed": ...}})"""
+        mismatches = {}
+        empty = [0] * len(FIELDS)
+        for key in list(self.counters) + [key for key in other.counters if key not in self.counters]:
+            mine, theirs = self.counters.get(key, empty), other.counters.get(key, empty)
+            if any(not math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-6) if index in _SCORE_FIELDS else a != b
+                   for index, (a, b) in enumerate(zip(mine, theirs))):
+                mismatches[f"{key[0]}:{key[1]}"] = {"stored": dict(zip(FIELDS, mine)),
+                                                    "recomputed": dict(zip(FIELDS, theirs))}
+        return mismatches
+
+    def total(self) -> int:
+        return int(self.counters.get(("all", ""), [0])[0])
+
+    def counts(self, dimension: str, limit: Optional[int] = None) -> Dict[str, int]:
+        """Application counts, most frequent first (ties in order of first appearance)"""
+        rows = [(key[1], int(vector[0])) for key, vector in self.counters.items()
+                if key[0] == dimension and vector[0] > 0]
+        if limit is not None:
+            return dict(heapq.nlargest(limit, rows, key=lambda item: item[1]))
+        return dict(sorted(rows, key=lambda item: -item[1]))
+
+    def success_rates(self, dimension: str) -> Dict[str, float]:
+        """Percent of applications in a success status, by key in sorted order"""
+        return {key[1]: round(vector[1] / vector[0] * 100, 2)
+                for key, vector in sorted(self.counters.items()) if key[0] == dimension and vector[0] > 0}
+
+    def average_match_score(self) -> float:
+        vector = self.counters.get(("all", ""))
+        return vector[3] / vector[2] if vector and vector[2] else float("nan")
+
+    def match_score_by_success(self) -> Tuple[float, float]:
+        """Average match score of successful and of unsuccessful applications (NaN when there are none)"""
+        vector = self.counters.get(("all", ""), [0] * len(FIELDS))
+        successful = vector[5] / vector[4] if vector[4] else float("nan")
+        unsuccessful_count = vector[2] - vector[4]
+        unsuccessful = (vector[3] - vector[5]) / unsuccessful_count if unsuccessful_count else float("nan")
+        return successful, unsuccessful
+
+    def per_day(self, last: int = 30) -> Dict[date, int]:
+        """Applications per day for the most recent days that have any, oldest first"""
+        days = sorted((key[1], int(vector[0])) for key, vector in self.counters.items()
+                      if key[0] == "day" and vector[0] > 0)
+        return {date.fromisoformat(day): count for day, count in days[-last:]}
+
+    def top_successful(self, dimension: str, limit: int = 10) -> List[str]:
+        """Keys that appear most often in successful applications"""
+        rows = [(key[1], vector[1]) for key, vector in self.counters.items() if key[0] == dimension and vector[1] > 0]
+        return [key for key, _ in heapq.nlargest(limit, rows, key=lambda item: item[1])]
@@ -0,0 +1,73 @@
+"""
+Tracker Analytics: Vectorized analytics over a full table of tracked applications
+The from-scratch counterpart of the running aggregates: success rates are a
+groupby mean over one boolean column, skills are counted with value_counts /
+str.split / explode, and the success mask is computed once and shared, so there
+are no per-row Python loops or per-group lambdas.
+"""
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from tracker_aggregates import SUCCESS_STATUSES
+
+
+def success_mask(df: pd.DataFrame) -> pd.Series:
+    return df['status'].isin(SUCCESS_STATUSES)
+
+
+def applications_over_time(df: pd.DataFrame, last: int = 30) -> Dict:
+    """Applications per day for the most recent days that have any, keyed by date"""
+    days = pd.to_datetime(df['timestamp'], format="ISO8601").dt.normalize()
+    counts = days.value_counts().sort_index().tail(last)
+    return {day.date(): int(count) for day, count in counts.items()}
+
+
+def success_rates(df: pd.DataFrame, group_by: str, success: Optional[pd.Series] = None) -> Dict:
+    """Percent of applications in a success status, per value of group_by"""
+    success = success_mask(df) if success is None else success
+    return (success.groupby(df[group_by]).mean() * 100).round(2).to_dict()
+
+
+def match_score_summary(successful: float, unsuccessful: float) -> Dict:
+    return {
+        "avg_match_score_successful": round(successful, 3) if not pd.isna(successful) else 0,
+        "avg_match_score_unsuccessful": round(unsuccessful, 3) if not pd.isna(unsuccessful) else 0,
+        "correlation": "positive" if successful > unsuccessful else "negative"
+    }
+
+
+def match_score_correlation(df: pd.DataFrame, success: Optional[pd.Series] = None) -> Dict:
+    """Average match score of successful vs. unsuccessful applications"""
+    success = success_mask(df) if success is None else success
+    scores = df['match_score']
+    return match_score_summary(scores[success].mean(), scores[~success].mean())
+
+
+def successful_skills(df: pd.DataFrame, success: Optional[pd.Series] = None, limit: int = 10) -> List[str]:
+    """Most common matched skills in successful applications"""
+    success = success_mask(df) if success is None else success
+    skill_lists = df.loc[success, 'skills_matched'].dropna()
+    if skill_lists.empty:
+        return []
+    # A column read from CSV with no skills at all (or only numbers) does not load as strings
+    skill_lists = skill_lists.astype(str)
+    # Applications repeat the same skill lists, so split each distinct list once and weight it by its count
+    list_counts = skill_lists.value_counts(sort=False)
+    skills = list_counts.index.to_series().str.split(',').explode().str.strip()
+    weighted = pd.Series(list_counts.reindex(skills.index).to_numpy(), index=skills.to_numpy())
+    # Stable sort keeps ties in order of first appearance, as value_counts does
+    totals = weighted.groupby(level=0, sort=False).sum()
+    return totals.sort_values(ascending=False, kind="stable").head(limit).index.tolist()
+
+
+def analyze(df: pd.DataFrame) -> Dict:
+    """Everything get_application_analytics derives from the application rows"""
+    success = success_mask(df)
+    return {
+        "applications_over_time": applications_over_time(df),
+        "success_rate_by_company": success_rates(df, 'company', success),
+        "success_rate_by_role": success_rates(df, 'role', success),
+        "match_score_vs_success": match_score_correlation(df, success),
+        "top_skills_in_successful_apps": successful_skills(df, success)
+    }
@@ -0,0 +1,157 @@
+"""
+Tracker History: Response-time and funnel metrics from application status events
+Every status change is an event (application_id, status, timestamp), applied
+first. HistoryMetrics folds events in order in a single pass, keeping only the
+application time and furthest stage per application, so the metrics cost one
+scan of the event log however long the history gets.
+
+counters() are the metrics as running totals. The storage backends keep them
+up to date as events are added: event_delta() needs only the new event's own
+application history. Reading the metrics then needs no scan of the log at all.
+"""
+import math
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+FUNNEL_STAGES = ["applied", "interview", "offer", "accepted"]
+_STAGE_INDEX = {stage: index for index, stage in enumerate(FUNNEL_STAGES)}
+
+# (application_id, status, ISO timestamp or None when the time is unknown)
+StatusEvent = Tuple[int, str, Optional[str]]
+
+# Counter names whose stored value is a minimum rather than a running sum
+_MIN_COUNTERS = {"fastest_response_seconds"}
+
+
+class HistoryMetrics:
+    """Running response times and funnel counts; feed events with add() in log order"""
+
+    def __init__(self):
+        # Kept as strings; only applications that get a response need theirs parsed
+        self._applied_at: Dict[int, Optional[str]] = {}
+        self._furthest: Dict[int, int] = {}
+        self._responded = set()
+        self._rejected = set()
+        # Applications by the furthest funnel stage they reached
+        self._at_stage = [0] * len(FUNNEL_STAGES)
+        self._timed = 0
+        self._response_seconds = 0.0
+        self._fastest: Optional[float] = None
+
+    def add(self, application_id: int, status: str, timestamp: Optional[str]):
+        if status == "applied":
+            self._applied_at.setdefault(application_id, timestamp)
+            self._advance(application_id, 0)
+            return
+
+        # The first change away from "applied" is the company's response
+        if application_id not in self._responded:
+            self._responded.add(application_id)
+            applied_at = self._applied_at.get(application_id)
+            if timestamp and applied_at:
+                elapsed = datetime.fromisoformat(timestamp) - datetime.fromisoformat(applied_at)
+                seconds = max(elapsed.total_seconds(), 0.0)
+                self._timed += 1
+                self._response_seconds += seconds
+                self._fastest = seconds if self._fastest is None else min(self._fastest, seconds)
+        if status == "rejected":
+            self._rejected.add(application_id)
+        elif status in _STAGE_INDEX:
+            self._advance(application_id, _STAGE_INDEX[status])
+
+    def add_all(self, events: Iterable[StatusEvent]) -> "HistoryMetrics":
+        for application_id, status, timestamp in events:
+            self.add(application_id, status, timestamp)
+        return self
+
+    def counters(self) -> Dict[str, float]:
+        """The metrics as named counters; sums except fastest_response_seconds (absent until a timed response)"""
+        counters = {
+            "applications": len(self._furthest),
+            "responses": len(self._responded),
+            "rejected": len(self._rejected),
+            "timed_responses": self._timed,
+            "response_seconds": self._response_seconds
+        }
+        counters.update({f"furthest:{stage}": count for stage, count in zip(FUNNEL_STAGES, self._at_stage)})
+        if self._fastest is not None:
+            counters["fastest_response_seconds"] = self._fastest
+        return counters
+
+    def result(self) -> Dict:
+        return metrics_from_counters(self.counters())
+
+    def _advance(self, application_id: int, stage: int):
+        previous = self._furthest.get(application_id)
+        if previous is not None and previous >= stage:
+            return
+        if previous is not None:
+            self._at_stage[previous] -= 1
+        self._at_stage[stage] += 1
+        self._furthest[application_id] = stage
+
+
+def metrics_from_counters(counters: Dict[str, float]) -> Dict:
+    """Response-time and funnel metrics from HistoryMetrics.counters() (or stored copies of them)"""
+    applications = int(counters.get("applications", 0))
+    reached = [int(counters.get(f"furthest:{stage}", 0)) for stage in FUNNEL_STAGES]
+    # An application that got an offer also passed the interview stage, and so on
+    for index in range(len(reached) - 2, -1, -1):
+        reached[index] += reached[index + 1]
+
+    funnel = dict(zip(FUNNEL_STAGES, reached))
+    conversion = {
+        f"{previous}->{stage}": round(funnel[stage] / funnel[previous] * 100, 2) if funnel[previous] else 0.0
+        for previous, stage in zip(FUNNEL_STAGES, FUNNEL_STAGES[1:])
+    }
+    responses = int(counters.get("responses", 0))
+    timed = int(counters.get("timed_responses", 0))
+    fastest = counters.get("fastest_response_seconds")
+    return {
+        "applications": applications,
+        "responses": responses,
+        "response_rate": round(responses / applications * 100, 2) if applications else 0.0,
+        "timed_responses": timed,
+        "fastest_response_hours": round(fastest / 3600, 2) if timed and fastest is not None else None,
+        "average_response_hours": round(counters.get("response_seconds", 0.0) / timed / 3600, 2) if timed else None,
+        "funnel": funnel,
+        "conversion": conversion,
+        "rejected": int(counters.get("rejected", 0))
+    }
+
+
+def event_delta(previous: Iterable[StatusEvent], event: StatusEvent) -> Dict[str, float]:
+    """
+    Counter changes from appending event to its application's earlier events.
+    Events of other applications never change how this one's are counted, so
+    only that application's history has to be read.
+    """
+    metrics = HistoryMetrics().add_all(previous)
+    before = metrics.counters()
+    metrics.add(*event)
+    after = metrics.counters()
+    delta = {name: value - before.get(name, 0) for name, value in after.items()
+             if name not in _MIN_COUNTERS and value != before.get(name, 0)}
+    for name in _MIN_COUNTERS:
+        if name in after and after[name] != before.get(name):
+            delta[name] = after[name]
+    return delta
+
+
+def diff_counters(stored: Dict[str, float], recomputed: Dict[str, float]) -> Dict[str, Dict]:
+    """Counters that differ from a full recompute ({"history:name": {"stored": ..., "recomputed": ...}})"""
+    mismatches = {}
+    for name in list(stored) + [name for name in recomputed if name not in stored]:
+        mine, theirs = stored.get(name), recomputed.get(name)
+        if mine is None or theirs is None:
+            equal = mine == theirs or not (mine or theirs)
+        else:
+            equal = math.isclose(mine, theirs, rel_tol=1e-9, abs_tol=1e-6)
+        if not equal:
+            mismatches[f"history:{name}"] = {"stored": mine, "recomputed": theirs}
+    return mismatches
+
+
+def history_metrics(events: Iterable[StatusEvent]) -> Dict:
+    """Response-time and funnel metrics over a status event log, in one pass"""
+    return HistoryMetrics().add_all(events).result()
@@ -0,0 +1,558 @@
+"""
+Tracker Storage: Pluggable backends for the application tracker
+CsvTrackerStorage keeps the original logs/applications.csv layout (every status
+update rewrites the file). SqliteTrackerStorage keeps the same columns in a
+SQLite database in WAL mode, indexed on company, role, status and timestamp, so
+logging, status updates and summaries are indexed queries and several workers
+can share one tracker.
+
+Both backends also keep an append-only log of status events (logging an
+application is its "applied" event). The application rows are the current-state
+view of that log, updated together with each event, and the running counters in
+tracker_aggregates are updated alongside them. So are the response-time and funnel
+counters from tracker_history: each event only needs its own application's
+earlier events to update them.
+"""
+import csv
+import os
+import sqlite3
+import threading
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import pandas as pd
+
+from tracker_aggregates import FIELDS, TrackerAggregates
+from tracker_history import HistoryMetrics, StatusEvent, diff_counters, event_delta, metrics_from_counters
+
+COLUMNS = [
+    "timestamp", "company", "role", "job_type", "location",
+    "jd_snippet", "bullets", "cover_letter_snippet", "status",
+    "match_score", "skills_matched", "application_url", "notes"
+]
+EVENT_COLUMNS = ["timestamp", "application_id", "status", "note"]
+RECENT_COLUMNS = ["timestamp", "company", "role", "status"]
+# What an application contributes to the aggregates
+_AGGREGATE_COLUMNS = ["timestamp", "company", "role", "status", "match_score", "skills_matched"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS applications (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    company TEXT,
+    role TEXT,
+    job_type TEXT,
+    location TEXT,
+    jd_snippet TEXT,
+    bullets TEXT,
+    cover_letter_snippet TEXT,
+    status TEXT,
+    match_score REAL,
+    skills_matched TEXT,
+    application_url TEXT,
+    notes TEXT
+);
+CREATE INDEX IF NOT EXISTS applications_company_role ON applications (company, role);
+CREATE INDEX IF NOT EXISTS applications_role ON applications (role);
+CREATE INDEX IF NOT EXISTS applications_status ON applications (status, timestamp);
+CREATE INDEX IF NOT EXISTS applications_timestamp ON applications (timestamp);
+CREATE TABLE IF NOT EXISTS status_events (
+    event_id INTEGER PRIMARY KEY,
+    application_id INTEGER NOT NULL REFERENCES applications (id),
+    status TEXT NOT NULL,
+    timestamp TEXT,
+    note TEXT
+);
+CREATE INDEX IF NOT EXISTS status_events_application ON status_events (application_id, event_id);
+CREATE TABLE IF NOT EXISTS aggregates (
+    dimension TEXT NOT NULL,
+    key TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    success INTEGER NOT NULL,
+    score_count INTEGER NOT NULL,
+    score_sum REAL NOT NULL,
+    success_score_count INTEGER NOT NULL,
+    success_score_sum REAL NOT NULL,
+    PRIMARY KEY (dimension, key)
+);
+CREATE INDEX IF NOT EXISTS aggregates_count ON aggregates (dimension, count);
+CREATE TABLE IF NOT EXISTS history_counters (
+    name TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+"""
+
+
+def _note_line(notes: str) -> str:
+    return f"{datetime.now().strftime('%Y-%m-%d')}: {notes}"
+
+
+def _summary(aggregates: TrackerAggregates, recent: List[Dict],
+             by_company: Optional[Dict] = None, by_role: Optional[Dict] = None) -> Dict:
+    total = aggregates.total()
+    if not total:
+        return {"total": 0, "by_status": {}, "by_company": {}, "avg_match_score": 0}
+    return {
+        "total": total,
+        "by_status": aggregates.counts("status"),
+        "by_company": by_company if by_company is not None else aggregates.counts("company", 10),
+        "by_role": by_role if by_role is not None else aggregates.counts("role", 10),
+        "avg_match_score": aggregates.average_match_score(),
+        "recent_applications": recent
+    }
+
+
+def _as_status_event(event: List) -> StatusEvent:
+    """(application_id, status, timestamp) of an [timestamp, application_id, status, note] event row"""
+    return event[1], event[2], event[0]
+
+
+def _initial_events(application_id: int, row: Dict) -> Iterator[List]:
+    """Events for a logged row: applied at its timestamp, plus its current status if it has moved on
+    (rows from before the event log have no record of when that happened, so that event has no time)"""
+    yield [row.get("timestamp"), application_id, "applied", None]
+    status = row.get("status")
+    if status and status != "applied":
+        yield [None, application_id, status, None]
+
+
+class CsvTrackerStorage:
+    """
+    The original single-CSV layout; status updates and analytics load the whole
+    file with pandas. Aggregates and history counters are rebuilt with one scan
+    when the storage opens and kept in memory, so it assumes a single writer process.
+    """
+
+    backend = "csv"
+
+    def __init__(self, log_file: str = "logs/applications.csv"):
+        self.log_file = log_file
+        # Application IDs are row positions in log_file
+        self.events_file = os.path.splitext(log_file)[0] + "_events.csv"
+        if not os.path.exists(log_file):
+            os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+            with open(log_file, 'w', newline='', encoding='utf-8') as f:
+                csv.writer(f).writerow(COLUMNS)
+        self._rows = 0
+        self._aggregates = TrackerAggregates()
+        self._recent = deque(maxlen=5)
+        for row in self._iter_rows():
+            self._add_in_memory(row)
+        if not os.path.exists(self.events_file):
+            with open(self.log_file, 'r', newline='', encoding='utf-8') as f:
+                events = [event for application_id, row in enumerate(csv.DictReader(f))
+                          for event in _initial_events(application_id, row)]
+            with open(self.events_file, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(EVENT_COLUMNS)
+                writer.writerows(events)
+        self._history = HistoryMetrics().add_all(self.events())
+
+    def append(self, row: Dict):
+        self.append_many([row])
+
+    def append_many(self, rows: Iterable[Dict]):
+        rows = list(rows)
+        with open(self.log_file, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            writer.writerows(rows)
+        self._append_events([event for offset, row in enumerate(rows)
+                             for event in _initial_events(self._rows + offset, row)])
+        for row in rows:
+            self._add_in_memory(row)
+
+    def update_latest(self, company: str, role: str, new_status: str, notes: str = "") -> bool:
+        """Set the status of the most recent company/role application; False if there is none"""
+        # An all-empty notes column would otherwise load as float and reject the new note
+        df = pd.read_csv(self.log_file, dtype={"notes": "object", "status": "object"})
+        matching_rows = df[(df['company'] == company) & (df['role'] == role)]
+        if matching_rows.empty:
+            return False
+
+        latest_idx = matching_rows.index[-1]
+        previous = df.loc[latest_idx].to_dict()
+        df.loc[latest_idx, 'status'] = new_status
+        if notes:
+            existing_notes = df.loc[latest_idx, 'notes']
+            df.loc[latest_idx, 'notes'] = (f"{existing_notes} | {_note_line(notes)}" if not pd.isna(existing_notes)
+                                           and existing_notes else _note_line(notes))
+        df.to_csv(self.log_file, index=False)
+        self._append_events([[datetime.now().isoformat(), int(latest_idx), new_status, notes or None]])
+        self._aggregates.change_status(previous, new_status)
+        for application_id, recent in self._recent:
+            if application_id == latest_idx:
+                recent["status"] = new_status
+        return True
+
+    def summary(self) -> Dict:
+        return _summary(self._aggregates, [dict(recent) for _, recent in self._recent])
+
+    def aggregates(self) -> TrackerAggregates:
+        return TrackerAggregates({key: list(vector) for key, vector in self._aggregates.counters.items()})
+
+    def history_metrics(self) -> Dict:
+        """Response-time and funnel metrics from the running history counters"""
+        return self._history.result()
+
+    def verify_aggregates(self) -> Dict[str, Dict]:
+        """Differences between the running aggregates and history counters and a full recompute
+        (empty when they agree)"""
+        mismatches = self._aggregates.diff(TrackerAggregates.from_rows(self._iter_rows()))
+        mismatches.update(diff_counters(self._history.counters(), HistoryMetrics().add_all(self.events()).counters()))
+        return mismatches
+
+    def events(self) -> List[StatusEvent]:
+        """(application_id, status, timestamp) for every status change, oldest first"""
+        with open(self.events_file, 'r', newline='', encoding='utf-8') as f:
+            return [(int(row["application_id"]), row["status"], row["timestamp"] or None)
+                    for row in csv.DictReader(f)]
+
+    def history(self, company: str, role: str) -> List[Dict]:
+        """Status events of the most recent company/role application, oldest first"""
+        df = pd.read_csv(self.log_file)
+        matching_rows = df[(df['company'] == company) & (df['role'] == role)]
+        if matching_rows.empty:
+            return []
+        application_id = str(matching_rows.index[-1])
+        with open(self.events_file, 'r', newline='', encoding='utf-8') as f:
+            return [{"status": row["status"], "timestamp": row["timestamp"] or None, "note": row["note"] or None}
+                    for row in csv.DictReader(f) if row["application_id"] == application_id]
+
+    def _append_events(self, events: List[List]):
+        with open(self.events_file, 'a', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerows(events)
+        self._history.add_all(_as_status_event(event) for event in events)
+
+    def _iter_rows(self) -> Iterator[Dict]:
+        with open(self.log_file, 'r', newline='', encoding='utf-8') as f:
+            yield from csv.DictReader(f)
+
+    def _add_in_memory(self, row: Dict):
+        self._aggregates.add_application(row)
+        self._recent.append((self._rows, {column: row.get(column) for column in RECENT_COLUMNS}))
+        self._rows += 1
+
+    def pending(self, cutoff: datetime) -> List[Dict]:
+        """Applications still 'applied' that were logged before cutoff"""
+        df = pd.read_csv(self.log_file)
+        if df.empty:
+            return []
+        df = df[(df['status'] == 'applied') & (pd.to_datetime(df['timestamp']) < cutoff)]
+        return df[['company', 'role', 'timestamp', 'application_url']].to_dict('records')
+
+    def dataframe(self, status: Optional[str] = None) -> pd.DataFrame:
+        df = pd.read_csv(self.log_file)
+        return df[df['status'] == status] if status else df
+
+    def __len__(self) -> int:
+        with open(self.log_file, 'r', encoding='utf-8') as f:
+            return max(sum(1 for _ in csv.reader(f)) - 1, 0)
+
+
+class SqliteTrackerStorage:
+    """Applications in one indexed SQLite table; safe to share across threads and processes"""
+
+    backend = "sqlite"
+
+    def __init__(self, db_path: str = "logs/applications.sqlite"):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+        # Databases from before the event log and the aggregates get them from the rows they hold
+        with self._lock, self._immediate():
+            if self._db.execute("SELECT NOT EXISTS (SELECT 1 FROM status_events)").fetchone()[0]:
+                self._backfill_events(0)
+            if self._db.execute("SELECT NOT EXISTS (SELECT 1 FROM aggregates)").fetchone()[0]:
+                self._write_aggregates(self._recompute_aggregates())
+            if self._db.execute("SELECT NOT EXISTS (SELECT 1 FROM history_counters)").fetchone()[0]:
+                self._write_history(self._recompute_history())
+
+    def append(self, row: Dict):
+        self.append_many([row])
+
+    def append_many(self, rows: Iterable[Dict]):
+        rows = list(rows)
+        with self._lock, self._immediate():
+            self._insert(rows)
+
+    def import_into_empty(self, chunks: Iterable[List[Dict]], events: Optional[List[tuple]] = None) -> int:
+        """
+        Insert chunks of rows, and then swap in (application_id, status, timestamp, note)
+        events if given, all in one write transaction that first checks the table is
+        empty; returns the number of rows inserted, 0 if it already had applications
+        (e.g. another process migrated first). Event application IDs are row positions
+        counted from 1, the IDs an empty table hands out.
+        """
+        copied = 0
+        with self._lock, self._immediate():
+            if self._db.execute("SELECT EXISTS (SELECT 1 FROM applications)").fetchone()[0]:
+                return 0
+            for rows in chunks:
+                self._insert(rows)
+                copied += len(rows)
+            if copied and events is not None:
+                self._swap_events(events)
+        return copied
+
+    def update_latest(self, company: str, role: str, new_status: str, notes: str = "") -> bool:
+        """Record a status event for the most recent company/role application and update its row;
+        False if there is none"""
+        note = _note_line(notes) if notes else None
+        with self._lock, self._immediate():
+            row = self._db.execute(f"SELECT id, {', '.join(_AGGREGATE_COLUMNS)} FROM applications "
+                                   "WHERE company = ? AND role = ? ORDER BY id DESC LIMIT 1", (company, role)).fetchone()
+            if row is None:
+                return False
+            change = TrackerAggregates()
+            change.change_status(dict(zip(_AGGREGATE_COLUMNS, row[1:])), new_status)
+            self._write_aggregates(change)
+            timestamp = datetime.now().isoformat()
+            previous = self._db.execute("SELECT application_id, status, timestamp FROM status_events "
+                                        "WHERE application_id = ? ORDER BY event_id", (row[0],)).fetchall()
+            self._write_history(event_delta(previous, (row[0], new_status, timestamp)))
+            self._db.execute("INSERT INTO status_events (application_id, status, timestamp, note) "
+                             "VALUES (?, ?, ?, ?)", (row[0], new_status, timestamp, notes or None))
+            self._db.execute(
+                """UPDATE applications
+                   SET status = ?,
+                       notes = CASE WHEN ? IS NULL THEN notes
+                                    WHEN notes IS NULL OR notes = '' THEN ?
+                                    ELSE notes || ' | ' || ? END
+                   WHERE id = ?""",
+                (new_status, note, note, note, row[0]))
+        return True
+
+    def events(self) -> List[StatusEvent]:
+        """(application_id, status, timestamp) for every status change, oldest first"""
+        with self._lock:
+            return self._db.execute(
+                "SELECT application_id, status, timestamp FROM status_events ORDER BY event_id").fetchall()
+
+    def replace_events(self, events: Iterable[tuple]):
+        """Swap the event log for (application_id, status, timestamp, note) events, e.g. from a migration"""
+        with self._lock, self._immediate():
+            self._swap_events(events)
+
+    def history(self, company: str, role: str) -> List[Dict]:
+        """Status events of the most recent company/role application, oldest first"""
+        with self._lock:
+            rows = self._db.execute(
+                """SELECT status, timestamp, note FROM status_events
+                   WHERE application_id = (SELECT id FROM applications WHERE company = ? AND role = ?
+                                           ORDER BY id DESC LIMIT 1)
+                   ORDER BY event_id""", (company, role)).fetchall()
+        return [dict(zip(("status", "timestamp", "note"), row)) for row in rows]
+
+    def summary(self) -> Dict:
+        aggregates = self.aggregates(("all", "status"))
+        with self._lock:
+            recent = self._db.execute(
+                f"SELECT {', '.join(RECENT_COLUMNS)} FROM applications ORDER BY id DESC LIMIT 5").fetchall()
+            by_company, by_role = self._top_counts("company", 10), self._top_counts("role", 10)
+        return _summary(aggregates, [dict(zip(RECENT_COLUMNS, row)) for row in reversed(recent)],
+                        by_company, by_role)
+
+    def history_metrics(self) -> Dict:
+        """Response-time and funnel metrics from the stored history counters"""
+        with self._lock:
+            rows = self._db.execute("SELECT name, value FROM history_counters").fetchall()
+        return metrics_from_counters(dict(rows))
+
+    def aggregates(self, dimensions: Optional[Iterable[str]] = None) -> TrackerAggregates:
+        """Stored counters, optionally only for some dimensions"""
+        sql = f"SELECT dimension, key, {', '.join(FIELDS)} FROM aggregates"
+        params = ()
+        if dimensions is not None:
+            params = tuple(dimensions)
+            sql += f" WHERE dimension IN ({', '.join('?' * len(params))})"
+        with self._lock:
+            rows = self._db.execute(sql + " ORDER BY rowid", params).fetchall()
+        return TrackerAggregates({(row[0], row[1]): list(row[2:]) for row in rows})
+
+    def verify_aggregates(self) -> Dict[str, Dict]:
+        """Differences between the stored aggregates and history counters and a full recompute
+        (empty when they agree)"""
+        with self._lock, self._immediate():
+            rows = self._db.execute(f"SELECT dimension, key, {', '.join(FIELDS)} FROM aggregates "
+                                    "ORDER BY rowid").fetchall()
+            recomputed = self._recompute_aggregates()
+            history = dict(self._db.execute("SELECT name, value FROM history_counters").fetchall())
+            recomputed_history = self._recompute_history()
+        stored = TrackerAggregates({(row[0], row[1]): list(row[2:]) for row in rows})
+        mismatches = stored.diff(recomputed)
+        mismatches.update(diff_counters(history, recomputed_history))
+        return mismatches
+
+    def rebuild_aggregates(self):
+        """Replace the stored aggregates and history counters with a full recompute"""
+        with self._lock, self._immediate():
+            self._db.execute("DELETE FROM aggregates")
+            self._write_aggregates(self._recompute_aggregates())
+            self._db.execute("DELETE FROM history_counters")
+            self._write_history(self._recompute_history())
+
+    def pending(self, cutoff: datetime) -> List[Dict]:
+        """Applications still 'applied' that were logged before cutoff"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT company, role, timestamp, application_url FROM applications "
+                "WHERE status = 'applied' AND timestamp < ? ORDER BY id", (cutoff.isoformat(),)).fetchall()
+        return [dict(zip(("company", "role", "timestamp", "application_url"), row)) for row in rows]
+
+    def dataframe(self, status: Optional[str] = None) -> pd.DataFrame:
+        sql = f"SELECT {', '.join(COLUMNS)} FROM applications"
+        params = ()
+        if status:
+            sql += " WHERE status = ?"
+            params = (status,)
+        with self._lock:
+            return pd.read_sql_query(sql + " ORDER BY id", self._db, params=params)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM applications").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    @contextmanager
+    def _immediate(self):
+        """Write transaction that takes the database lock up front, so reads inside it stay current"""
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._db.rollback()
+            raise
+        self._db.commit()
+
+    def _insert(self, rows: List[Dict]):
+        """Insert rows with their initial events and counter deltas; call inside a write transaction"""
+        last_id = self._db.execute("SELECT COALESCE(MAX(id), 0) FROM applications").fetchone()[0]
+        self._db.executemany(
+            f"INSERT INTO applications ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+            [[row.get(column) for column in COLUMNS] for row in rows])
+        self._backfill_events(last_id)
+        self._write_aggregates(TrackerAggregates.from_rows(rows))
+        # New applications only have their initial events, so their counters add on directly
+        self._write_history(HistoryMetrics().add_all(
+            _as_status_event(event) for offset, row in enumerate(rows)
+            for event in _initial_events(last_id + 1 + offset, row)).counters())
+
+    def _swap_events(self, events: Iterable[tuple]):
+        """Replace the event log and recount the history counters from it; call inside a write transaction"""
+        self._db.execute("DELETE FROM status_events")
+        self._db.executemany("INSERT INTO status_events (application_id, status, timestamp, note) "
+                             "VALUES (?, ?, ?, ?)", events)
+        self._db.execute("DELETE FROM history_counters")
+        self._write_history(self._recompute_history())
+
+    def _backfill_events(self, after_id: int):
+        """Initial events for applications with id > after_id; call inside a write transaction"""
+        self._db.execute("INSERT INTO status_events (application_id, status, timestamp) "
+                         "SELECT id, 'applied', timestamp FROM applications WHERE id > ? ORDER BY id", (after_id,))
+        self._db.execute("INSERT INTO status_events (application_id, status, timestamp) "
+                         "SELECT id, status, NULL FROM applications "
+                         "WHERE id > ? AND status IS NOT NULL AND status != 'applied' ORDER BY id", (after_id,))
+
+    def _top_counts(self, dimension: str, limit: int) -> Dict[str, int]:
+        """Most frequent keys straight from the count index; ties in order of first appearance"""
+        rows = self._db.execute("SELECT key, count FROM aggregates WHERE dimension = ? AND count > 0 "
+                                "ORDER BY count DESC, rowid LIMIT ?", (dimension, limit)).fetchall()
+        return dict(rows)
+
+    def _recompute_aggregates(self) -> TrackerAggregates:
+        cursor = self._db.execute(f"SELECT {', '.join(_AGGREGATE_COLUMNS)} FROM applications ORDER BY id")
+        return TrackerAggregates.from_rows(dict(zip(_AGGREGATE_COLUMNS, row)) for row in cursor)
+
+    def _recompute_history(self) -> Dict[str, float]:
+        cursor = self._db.execute("SELECT application_id, status, timestamp FROM status_events ORDER BY event_id")
+        return HistoryMetrics().add_all(cursor).counters()
+
+    def _write_history(self, delta: Dict[str, float]):
+        """Add history counter deltas (fastest_response_seconds keeps the minimum); call inside a write transaction"""
+        self._db.executemany(
+            "INSERT INTO history_counters (name, value) VALUES (?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET value = CASE WHEN name = 'fastest_response_seconds' "
+            "THEN MIN(value, excluded.value) ELSE value + excluded.value END",
+            list(delta.items()))
+
+    def _write_aggregates(self, change: TrackerAggregates):
+        """Add counter deltas; call inside a write transaction"""
+        assignments = ", ".join(f"{field} = {field} + excluded.{field}" for field in FIELDS)
+        self._db.executemany(
+            f"INSERT INTO aggregates (dimension, key, {', '.join(FIELDS)}) "
+            f"VALUES (?, ?, {', '.join('?' * len(FIELDS))}) "
+            f"ON CONFLICT (dimension, key) DO UPDATE SET {assignments}",
+            [key + tuple(vector) for key, vector in change.counters.items()])
+
+
+def migrate_csv_to_sqlite(csv_path: str, storage: SqliteTrackerStorage, chunk_size: int = 10000) -> int:
+    """
+    Copy every row of a tracker CSV into an empty SQLite storage, along with the
+    CSV backend's status event log if there is one; returns the number of rows copied.
+    The copy is a single transaction, so concurrent workers opening the same new
+    database migrate it once (the others find it filled and copy nothing).
+    """
+    events = None
+    events_file = os.path.splitext(csv_path)[0] + "_events.csv"
+    if os.path.exists(events_file):
+        with open(events_file, 'r', newline='', encoding='utf-8') as f:
+            # CSV row positions count from 0, SQLite row IDs from 1
+            events = [(int(row["application_id"]) + 1, row["status"], row["timestamp"] or None, row["note"] or None)
+                      for row in csv.DictReader(f)]
+
+    with open(csv_path, 'r', newline='', encoding='utf-8') as f:
+        copied = storage.import_into_empty(_csv_chunks(f, chunk_size), events)
+    if not copied and len(storage):
+        print(f"⚠️ {storage.db_path} already has applications, skipping migration from {csv_path}")
+    return copied
+
+
+def _csv_chunks(f, chunk_size: int) -> Iterator[List[Dict]]:
+    chunk = []
+    for row in csv.DictReader(f):
+        row["match_score"] = _to_float(row.get("match_score"))
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def open_tracker_storage(log_file: str = "logs/applications.csv", backend: Optional[str] = None):
+    """
+    Storage for the tracker. backend (default: TRACKER_BACKEND, else sqlite) is
+    "csv" or "sqlite"; the SQLite database sits next to log_file with a .sqlite
+    extension and is filled from log_file the first time it is created.
+    """
+    backend = (backend or os.getenv("TRACKER_BACKEND", "sqlite")).lower()
+    if backend == "csv":
+        return CsvTrackerStorage(log_file)
+    if backend != "sqlite":
+        raise ValueError(f"Unknown tracker backend: {backend}")
+
+    db_path = os.path.splitext(log_file)[0] + ".sqlite"
+    is_new = not os.path.exists(db_path)
+    storage = SqliteTrackerStorage(db_path)
+    if is_new and os.path.exists(log_file):
+        copied = migrate_csv_to_sqlite(log_file, storage)
+        if copied:
+            print(f"✅ Migrated {copied} applications from {log_file} to {db_path}")
+    return storage
@@ -21,6 +21,12 @@ pip install -r requirements.txt
 echo "🧠 Downloading spaCy model..."
 python -m spacy download en_core_web_sm
 
+# Start the shared model server so every backend worker uses one model copy
+if [ -n "$MODEL_SERVER_ADDRESS" ]; then
+    echo "🧠 Starting model server on $MODEL_SERVER_ADDRESS..."
+    python src/model_server.py --address "$MODEL_SERVER_ADDRESS" &
+fi
+
 # Start the backend server
 echo "🌟 Starting FastAPI server..."
 cd backend